@@ -1,21 +1,17 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from database import get_database
 from models import TokenData, User
 from config import settings
+from cache import principal_cache
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 security = HTTPBearer()
 
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
+# Only the fields needed for role checks and /auth/me - never the password hash
+PRINCIPAL_PROJECTION = {"_id": 1, "name": 1, "email": 1, "role": 1}
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -27,6 +23,24 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
+async def load_principal(email: str):
+    """Return the cached principal for a token subject, loading it on a miss"""
+    user = principal_cache.get(email)
+    if user is not None:
+        return user
+    
+    db = await get_database()
+    user = await db.recruitment_portal.users.find_one({"email": email}, PRINCIPAL_PROJECTION)
+    if user is not None:
+        principal_cache.set(email, user)
+    return user
+
+def invalidate_principal(*emails: str):
+    """Drop cached principals after the underlying user document changed"""
+    for email in emails:
+        if email:
+            principal_cache.invalidate(email)
+
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -42,8 +56,7 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
     except JWTError:
         raise credentials_exception
     
-    db = await get_database()
-    user = await db.recruitment_portal.users.find_one({"email": token_data.email})
+    user = await load_principal(token_data.email)
     if user is None:
         raise credentials_exception
     return user
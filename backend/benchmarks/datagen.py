@@ -0,0 +1,314 @@
+"""Synthetic recruitment data generator.
+
+Produces HR users, jobs, fully populated CandidateBase documents and their
+application_history rows. Candidates are stored in the current layout, as the
+API would write them; legacy=True keeps the old v1 layout for benchmarking the
+migrator. Field values are deterministic for a given seed
+(ObjectIds are not) and candidates are generated lazily in batches, so 1M
+candidates never sit in memory at once. Used by benchmarks.seed; run
+directly to print a sample candidate.
+
+    python -m benchmarks.datagen --seed 7
+"""
+import argparse
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Iterator, List, Tuple
+from bson import ObjectId
+from candidate_schema import new_candidate
+from models import CandidateBase, SkillAssessment
+
+CANDIDATE_STATUSES = ["applied", "in_progress", "interviewed", "selected", "rejected"]
+JOB_STATUSES = ["open", "allocated", "closed", "submit"]
+
+# Most candidates stall early in the funnel, as in real pipelines
+STATUS_WEIGHTS = [45, 25, 15, 6, 9]
+STATUS_PATHS = {
+    "applied": ["applied"],
+    "in_progress": ["applied", "in_progress"],
+    "interviewed": ["applied", "in_progress", "interviewed"],
+    "selected": ["applied", "in_progress", "interviewed", "selected"],
+    "rejected": ["applied", "in_progress", "rejected"]
+}
+
+FIRST_NAMES = [
+    "Aarav", "Aditi", "Akash", "Ananya", "Arjun", "Bhavna", "Deepak", "Divya", "Farhan", "Gaurav",
+    "Harini", "Ishaan", "Kavya", "Karthik", "Lakshmi", "Manoj", "Meera", "Nikhil", "Pooja", "Priya",
+    "Rahul", "Ramya", "Rohan", "Sanjay", "Shreya", "Siddharth", "Sneha", "Suresh", "Tanvi", "Vikram"
+]
+LAST_NAMES = [
+    "Agarwal", "Bhat", "Chopra", "Das", "Gupta", "Iyer", "Joshi", "Kapoor", "Krishnan", "Kumar",
+    "Menon", "Mishra", "Nair", "Patel", "Pillai", "Rao", "Reddy", "Shah", "Sharma", "Singh"
+]
+CITIES = ["Bengaluru", "Chennai", "Hyderabad", "Pune", "Mumbai", "Noida", "Gurugram", "Kolkata", "Kochi", "Ahmedabad"]
+COMPANIES = ["Infosys", "TCS", "Wipro", "HCL", "Tech Mahindra", "Accenture", "Capgemini", "Cognizant", "LTIMindtree", "Mphasis"]
+CLIENTS = ["Global Bank", "Retail Co", "Telecom Ltd", "Insurance Group", "Energy Corp", "Airline Inc"]
+ROLES = [
+    "Java Developer", "Python Developer", "Data Engineer", "DevOps Engineer", "QA Automation Engineer",
+    "React Developer", "Cloud Architect", "SAP Consultant", "Salesforce Developer", "Business Analyst"
+]
+SKILLS = [
+    "Java", "Spring Boot", "Python", "Django", "FastAPI", "React", "Node.js", "AWS", "Azure", "Kubernetes",
+    "Docker", "Terraform", "SQL", "MongoDB", "Kafka", "Spark", "Selenium", "SAP ABAP", "Salesforce", "Power BI"
+]
+DEGREES = ["B.E. Computer Science", "B.Tech Information Technology", "MCA", "B.Sc Computer Science", "M.Tech Software Systems"]
+INSTITUTES = ["Anna University", "VTU", "JNTU", "Pune University", "Mumbai University", "Amity University", "SRM University"]
+NOTICE_PERIODS = ["Immediate", "15 days", "30 days", "60 days", "90 days"]
+SALARY_PACKAGES = ["6-9 LPA", "9-12 LPA", "12-18 LPA", "18-25 LPA", "25-35 LPA"]
+
+YES_NO_FIELDS = [
+    "roc_check_done", "applied_for_ibm_before", "is_organization_employee", "interested_in_relocation",
+    "willingness_work_shifts", "education_authenticated_ugc_check", "do_not_know_candidate",
+    "evaluated_resume_with_jd", "personally_spoken_to_candidate", "available_for_clarification",
+    "salary_slip_verified", "offer_letter_verified", "test_mail_sent_to_organization"
+]
+
+BENCH_EMAIL_DOMAIN = "bench.example.com"
+
+def hr_email(index: int) -> str:
+    return f"hr{index}@{BENCH_EMAIL_DOMAIN}"
+
+def admin_email() -> str:
+    return f"admin@{BENCH_EMAIL_DOMAIN}"
+
+def _month_year(moment: datetime) -> str:
+    return moment.strftime("%b %Y")
+
+def _date(moment: datetime) -> str:
+    return moment.strftime("%Y-%m-%d")
+
+class DataGenerator:
+    """Seeded source of benchmark documents; the same seed and scale give the same field values"""
+
+    def __init__(self, seed: int = 7, hr_users: int = 20, jobs: int = 200, candidates: int = 10_000, now: datetime = None, legacy: bool = False):
+        self.rng = random.Random(seed)
+        self.hr_users = hr_users
+        self.jobs = jobs
+        self.candidates = candidates
+        self.now = now or datetime(2025, 1, 1)
+        self.legacy = legacy
+        self.admin_id = ObjectId()
+        self.hr_ids: List[str] = []
+        self.job_ids: List[str] = []
+
+    def users(self, password_hash: str) -> List[dict]:
+        users = [{
+            "_id": self.admin_id,
+            "name": "Benchmark Admin",
+            "email": admin_email(),
+            "password": password_hash,
+            "role": "admin",
+            "created_at": self.now - timedelta(days=400)
+        }]
+        for index in range(1, self.hr_users + 1):
+            user_id = ObjectId()
+            self.hr_ids.append(str(user_id))
+            users.append({
+                "_id": user_id,
+                "name": f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}",
+                "email": hr_email(index),
+                "password": password_hash,
+                "role": "hr",
+                "created_at": self.now - timedelta(days=self.rng.randint(30, 400))
+            })
+        return users
+
+    def job_documents(self) -> List[dict]:
+        """Jobs are few enough to build at once; call users() first so they can be allocated"""
+        jobs = []
+        for index in range(self.jobs):
+            job_id = f"jb{index:07d}"
+            self.job_ids.append(job_id)
+            role = self.rng.choice(ROLES)
+            created_at = self.now - timedelta(days=self.rng.randint(1, 365), seconds=self.rng.randint(0, 86_399))
+            skills = self.rng.sample(SKILLS, 4)
+            jobs.append({
+                "job_id": job_id,
+                "title": f"{role} - {self.rng.choice(CITIES)}",
+                "description": f"{role} with hands-on {', '.join(skills)} experience for a {self.rng.choice(CLIENTS)} engagement.",
+                "location": self.rng.choice(CITIES),
+                "salary_package": self.rng.choice(SALARY_PACKAGES),
+                "source_company": self.rng.choice(COMPANIES),
+                "uploaded_by": str(self.admin_id),
+                # Most jobs are allocated, matching how the portal is used
+                "assigned_hr": self.rng.choice(self.hr_ids) if self.hr_ids and self.rng.random() < 0.9 else None,
+                "status": self.rng.choices(JOB_STATUSES, weights=[10, 70, 15, 5])[0],
+                "opening_date": created_at,
+                "created_at": created_at
+            })
+        return jobs
+
+    def _skill_assessments(self) -> List[dict]:
+        return [
+            SkillAssessment(
+                skill_name=skill,
+                years_of_experience=str(self.rng.randint(1, 12)),
+                last_used_year=str(self.now.year - self.rng.randint(0, 3)),
+                vendor_sme_assessment_score=self.rng.randint(1, 4)
+            ).model_dump()
+            for skill in self.rng.sample(SKILLS, self.rng.randint(2, 5))
+        ]
+
+    def _work_experience(self, total_years: int) -> List[dict]:
+        entries = []
+        end = self.now
+        for _ in range(self.rng.randint(1, 3)):
+            start = end - timedelta(days=self.rng.randint(365, 365 * max(2, total_years // 2)))
+            entries.append({
+                "organization": self.rng.choice(COMPANIES),
+                "end_client": self.rng.choice(CLIENTS),
+                "project": f"{self.rng.choice(['Core Banking', 'Billing', 'Claims', 'Supply Chain', 'CRM'])} modernisation",
+                "start_month_year": _month_year(start),
+                "end_month_year": _month_year(end),
+                "technology_tools": ", ".join(self.rng.sample(SKILLS, 3)),
+                "role_designation": self.rng.choice(ROLES),
+                "responsibilities": [
+                    "Designed and delivered service components",
+                    "Reviewed code and mentored junior engineers",
+                    "Worked with the client on release planning"
+                ][:self.rng.randint(1, 3)],
+                "additional_information": None
+            })
+            end = start
+        return entries
+
+    def candidate(self, index: int) -> dict:
+        first, last = self.rng.choice(FIRST_NAMES), self.rng.choice(LAST_NAMES)
+        job_id = self.rng.choice(self.job_ids)
+        total_years = self.rng.randint(1, 15)
+        status = self.rng.choices(CANDIDATE_STATUSES, weights=STATUS_WEIGHTS)[0]
+        created_at = self.now - timedelta(days=self.rng.randint(0, 365), seconds=self.rng.randint(0, 86_399))
+        birth_year = self.now.year - 22 - total_years
+        work = self._work_experience(total_years)
+        candidate = {
+            "name": f"{first} {last}",
+            "email": f"{first.lower()}.{last.lower()}.{index}@example.com",
+            "phone": f"9{self.rng.randint(100_000_000, 999_999_999)}",
+            "title_position": self.rng.choice(ROLES),
+            "pan_number": f"{''.join(self.rng.choices('ABCDEFGHIJKLMNOPQRSTUVWXYZ', k=5))}{self.rng.randint(1000, 9999)}{self.rng.choice('ABCDEFGHIJKLMNOPQRSTUVWXYZ')}",
+            "passport_number": f"{self.rng.choice('JKLMNPRSTUVWZ')}{self.rng.randint(1_000_000, 9_999_999)}",
+            "current_location": self.rng.choice(CITIES),
+            "hometown": self.rng.choice(CITIES),
+            "preferred_interview_location": self.rng.choice(CITIES),
+            "interview_location": self.rng.choice(CITIES),
+            "availability_interview": self.rng.choice(["weekdays", "weekends", "both"]),
+            "date_of_joining_organization": _date(created_at - timedelta(days=365 * self.rng.randint(1, 5))),
+            "client_deployment_details": [self.rng.choice(CLIENTS) for _ in range(self.rng.randint(1, 2))],
+            "role_applied_for": self.rng.choice(ROLES),
+            "reason_for_job_change": self.rng.choice(["Career growth", "Relocation", "Better compensation", "Project completion"]),
+            "current_role": self.rng.choice(ROLES),
+            "notice_period": self.rng.choice(NOTICE_PERIODS),
+            "payrolling_company_name": self.rng.choice(COMPANIES),
+            "total_experience": f"{total_years} years",
+            "relevant_experience": f"{self.rng.randint(1, total_years)} years",
+            "general_attitude_assessment": self.rng.randint(1, 4),
+            "oral_communication_assessment": self.rng.randint(1, 4),
+            "general_attitude_comments": "Positive and collaborative",
+            "oral_communication_comments": "Clear and concise",
+            "sme_name": f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}",
+            "sme_email": f"sme{self.rng.randint(1, 200)}@{BENCH_EMAIL_DOMAIN}",
+            "sme_mobile": f"8{self.rng.randint(100_000_000, 999_999_999)}",
+            "talent_acquisition_consultant": f"{self.rng.choice(FIRST_NAMES)} {self.rng.choice(LAST_NAMES)}",
+            "date_of_assessment": _date(created_at),
+            "education_x_institute": f"{self.rng.choice(CITIES)} Public School",
+            "education_x_start_date": f"{birth_year + 15}-06-01",
+            "education_x_end_date": f"{birth_year + 16}-03-31",
+            "education_x_percentage": str(self.rng.randint(60, 98)),
+            "education_x_year_completion": str(birth_year + 16),
+            "education_xii_institute": f"{self.rng.choice(CITIES)} Junior College",
+            "education_xii_start_date": f"{birth_year + 16}-06-01",
+            "education_xii_end_date": f"{birth_year + 18}-03-31",
+            "education_xii_percentage": str(self.rng.randint(55, 97)),
+            "education_xii_year_completion": str(birth_year + 18),
+            "education_degree_name": self.rng.choice(DEGREES),
+            "education_degree_institute": self.rng.choice(INSTITUTES),
+            "education_degree_start_date": f"{birth_year + 18}-07-01",
+            "education_degree_end_date": f"{birth_year + 22}-05-31",
+            "education_degree_percentage": str(self.rng.randint(55, 92)),
+            "education_degree_year_completion": str(birth_year + 22),
+            "education_degree_duration": "4 years",
+            "education_additional_certifications": self.rng.choice(["AWS Certified Developer", "Scrum Master", "Azure Fundamentals", "None"]),
+            "education_x": None,
+            "education_xii": None,
+            "education_degree": None,
+            "education_percentage": None,
+            "education_duration": None,
+            "work_experience_entries": work,
+            "experience_entries": [{key: entry[key] for key in (
+                "organization", "end_client", "project", "start_month_year", "end_month_year", "technology_tools"
+            )} for entry in work],
+            "skill_assessments": self._skill_assessments(),
+            "certifications": self.rng.choice(["AWS Solutions Architect", "CKA", "PMP", "OCP Java"]),
+            "publications_title": None,
+            "publications_date": None,
+            "publications_publisher": None,
+            "publications_description": None,
+            "references": "Available on request",
+            "experience": None,
+            "education": None,
+            "skills": ", ".join(self.rng.sample(SKILLS, 5)),
+            "projects": None,
+            "linkedin": f"https://www.linkedin.com/in/{first.lower()}-{last.lower()}-{index}",
+            "github": f"https://github.com/{first.lower()}{index}",
+            "job_id": job_id,
+            "status": status,
+            "applied_date": _date(created_at)
+        }
+        for field in YES_NO_FIELDS:
+            candidate[field] = self.rng.choice(["YES", "NO"])
+        # _id order tracks created_at, as it would for documents inserted over time
+        candidate["_id"] = ObjectId(ObjectId.from_datetime(created_at).binary[:4] + ObjectId().binary[4:])
+        candidate["created_at"] = created_at
+        candidate["created_by"] = str(self.admin_id)
+        candidate["last_updated_by"] = str(self.admin_id)
+        candidate["notes"] = None
+        return candidate if self.legacy else new_candidate(candidate)
+
+    def history(self, candidate: dict) -> List[dict]:
+        """One row per transition on the way to the candidate's current status"""
+        rows = []
+        path = STATUS_PATHS[candidate["status"]]
+        timestamp = candidate["created_at"]
+        for old_status, new_status in zip([""] + path[:-1], path):
+            rows.append({
+                "candidate_id": str(candidate["_id"]),
+                "job_id": candidate["job_id"],
+                "old_status": old_status,
+                "new_status": new_status,
+                "updated_by": str(self.admin_id),
+                "timestamp": timestamp,
+                "comment": None
+            })
+            timestamp += timedelta(days=self.rng.randint(1, 14), seconds=self.rng.randint(0, 86_399))
+        return rows
+
+    def candidate_batches(self, batch_size: int) -> Iterator[Tuple[List[dict], List[dict]]]:
+        """Yield (candidates, history) batches; call job_documents() first"""
+        candidates, history = [], []
+        for index in range(self.candidates):
+            candidate = self.candidate(index)
+            candidates.append(candidate)
+            history.extend(self.history(candidate))
+            if len(candidates) >= batch_size:
+                yield candidates, history
+                candidates, history = [], []
+        if candidates:
+            yield candidates, history
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--legacy", action="store_true", help="print the old v1 layout")
+    args = parser.parse_args()
+
+    generator = DataGenerator(seed=args.seed, hr_users=2, jobs=3, candidates=1, legacy=args.legacy)
+    generator.users(password_hash="<hash>")
+    generator.job_documents()
+    candidate = generator.candidate(0)
+    # Every generated document must still be a valid CandidateBase
+    CandidateBase(**candidate)
+    print(json.dumps(candidate, indent=2, default=str))
+
+if __name__ == "__main__":
+    main()
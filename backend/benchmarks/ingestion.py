@@ -0,0 +1,97 @@
+"""Job CSV ingestion benchmark.
+
+Writes a synthetic job CSV (50k rows by default, a small share of them
+invalid) and feeds it through the same parsing and JobIngestion path as
+POST /admin/upload-csv, reporting rows per second for each batch size.
+Needs a MongoDB; the jobs it inserts are tagged with a benchmark uploader
+and deleted after each run unless --keep is given.
+
+    python -m benchmarks.ingestion --mongodb-url mongodb://localhost:27017 --rows 50000
+    python -m benchmarks.ingestion --batch-size 100 --batch-size 1000 --batch-size 5000
+"""
+import argparse
+import asyncio
+import csv
+import io
+import json
+import os
+import random
+import tempfile
+import time
+from motor.motor_asyncio import AsyncIOMotorClient
+from benchmarks.datagen import CITIES, CLIENTS, ROLES, SALARY_PACKAGES, SKILLS
+from config import settings
+from indexes import apply_indexes
+from ingestion import CSV_REQUIRED_COLUMNS, JobIngestion, csv_job_rows
+
+BENCHMARK_UPLOADER = "benchmark-ingestion"
+
+def write_csv(path: str, rows: int, invalid_fraction: float, seed: int):
+    rng = random.Random(seed)
+    with open(path, "w", newline="", encoding="utf-8") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(CSV_REQUIRED_COLUMNS)
+        for _ in range(rows):
+            role = rng.choice(ROLES)
+            # A blank title fails validation, so the error path is timed too
+            title = "" if rng.random() < invalid_fraction else f"{role} - {rng.choice(CITIES)}"
+            writer.writerow([
+                title,
+                f"{role} with hands-on {', '.join(rng.sample(SKILLS, 4))} experience for a {rng.choice(CLIENTS)} engagement.",
+                rng.choice(CITIES),
+                rng.choice(SALARY_PACKAGES)
+            ])
+
+async def ingest(client, path: str, batch_size: int) -> dict:
+    settings.INGEST_BATCH_SIZE = batch_size
+    with open(path, "rb") as raw:
+        # Same reader setup as the upload route
+        reader = csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8-sig", newline=""))
+        ingestion = JobIngestion(client, uploaded_by=BENCHMARK_UPLOADER, source_company="CSV Upload")
+        report = await ingestion.run(csv_job_rows(reader))
+    report.pop("errors")
+    report.pop("errors_truncated")
+    return {"batch_size": batch_size, **report}
+
+async def run(args, path: str) -> list:
+    client = AsyncIOMotorClient(args.mongodb_url)
+    try:
+        # The unique job_id index is part of the write cost and drives the duplicate-ID retries
+        await apply_indexes(client)
+        results = []
+        for batch_size in args.batch_size or [settings.INGEST_BATCH_SIZE]:
+            results.append(await ingest(client, path, batch_size))
+            if not args.keep:
+                await client.recruitment_portal.jobs.delete_many({"uploaded_by": BENCHMARK_UPLOADER})
+        return results
+    finally:
+        client.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongodb-url", default="mongodb://localhost:27017")
+    parser.add_argument("--rows", type=int, default=50_000)
+    parser.add_argument("--invalid-fraction", type=float, default=0.01)
+    parser.add_argument("--batch-size", type=int, action="append", help="repeat to compare; defaults to INGEST_BATCH_SIZE")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="leave the inserted jobs in place")
+    args = parser.parse_args()
+
+    handle, path = tempfile.mkstemp(suffix=".csv")
+    os.close(handle)
+    try:
+        started = time.perf_counter()
+        write_csv(path, args.rows, args.invalid_fraction, args.seed)
+        generate_seconds = time.perf_counter() - started
+        results = asyncio.run(run(args, path))
+        print(json.dumps({
+            "rows": args.rows,
+            "csv_bytes": os.path.getsize(path),
+            "generate_seconds": round(generate_seconds, 2),
+            "runs": results
+        }, indent=2))
+    finally:
+        os.remove(path)
+
+if __name__ == "__main__":
+    main()
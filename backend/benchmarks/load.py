@@ -0,0 +1,226 @@
+"""Scripted load driver for the real endpoint mix.
+
+Virtual users pick requests from a weighted mix: logins, both dashboards, the
+admin and HR lists, candidate/job detail views, application history and
+status updates. Throughput and p50/p95/p99 are reported per endpoint and
+written as JSON, so runs can be compared for regressions. Needs a running
+API, data from benchmarks.seed and httpx (benchmark-only, not in
+requirements.txt: pip install httpx).
+
+    python -m benchmarks.load --base-url http://localhost:8000 --concurrency 32 --duration 60
+    python -m benchmarks.load --compare benchmarks/results/baseline.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import time
+from datetime import datetime
+import httpx
+from benchmarks.datagen import CANDIDATE_STATUSES, admin_email
+from benchmarks.login_throughput import percentiles
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), "results")
+
+# (endpoint, weight); weights follow how the portal is used: mostly reads, some writes
+ENDPOINT_MIX = [
+    ("POST /auth/login", 2),
+    ("GET /admin/dashboard", 5),
+    ("GET /hr/dashboard", 8),
+    ("GET /admin/candidates", 10),
+    ("GET /admin/candidates?status", 4),
+    ("GET /admin/jobs", 5),
+    ("GET /hr/candidates", 10),
+    ("GET /hr/jobs", 6),
+    ("GET /candidates/{id}", 16),
+    ("GET /jobs/{job_id}", 8),
+    ("GET /application-history/{id}", 6),
+    ("PUT /candidates/{id}/status", 8)
+]
+
+class Session:
+    """Tokens and IDs gathered once before the run, shared by every virtual user"""
+
+    def __init__(self, password: str):
+        self.password = password
+        self.admin = None
+        self.hr = []
+        self.candidate_ids = []
+        self.job_ids = []
+
+async def _login(client: httpx.AsyncClient, email: str, password: str) -> dict:
+    response = await client.post("/auth/login", json={"email": email, "password": password})
+    response.raise_for_status()
+    return {"email": email, "headers": {"Authorization": f"Bearer {response.json()['access_token']}"}}
+
+async def prepare(client: httpx.AsyncClient, args) -> Session:
+    session = Session(args.password)
+    session.admin = await _login(client, args.admin_email, args.password)
+
+    users = await client.get("/admin/users", params={"limit": args.hr_sessions}, headers=session.admin["headers"])
+    users.raise_for_status()
+    session.hr = [await _login(client, user["email"], args.password) for user in users.json()]
+    if not session.hr:
+        raise SystemExit("No HR users found; seed the database with benchmarks.seed first")
+
+    candidates = await client.get("/admin/candidates", params={"limit": 200, "view": "summary"}, headers=session.admin["headers"])
+    candidates.raise_for_status()
+    session.candidate_ids = [candidate["id"] for candidate in candidates.json()]
+    jobs = await client.get("/admin/jobs", params={"limit": 200}, headers=session.admin["headers"])
+    jobs.raise_for_status()
+    session.job_ids = [job["id"] for job in jobs.json()]
+    if not session.candidate_ids or not session.job_ids:
+        raise SystemExit("No candidates or jobs found; seed the database with benchmarks.seed first")
+    return session
+
+def build_request(endpoint: str, session: Session, rng: random.Random) -> tuple:
+    """Map an endpoint name to (method, url, params, json, headers)"""
+    admin = session.admin["headers"]
+    hr = rng.choice(session.hr)
+    if endpoint == "POST /auth/login":
+        return "POST", "/auth/login", None, {"email": hr["email"], "password": session.password}, None
+    if endpoint == "GET /admin/dashboard":
+        return "GET", "/admin/dashboard", None, None, admin
+    if endpoint == "GET /hr/dashboard":
+        return "GET", "/hr/dashboard", None, None, hr["headers"]
+    if endpoint == "GET /admin/candidates":
+        return "GET", "/admin/candidates", {"limit": 50, "view": "summary"}, None, admin
+    if endpoint == "GET /admin/candidates?status":
+        return "GET", "/admin/candidates", {"limit": 50, "view": "summary", "status": rng.choice(CANDIDATE_STATUSES)}, None, admin
+    if endpoint == "GET /admin/jobs":
+        return "GET", "/admin/jobs", {"limit": 50}, None, admin
+    if endpoint == "GET /hr/candidates":
+        return "GET", "/hr/candidates", {"limit": 50, "view": "summary"}, None, hr["headers"]
+    if endpoint == "GET /hr/jobs":
+        return "GET", "/hr/jobs", {"limit": 50}, None, hr["headers"]
+    if endpoint == "GET /candidates/{id}":
+        return "GET", f"/candidates/{rng.choice(session.candidate_ids)}", None, None, admin
+    if endpoint == "GET /jobs/{job_id}":
+        return "GET", f"/jobs/{rng.choice(session.job_ids)}", None, None, admin
+    if endpoint == "GET /application-history/{id}":
+        return "GET", f"/application-history/{rng.choice(session.candidate_ids)}", None, None, admin
+    if endpoint == "PUT /candidates/{id}/status":
+        params = {"status": rng.choice(CANDIDATE_STATUSES), "notes": "load test"}
+        return "PUT", f"/candidates/{rng.choice(session.candidate_ids)}/status", params, None, admin
+    raise ValueError(f"Unknown endpoint {endpoint}")
+
+async def virtual_user(client: httpx.AsyncClient, session: Session, rng: random.Random, measure_from: float, deadline: float, samples: dict, errors: dict):
+    endpoints = [endpoint for endpoint, _ in ENDPOINT_MIX]
+    weights = [weight for _, weight in ENDPOINT_MIX]
+    while time.perf_counter() < deadline:
+        endpoint = rng.choices(endpoints, weights=weights)[0]
+        method, url, params, body, headers = build_request(endpoint, session, rng)
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, params=params, json=body, headers=headers)
+            failed = response.status_code >= 400
+        except httpx.HTTPError:
+            failed = True
+        # Requests issued during warm-up are not measured
+        if started < measure_from:
+            continue
+        samples[endpoint].append(time.perf_counter() - started)
+        if failed:
+            errors[endpoint] += 1
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(__file__)
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+async def run(args) -> dict:
+    started_at = datetime.utcnow()
+    limits = httpx.Limits(max_connections=args.concurrency + 4, max_keepalive_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        session = await prepare(client, args)
+
+        samples = {endpoint: [] for endpoint, _ in ENDPOINT_MIX}
+        errors = {endpoint: 0 for endpoint, _ in ENDPOINT_MIX}
+        started = time.perf_counter()
+        measure_from = started + args.warmup
+        deadline = measure_from + args.duration
+        await asyncio.gather(*(
+            virtual_user(client, session, random.Random(args.seed + worker), measure_from, deadline, samples, errors)
+            for worker in range(args.concurrency)
+        ))
+        elapsed = time.perf_counter() - measure_from
+
+    endpoints = {}
+    for endpoint, endpoint_samples in samples.items():
+        endpoints[endpoint] = {
+            **percentiles(endpoint_samples),
+            "errors": errors[endpoint],
+            "requests_per_second": round(len(endpoint_samples) / elapsed, 1)
+        }
+    total = sum(len(endpoint_samples) for endpoint_samples in samples.values())
+    return {
+        "run": {
+            "started_at": started_at.isoformat(),
+            "git_revision": _git_revision(),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "warmup_seconds": args.warmup,
+            "duration_seconds": args.duration,
+            "seed": args.seed,
+            "label": args.label
+        },
+        "total": {
+            **percentiles([sample for endpoint_samples in samples.values() for sample in endpoint_samples]),
+            "errors": sum(errors.values()),
+            "requests_per_second": round(total / elapsed, 1)
+        },
+        "endpoints": endpoints
+    }
+
+def compare(result: dict, baseline: dict, threshold: float) -> list:
+    """Endpoints whose p95 grew by more than threshold (a fraction) against the baseline"""
+    regressions = []
+    for endpoint, current in result["endpoints"].items():
+        previous = baseline.get("endpoints", {}).get(endpoint)
+        if not previous or not previous.get("p95_ms") or not current.get("p95_ms"):
+            continue
+        change = current["p95_ms"] / previous["p95_ms"] - 1
+        print(f"{endpoint:36} p95 {previous['p95_ms']:>9.2f} -> {current['p95_ms']:>9.2f} ms ({change:+.0%})")
+        if change > threshold:
+            regressions.append({"endpoint": endpoint, "baseline_p95_ms": previous["p95_ms"], "p95_ms": current["p95_ms"]})
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--admin-email", default=admin_email())
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--hr-sessions", type=int, default=10, help="HR users logged in and shared by virtual users")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds before measurement starts")
+    parser.add_argument("--duration", type=float, default=60.0, help="measured seconds")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--label", help="free-form note stored with the result")
+    parser.add_argument("--output", help="result file; defaults to benchmarks/results/load-<timestamp>.json")
+    parser.add_argument("--compare", help="baseline result JSON to check for p95 regressions")
+    parser.add_argument("--regression-threshold", type=float, default=0.2, help="allowed p95 growth, as a fraction")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    output = args.output or os.path.join(RESULTS_DIR, f"load-{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as handle:
+        json.dump(result, handle, indent=2)
+    print(json.dumps(result["total"], indent=2))
+    print(f"Wrote {output}")
+
+    if args.compare:
+        with open(args.compare) as handle:
+            regressions = compare(result, json.load(handle), args.regression_threshold)
+        if regressions:
+            print(json.dumps({"regressions": regressions}, indent=2))
+            raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Login throughput benchmark.
+
+Measures p50/p95/p99 latency of an unrelated endpoint (GET /auth/me) on its own
+and again while concurrent logins hammer bcrypt. With hashing off the event loop
+the two distributions should stay close. Requires a running API and httpx,
+which is a benchmark-only dependency not listed in requirements.txt
+(pip install httpx).
+
+    python -m benchmarks.login_throughput --base-url http://localhost:8000 \\
+        --email admin@example.com --password secret --concurrency 16 --logins 400
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import httpx
+
+def percentiles(samples: list) -> dict:
+    if not samples:
+        return {"count": 0}
+    ordered = sorted(samples)
+    def pick(fraction):
+        return round(ordered[min(len(ordered) - 1, int(fraction * len(ordered)))] * 1000, 2)
+    return {
+        "count": len(ordered),
+        "p50_ms": pick(0.50),
+        "p95_ms": pick(0.95),
+        "p99_ms": pick(0.99),
+        "mean_ms": round(statistics.fmean(ordered) * 1000, 2)
+    }
+
+async def probe(client: httpx.AsyncClient, headers: dict, requests: int, interval: float) -> list:
+    samples = []
+    for _ in range(requests):
+        started = time.perf_counter()
+        response = await client.get("/auth/me", headers=headers)
+        response.raise_for_status()
+        samples.append(time.perf_counter() - started)
+        await asyncio.sleep(interval)
+    return samples
+
+async def login_worker(client: httpx.AsyncClient, credentials: dict, remaining: list, samples: list):
+    while remaining:
+        remaining.pop()
+        started = time.perf_counter()
+        response = await client.post("/auth/login", json=credentials)
+        response.raise_for_status()
+        samples.append(time.perf_counter() - started)
+
+async def run(args) -> dict:
+    credentials = {"email": args.email, "password": args.password}
+    limits = httpx.Limits(max_connections=args.concurrency + 4)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60, limits=limits) as client:
+        login = await client.post("/auth/login", json=credentials)
+        login.raise_for_status()
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+
+        baseline = await probe(client, headers, args.probe_requests, args.probe_interval)
+
+        remaining = list(range(args.logins))
+        login_samples = []
+        started = time.perf_counter()
+        workers = [
+            asyncio.create_task(login_worker(client, credentials, remaining, login_samples))
+            for _ in range(args.concurrency)
+        ]
+        under_load = await probe(client, headers, args.probe_requests, args.probe_interval)
+        await asyncio.gather(*workers)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "probe_baseline": percentiles(baseline),
+        "probe_during_logins": percentiles(under_load),
+        "logins": percentiles(login_samples),
+        "logins_per_second": round(len(login_samples) / elapsed, 1) if elapsed else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--email", required=True)
+    parser.add_argument("--password", required=True)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--logins", type=int, default=400)
+    parser.add_argument("--probe-requests", type=int, default=200)
+    parser.add_argument("--probe-interval", type=float, default=0.01)
+    parser.add_argument("--output", help="Write the result JSON to this file")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print(json.dumps(result, indent=2))
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(result, handle, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""Load synthetic benchmark data into a local mongod.
+
+Writes users, jobs, candidates and application_history into the database the
+API uses (recruitment_portal) with unordered insert_many batches. The app's
+indexes are built afterwards, which is faster than maintaining them during the
+load. Every seeded user shares one password; the admin is
+admin@bench.example.com and HR users are hr1..hrN@bench.example.com.
+Candidates are written in the current schema layout; --legacy writes the old
+v1 layout instead, for benchmarking the migrator and read-time upgrader.
+
+    python -m benchmarks.seed --mongodb-url mongodb://localhost:27017 \\
+        --candidates 100000 --drop
+"""
+import argparse
+import asyncio
+import json
+import time
+from motor.motor_asyncio import AsyncIOMotorClient
+from benchmarks.datagen import DataGenerator, admin_email
+from hashing import hash_password
+from indexes import apply_indexes
+
+DATABASE_NAME = "recruitment_portal"
+
+async def seed(args) -> dict:
+    client = AsyncIOMotorClient(args.mongodb_url)
+    database = client[DATABASE_NAME]
+    try:
+        if args.drop:
+            await client.drop_database(DATABASE_NAME)
+        elif await database.users.find_one({"email": admin_email()}, {"_id": 1}):
+            raise SystemExit(f"{DATABASE_NAME} already holds benchmark data; pass --drop to replace it")
+
+        generator = DataGenerator(
+            seed=args.seed,
+            hr_users=args.hr_users,
+            jobs=args.jobs or max(10, args.candidates // 50),
+            candidates=args.candidates,
+            legacy=args.legacy
+        )
+        started = time.perf_counter()
+        await database.users.insert_many(generator.users(await hash_password(args.password)), ordered=False)
+        await database.jobs.insert_many(generator.job_documents(), ordered=False)
+
+        candidates = history = 0
+        pending = None
+        for candidate_batch, history_batch in generator.candidate_batches(args.batch_size):
+            # At most one batch in flight: wait for the previous write before sending this one
+            if pending is not None:
+                await pending
+            pending = asyncio.gather(
+                database.candidates.insert_many(candidate_batch, ordered=False),
+                database.application_history.insert_many(history_batch, ordered=False)
+            )
+            # Let the inserts reach Motor's I/O threads; they run there while the next batch is generated
+            await asyncio.sleep(0)
+            candidates += len(candidate_batch)
+            history += len(history_batch)
+            if candidates % (args.batch_size * 20) == 0:
+                print(f"  {candidates}/{args.candidates} candidates")
+        if pending is not None:
+            await pending
+        load_seconds = time.perf_counter() - started
+
+        started = time.perf_counter()
+        indexes = await apply_indexes(client)
+        index_seconds = time.perf_counter() - started
+    finally:
+        client.close()
+
+    return {
+        "seed": args.seed,
+        "legacy": args.legacy,
+        "hr_users": args.hr_users,
+        "jobs": generator.jobs,
+        "candidates": candidates,
+        "application_history": history,
+        "load_seconds": round(load_seconds, 1),
+        "index_seconds": round(index_seconds, 1),
+        "index_failures": indexes["failed"],
+        "candidates_per_second": round(candidates / load_seconds) if load_seconds else None,
+        "admin_email": admin_email(),
+        "password": args.password
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mongodb-url", default="mongodb://localhost:27017")
+    parser.add_argument("--candidates", type=int, default=10_000, help="10k to 1M is the intended range")
+    parser.add_argument("--jobs", type=int, help="defaults to one job per 50 candidates")
+    parser.add_argument("--hr-users", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=5_000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--drop", action="store_true", help="drop the database before seeding")
+    parser.add_argument("--legacy", action="store_true", help="write candidates in the old v1 layout")
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(seed(args)), indent=2))
+
+if __name__ == "__main__":
+    main()
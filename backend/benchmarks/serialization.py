@@ -0,0 +1,106 @@
+"""Response serialization micro-benchmark.
+
+Serializes pages of synthetic 100-field candidate documents two ways: the old
+per-route fix-up loop followed by jsonable_encoder and JSONResponse's json.dumps,
+and the central orjson encoder. Both outputs are checked to be byte-identical.
+Needs no database or running API.
+
+    python -m benchmarks.serialization --documents 500 --rounds 20
+"""
+import argparse
+import copy
+import json
+import random
+import statistics
+import time
+from datetime import datetime, timedelta
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from responses import dumps, with_public_ids
+
+FIELD_COUNT = 100
+
+def make_candidate(index: int, rng: random.Random) -> dict:
+    created_at = datetime(2024, 1, 1) + timedelta(seconds=rng.randint(0, 10_000_000), milliseconds=rng.randint(0, 999))
+    candidate = {
+        "_id": ObjectId(),
+        "name": f"Candidate {index}",
+        "email": f"candidate{index}@example.com",
+        "phone": f"98{rng.randint(10_000_000, 99_999_999)}",
+        "job_id": f"jb{rng.randint(1000, 9999)}",
+        "status": rng.choice(["applied", "screening", "interview", "selected", "rejected"]),
+        "created_at": created_at,
+        "skill_assessments": [{"skill": f"skill-{n}", "rating": rng.randint(1, 5)} for n in range(3)],
+    }
+    # Pad with a realistic mix of strings, numbers, nulls and flags up to FIELD_COUNT keys
+    for n in range(FIELD_COUNT - len(candidate)):
+        kind = n % 4
+        if kind == 0:
+            candidate[f"field_{n}"] = f"value {rng.random():.6f} for field {n}"
+        elif kind == 1:
+            candidate[f"field_{n}"] = rng.randint(0, 1_000_000)
+        elif kind == 2:
+            candidate[f"field_{n}"] = None
+        else:
+            candidate[f"field_{n}"] = rng.random() < 0.5
+    return candidate
+
+def legacy_render(documents: list) -> bytes:
+    for document in documents:
+        document["id"] = str(document["_id"])
+        del document["_id"]
+        if "created_at" in document and isinstance(document["created_at"], datetime):
+            document["created_at"] = document["created_at"].isoformat()
+    return JSONResponse(content=jsonable_encoder(documents)).body
+
+def orjson_render(documents: list) -> bytes:
+    return dumps(with_public_ids(documents))
+
+def time_renderer(render, pages: list) -> list:
+    samples = []
+    for page in pages:
+        started = time.perf_counter()
+        render(page)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+def summarize(samples: list) -> dict:
+    return {
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3),
+        "min_ms": round(min(samples) * 1000, 3)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=500, help="documents per page")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    page = [make_candidate(index, rng) for index in range(args.documents)]
+
+    legacy_bytes = legacy_render(copy.deepcopy(page))
+    orjson_bytes = orjson_render(copy.deepcopy(page))
+    if legacy_bytes != orjson_bytes:
+        raise SystemExit("Serializers disagree: outputs are not byte-identical")
+
+    # Both paths mutate documents in place, so each round gets a fresh copy
+    legacy = summarize(time_renderer(legacy_render, [copy.deepcopy(page) for _ in range(args.rounds)]))
+    fast = summarize(time_renderer(orjson_render, [copy.deepcopy(page) for _ in range(args.rounds)]))
+
+    print(json.dumps({
+        "documents": args.documents,
+        "fields_per_document": FIELD_COUNT,
+        "rounds": args.rounds,
+        "response_bytes": len(orjson_bytes),
+        "byte_identical": True,
+        "legacy": legacy,
+        "orjson": fast,
+        "speedup": round(legacy["median_ms"] / fast["median_ms"], 1) if fast["median_ms"] else None
+    }, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import re
+from typing import List, Optional
+
+IDENTITY_FIELD = "identity_keys"
+
+# Key type -> candidate field it is derived from
+IDENTITY_SOURCES = {
+    "email": "email",
+    "phone": "phone",
+    "pan": "pan_number",
+    "passport": "passport_number"
+}
+
+# What people type into optional ID fields when they have nothing to enter
+_PLACEHOLDERS = {"NA", "NIL", "NONE", "NULL", "NOTAVAILABLE"}
+_PHONE_DIGITS = 10
+_MIN_PHONE_DIGITS = 7
+
+def _email(value: str) -> Optional[str]:
+    value = value.strip().lower()
+    return value if "@" in value else None
+
+def _phone(value: str) -> Optional[str]:
+    digits = re.sub(r"\D", "", value)
+    if len(digits) < _MIN_PHONE_DIGITS:
+        return None
+    # +91 98765 43210, 098765 43210 and 9876543210 are the same number
+    return digits[-_PHONE_DIGITS:]
+
+def _document_number(value: str) -> Optional[str]:
+    value = re.sub(r"[^0-9A-Za-z]", "", value).upper()
+    return None if len(value) < 5 or value in _PLACEHOLDERS else value
+
+_NORMALIZERS = {
+    "email": _email,
+    "phone": _phone,
+    "pan": _document_number,
+    "passport": _document_number
+}
+
+def identity_keys(candidate: dict) -> List[str]:
+    """Normalized "type:value" keys for the fields that identify a person, e.g. "phone:9876543210\""""
+    keys = []
+    for key_type, field in IDENTITY_SOURCES.items():
+        value = candidate.get(field)
+        if isinstance(value, str):
+            normalized = _NORMALIZERS[key_type](value)
+            if normalized:
+                keys.append(f"{key_type}:{normalized}")
+    return keys
+
+def matched_on(keys: List[str], other_keys: List[str]) -> List[str]:
+    shared = set(keys) & set(other_keys or [])
+    return [key.split(":", 1)[0] for key in keys if key in shared]
+
+async def find_matches(collection, keys: List[str], limit: int) -> List[dict]:
+    """Existing candidates sharing any identity key; a single lookup on the identity_keys index"""
+    if not keys:
+        return []
+    projection = {"name": 1, "job_id": 1, "status": 1, IDENTITY_FIELD: 1}
+    matches = await collection.find({IDENTITY_FIELD: {"$in": keys}}, projection).limit(limit).to_list(length=limit)
+    return [
+        {
+            "id": str(match["_id"]),
+            "name": match.get("name"),
+            "job_id": match.get("job_id"),
+            "status": match.get("status"),
+            "matched_on": matched_on(keys, match.get(IDENTITY_FIELD))
+        }
+        for match in matches
+    ]
+
+async def find_duplicate_groups(collection, key_type: Optional[str], limit: int) -> List[dict]:
+    """Identity keys held by more than one candidate, largest groups first
+
+    Grouping runs in one aggregation over the stored keys, so the cost is a single pass
+    rather than comparing every pair of candidates.
+    """
+    match = {IDENTITY_FIELD: {"$regex": f"^{key_type}:"}} if key_type else {IDENTITY_FIELD: {"$exists": True}}
+    pipeline = [
+        {"$match": match},
+        {"$project": {IDENTITY_FIELD: 1}},
+        {"$unwind": f"${IDENTITY_FIELD}"},
+    ]
+    if key_type:
+        pipeline.append({"$match": match})
+    pipeline += [
+        {"$group": {"_id": f"${IDENTITY_FIELD}", "candidate_ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+        {"$sort": {"count": -1, "_id": 1}},
+        {"$limit": limit}
+    ]
+    groups = await collection.aggregate(pipeline, allowDiskUse=True).to_list(length=limit)
+
+    # One read for the rows of every group on the page
+    candidate_ids = {candidate_id for group in groups for candidate_id in group["candidate_ids"]}
+    projection = {"name": 1, "email": 1, "phone": 1, "job_id": 1, "status": 1, "created_by": 1, "created_at": 1}
+    candidates = {
+        candidate["_id"]: candidate
+        async for candidate in collection.find({"_id": {"$in": list(candidate_ids)}}, projection)
+    }
+
+    report = []
+    for group in groups:
+        group_type, value = group["_id"].split(":", 1)
+        rows = [candidates[candidate_id] for candidate_id in group["candidate_ids"] if candidate_id in candidates]
+        report.append({
+            "key_type": group_type,
+            "value": value,
+            "count": group["count"],
+            "candidates": [{**{key: row[key] for key in row if key != "_id"}, "id": str(row["_id"])} for row in rows]
+        })
+    return report
@@ -0,0 +1,96 @@
+from typing import Iterable, List, Set
+from candidate_identity import IDENTITY_FIELD, IDENTITY_SOURCES, identity_keys
+
+# v1: legacy scalar education fields and experience_entries alongside the structured ones, nulls stored
+# v2: legacy values folded into the structured fields, experience_entries merged into
+#     work_experience_entries, empty values not stored
+# v3: normalized identity_keys stored for duplicate detection
+CURRENT_SCHEMA_VERSION = 3
+SCHEMA_VERSION_FIELD = "schema_version"
+
+# Versions still waiting for the migrator; None also matches documents without the field
+LEGACY_SCHEMA_VERSIONS = [None] + list(range(1, CURRENT_SCHEMA_VERSION))
+
+# Legacy field -> the structured field that replaces it
+LEGACY_FIELD_MAP = {
+    "education_x": "education_x_institute",
+    "education_xii": "education_xii_institute",
+    "education_degree": "education_degree_name",
+    "education_percentage": "education_degree_percentage",
+    "education_duration": "education_degree_duration"
+}
+LEGACY_ENTRIES_FIELD = "experience_entries"
+ENTRIES_FIELD = "work_experience_entries"
+
+_ENTRY_IDENTITY = ("organization", "project", "start_month_year")
+
+def _is_empty(value) -> bool:
+    return value is None or value == "" or value == [] or value == {}
+
+def _merge_entries(entries: List[dict], legacy_entries: List[dict]) -> List[dict]:
+    # A legacy entry that already exists as a work entry is a duplicate, not a second job
+    seen = {tuple((entry or {}).get(field) for field in _ENTRY_IDENTITY) for entry in entries}
+    merged = list(entries)
+    for entry in legacy_entries:
+        if not entry:
+            continue
+        identity = tuple(entry.get(field) for field in _ENTRY_IDENTITY)
+        if identity not in seen:
+            seen.add(identity)
+            merged.append({**entry, "role_designation": entry.get("role_designation", ""), "responsibilities": entry.get("responsibilities", [])})
+    return merged
+
+def compact_candidate(candidate: dict) -> dict:
+    """Rewrite a candidate into the current layout in place; safe to apply to already compact documents"""
+    for legacy_field, field in LEGACY_FIELD_MAP.items():
+        value = candidate.pop(legacy_field, None)
+        if not _is_empty(value) and _is_empty(candidate.get(field)):
+            candidate[field] = value
+
+    legacy_entries = candidate.pop(LEGACY_ENTRIES_FIELD, None)
+    if legacy_entries:
+        candidate[ENTRIES_FIELD] = _merge_entries(candidate.get(ENTRIES_FIELD) or [], legacy_entries)
+
+    for field in [field for field, value in candidate.items() if _is_empty(value) and field != "_id"]:
+        del candidate[field]
+    return candidate
+
+def stored_candidate(candidate: dict) -> dict:
+    """compact_candidate plus the fields derived for storage only; needs every identity source field"""
+    compact_candidate(candidate)
+    keys = identity_keys(candidate)
+    if keys:
+        candidate[IDENTITY_FIELD] = keys
+    else:
+        candidate.pop(IDENTITY_FIELD, None)
+    return candidate
+
+def upgrade_candidate(candidate: dict) -> dict:
+    """Read-time upgrader: documents the migrator has not reached yet are served in the current layout"""
+    if (candidate.get(SCHEMA_VERSION_FIELD) or 1) < CURRENT_SCHEMA_VERSION:
+        compact_candidate(candidate)
+    return candidate
+
+def upgrade_candidates(candidates: Iterable[dict]) -> Iterable[dict]:
+    for candidate in candidates:
+        upgrade_candidate(candidate)
+    return candidates
+
+def new_candidate(candidate: dict) -> dict:
+    """Documents written by the API are born in the current layout"""
+    stored_candidate(candidate)
+    candidate[SCHEMA_VERSION_FIELD] = CURRENT_SCHEMA_VERSION
+    return candidate
+
+def related_fields(fields: Iterable[str]) -> Set[str]:
+    """Fields an edit of these fields can also change, once legacy input is folded into the current layout"""
+    related = set(fields)
+    for field in fields:
+        if field in LEGACY_FIELD_MAP:
+            related.add(LEGACY_FIELD_MAP[field])
+        elif field == LEGACY_ENTRIES_FIELD:
+            related.add(ENTRIES_FIELD)
+    # Identity keys are derived from all four sources together
+    if related & set(IDENTITY_SOURCES.values()):
+        related |= {IDENTITY_FIELD, *IDENTITY_SOURCES.values()}
+    return related
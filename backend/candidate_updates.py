@@ -0,0 +1,40 @@
+from typing import Tuple
+from models import CandidateUpdate
+from candidate_schema import related_fields, stored_candidate
+
+# A blank value for these keeps the stored one rather than clearing it
+REQUIRED_FIELDS = ("name", "email", "phone", "job_id")
+
+def requested_changes(candidate_update: CandidateUpdate) -> dict:
+    """Only the fields the client actually sent; model defaults (status, empty lists) never leak in"""
+    requested = candidate_update.model_dump(exclude_unset=True)
+    for field in REQUIRED_FIELDS:
+        if field in requested and not requested[field]:
+            del requested[field]
+    return requested
+
+def diff_candidate(requested: dict, stored: dict) -> Tuple[dict, dict]:
+    """Compare requested fields with the stored document and return ($set, $unset) for the changed paths only
+
+    stored needs every field in related_fields(requested); legacy input is folded into the current layout first.
+    """
+    fields = related_fields(requested)
+    proposed = stored_candidate({**{field: stored[field] for field in fields if field in stored}, **requested})
+    to_set = {}
+    to_unset = {}
+    for field in fields:
+        if field in proposed:
+            if field not in stored or stored[field] != proposed[field]:
+                to_set[field] = proposed[field]
+        elif stored.get(field) not in (None, "", []):
+            # Cleared by the client; a field that is already absent or empty needs no write
+            to_unset[field] = ""
+    return to_set, to_unset
+
+def update_document(to_set: dict, to_unset: dict) -> dict:
+    update = {}
+    if to_set:
+        update["$set"] = to_set
+    if to_unset:
+        update["$unset"] = to_unset
+    return update
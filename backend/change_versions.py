@@ -0,0 +1,18 @@
+from typing import Iterable
+from pymongo import UpdateOne
+
+# One counter document per collection, bumped after every API write to it
+VERSIONS_COLLECTION = "change_versions"
+
+async def bump_versions(db, *collections: str):
+    """Record that collections changed; call after the write so readers never pin stale data"""
+    await db.recruitment_portal[VERSIONS_COLLECTION].bulk_write([
+        UpdateOne({"_id": collection}, {"$inc": {"version": 1}}, upsert=True)
+        for collection in collections
+    ], ordered=False)
+
+async def read_versions(db, collections: Iterable[str]) -> dict:
+    versions = {collection: 0 for collection in collections}
+    async for row in db.recruitment_portal[VERSIONS_COLLECTION].find({"_id": {"$in": list(versions)}}):
+        versions[row["_id"]] = row.get("version", 0)
+    return versions
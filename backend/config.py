@@ -8,5 +8,63 @@ class Settings:
     JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY", "your_super_secret_jwt_key_here_make_it_long_and_random")
     JWT_ALGORITHM: str = os.getenv("JWT_ALGORITHM", "HS256")
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "30"))
+    STREAM_TOKEN_EXPIRE_SECONDS: int = int(os.getenv("STREAM_TOKEN_EXPIRE_SECONDS", "60"))
+    MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", "10"))
+    MONGO_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    MONGO_CONNECT_TIMEOUT_MS: int = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+    MONGO_COMPRESSORS: str = os.getenv("MONGO_COMPRESSORS", "zlib")
+    MONGO_LIST_READ_PREFERENCE: str = os.getenv("MONGO_LIST_READ_PREFERENCE", "primary")
+    MONGO_DASHBOARD_READ_PREFERENCE: str = os.getenv("MONGO_DASHBOARD_READ_PREFERENCE", "primary")
+    MONGO_MAX_STALENESS_SECONDS: int = int(os.getenv("MONGO_MAX_STALENESS_SECONDS", "90"))
+    MONGO_WARMUP_CONNECTIONS: int = int(os.getenv("MONGO_WARMUP_CONNECTIONS", "10"))
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    SLOW_QUERY_THRESHOLD_MS: int = int(os.getenv("SLOW_QUERY_THRESHOLD_MS", "100"))
+    SLOW_QUERY_RING_SIZE: int = int(os.getenv("SLOW_QUERY_RING_SIZE", "200"))
+    SLOW_QUERY_MAX_SHAPES: int = int(os.getenv("SLOW_QUERY_MAX_SHAPES", "500"))
+    SLOW_QUERY_EXPLAIN: bool = os.getenv("SLOW_QUERY_EXPLAIN", "true").lower() == "true"
+    READY_MAX_PING_MS: int = int(os.getenv("READY_MAX_PING_MS", "250"))
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", "60"))
+    PRINCIPAL_CACHE_MAX_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_MAX_SIZE", "1024"))
+    DASHBOARD_CACHE_TTL_SECONDS: int = int(os.getenv("DASHBOARD_CACHE_TTL_SECONDS", "15"))
+    DASHBOARD_CACHE_MAX_SIZE: int = int(os.getenv("DASHBOARD_CACHE_MAX_SIZE", "512"))
+    ROLLUP_INTERVAL_SECONDS: int = int(os.getenv("ROLLUP_INTERVAL_SECONDS", "60"))
+    ROLLUP_BATCH_SIZE: int = int(os.getenv("ROLLUP_BATCH_SIZE", "1000"))
+    ROLLUP_MAX_BATCHES_PER_RUN: int = int(os.getenv("ROLLUP_MAX_BATCHES_PER_RUN", "50"))
+    ROLLUP_LEASE_SECONDS: int = int(os.getenv("ROLLUP_LEASE_SECONDS", "300"))
+    ROLLUP_SETTLE_SECONDS: int = int(os.getenv("ROLLUP_SETTLE_SECONDS", "120"))
+    MIGRATION_INTERVAL_SECONDS: int = int(os.getenv("MIGRATION_INTERVAL_SECONDS", "300"))
+    MIGRATION_BATCH_SIZE: int = int(os.getenv("MIGRATION_BATCH_SIZE", "100"))
+    MIGRATION_OPS_PER_SECOND: int = int(os.getenv("MIGRATION_OPS_PER_SECOND", "200"))
+    MIGRATION_LEASE_SECONDS: int = int(os.getenv("MIGRATION_LEASE_SECONDS", "300"))
+    REFERENCE_CACHE_TTL_SECONDS: int = int(os.getenv("REFERENCE_CACHE_TTL_SECONDS", "300"))
+    REFERENCE_CACHE_MAX_SIZE: int = int(os.getenv("REFERENCE_CACHE_MAX_SIZE", "10000"))
+    PAGE_SIZE_DEFAULT: int = int(os.getenv("PAGE_SIZE_DEFAULT", "100"))
+    PAGE_SIZE_MAX: int = int(os.getenv("PAGE_SIZE_MAX", "500"))
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    EXPORT_FLUSH_ROWS: int = int(os.getenv("EXPORT_FLUSH_ROWS", "500"))
+    EXPORT_MAX_NESTED_ENTRIES: int = int(os.getenv("EXPORT_MAX_NESTED_ENTRIES", "5"))
+    INGEST_BATCH_SIZE: int = int(os.getenv("INGEST_BATCH_SIZE", "1000"))
+    INGEST_MAX_ERRORS_REPORTED: int = int(os.getenv("INGEST_MAX_ERRORS_REPORTED", "1000"))
+    HASH_MAX_WORKERS: int = int(os.getenv("HASH_MAX_WORKERS", str(min(4, os.cpu_count() or 1))))
+    HASH_MAX_QUEUE_DEPTH: int = int(os.getenv("HASH_MAX_QUEUE_DEPTH", "200"))
+    DUPLICATE_MATCH_LIMIT: int = int(os.getenv("DUPLICATE_MATCH_LIMIT", "20"))
+    MATCH_REBUILD_INTERVAL_SECONDS: int = int(os.getenv("MATCH_REBUILD_INTERVAL_SECONDS", "600"))
+    MATCH_SETTLE_SECONDS: int = int(os.getenv("MATCH_SETTLE_SECONDS", "120"))
+    RESUME_TEMPLATE_PATH: str = os.getenv("RESUME_TEMPLATE_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "resume_template.docx"))
+    RESUME_MAX_WORKERS: int = int(os.getenv("RESUME_MAX_WORKERS", str(os.cpu_count() or 1)))
+    RESUME_MAX_QUEUE_DEPTH: int = int(os.getenv("RESUME_MAX_QUEUE_DEPTH", "64"))
+    RESUME_BATCH_MAX_SIZE: int = int(os.getenv("RESUME_BATCH_MAX_SIZE", "1000"))
+    STATUS_BATCH_MAX_SIZE: int = int(os.getenv("STATUS_BATCH_MAX_SIZE", "1000"))
+    EVENT_BROKER: str = os.getenv("EVENT_BROKER", "memory")
+    EVENT_HEARTBEAT_SECONDS: int = int(os.getenv("EVENT_HEARTBEAT_SECONDS", "20"))
+    EVENT_COALESCE_SECONDS: float = float(os.getenv("EVENT_COALESCE_SECONDS", "0.5"))
+    EVENT_MAX_PENDING: int = int(os.getenv("EVENT_MAX_PENDING", "100"))
+    EVENT_STREAM_RETRY_SECONDS: int = int(os.getenv("EVENT_STREAM_RETRY_SECONDS", "5"))
+    EVENT_RETENTION_SECONDS: int = int(os.getenv("EVENT_RETENTION_SECONDS", "86400"))
+    ENSURE_INDEXES_ON_STARTUP: bool = os.getenv("ENSURE_INDEXES_ON_STARTUP", "true").lower() == "true"
+    QUERY_PLAN_CHECK_ON_STARTUP: bool = os.getenv("QUERY_PLAN_CHECK_ON_STARTUP", "false").lower() == "true"
 
 settings = Settings() 
\ No newline at end of file
@@ -0,0 +1,97 @@
+import asyncio
+from cache import TTLCache
+from config import settings
+
+# Dashboard payloads shared by every request from the same scope for a few seconds
+dashboard_cache = TTLCache(
+    max_size=settings.DASHBOARD_CACHE_MAX_SIZE,
+    ttl_seconds=settings.DASHBOARD_CACHE_TTL_SECONDS
+)
+
+def _status_group():
+    return {"$group": {"_id": "$status", "count": {"$sum": 1}}}
+
+async def _count_by_status(cursor) -> dict:
+    counts = {}
+    async for row in cursor:
+        counts[row["_id"]] = row["count"]
+    return counts
+
+async def _job_counts(db, match: dict) -> dict:
+    pipeline = [{"$match": match}, _status_group()]
+    return await _count_by_status(db.recruitment_portal.jobs.aggregate(pipeline))
+
+async def _candidate_counts(db) -> dict:
+    pipeline = [_status_group()]
+    return await _count_by_status(db.recruitment_portal.candidates.aggregate(pipeline))
+
+async def _candidate_counts_for_hr(db, hr_id: str) -> dict:
+    # Scope candidates to the HR's jobs inside the server instead of shipping job ids back and forth
+    pipeline = [
+        {"$match": {"assigned_hr": hr_id}},
+        {"$project": {"_id": 0, "job_id": 1}},
+        {"$lookup": {
+            "from": "candidates",
+            "localField": "job_id",
+            "foreignField": "job_id",
+            "pipeline": [{"$project": {"_id": 0, "status": 1}}],
+            "as": "candidate"
+        }},
+        {"$unwind": "$candidate"},
+        {"$group": {"_id": "$candidate.status", "count": {"$sum": 1}}}
+    ]
+    return await _count_by_status(db.recruitment_portal.jobs.aggregate(pipeline))
+
+async def get_admin_dashboard_counts(db, version: str = "") -> dict:
+    # Keying on the data version means a changed collection never serves old counts
+    cache_key = ("admin", version)
+    cached = dashboard_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    job_counts, candidate_counts, hr_users = await asyncio.gather(
+        _job_counts(db, {}),
+        _candidate_counts(db),
+        db.recruitment_portal.users.count_documents({"role": "hr"})
+    )
+    
+    dashboard = {
+        "total_jobs": sum(job_counts.values()),
+        "open_jobs": job_counts.get("open", 0),
+        "allocated_jobs": job_counts.get("allocated", 0),
+        "closed_jobs": job_counts.get("closed", 0),
+        "submitted_jobs": job_counts.get("submit", 0),
+        "total_candidates": sum(candidate_counts.values()),
+        "selected_candidates": candidate_counts.get("selected", 0),
+        "rejected_candidates": candidate_counts.get("rejected", 0),
+        "hr_users": hr_users
+    }
+    dashboard_cache.set(cache_key, dashboard)
+    return dashboard
+
+async def get_hr_dashboard_counts(db, hr_id: str, version: str = "") -> dict:
+    cache_key = ("hr", hr_id, version)
+    cached = dashboard_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    job_counts, candidate_counts = await asyncio.gather(
+        _job_counts(db, {"assigned_hr": hr_id}),
+        _candidate_counts_for_hr(db, hr_id)
+    )
+    
+    dashboard = {
+        "total_jobs": sum(job_counts.values()),
+        "open_jobs": job_counts.get("open", 0),
+        "closed_jobs": job_counts.get("closed", 0),
+        "allocated_jobs": job_counts.get("allocated", 0),
+        "submitted_jobs": job_counts.get("submit", 0),
+        "total_candidates": sum(candidate_counts.values()),
+        "selected_candidates": candidate_counts.get("selected", 0),
+        "rejected_candidates": candidate_counts.get("rejected", 0),
+        "in_progress_candidates": candidate_counts.get("in_progress", 0),
+        "interviewed_candidates": candidate_counts.get("interviewed", 0),
+        "applied_candidates": candidate_counts.get("applied", 0)
+    }
+    dashboard_cache.set(cache_key, dashboard)
+    return dashboard
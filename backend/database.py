@@ -1,19 +1,84 @@
+import asyncio
+import time
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo.read_preferences import read_pref_mode_from_name, make_read_preference
 from config import settings
+from pool_metrics import pool_metrics
+from metrics import command_metrics
+from slow_queries import slow_query_log
+
+DATABASE_NAME = "recruitment_portal"
+
+# Route families that may read from secondaries, and the setting that picks their read preference
+READ_PREFERENCE_SETTINGS = {
+    "lists": "MONGO_LIST_READ_PREFERENCE",
+    "dashboards": "MONGO_DASHBOARD_READ_PREFERENCE"
+}
 
 class Database:
     client: AsyncIOMotorClient = None
+    readers: dict = {}
+
+class _Reader:
+    """Client stand-in whose recruitment_portal database reads with a non-primary read preference"""
+
+    def __init__(self, database):
+        self.recruitment_portal = database
 
 db = Database()
 
 async def get_database() -> AsyncIOMotorClient:
     return db.client
 
+def read_preference_name(kind: str) -> str:
+    return getattr(settings, READ_PREFERENCE_SETTINGS[kind])
+
+async def get_reader(kind: str):
+    """Handle for a route family's reads; same db.recruitment_portal.<collection> shape as get_database()"""
+    name = read_preference_name(kind)
+    if name == "primary":
+        return db.client
+    if kind not in db.readers:
+        max_staleness = settings.MONGO_MAX_STALENESS_SECONDS if settings.MONGO_MAX_STALENESS_SECONDS > 0 else -1
+        read_preference = make_read_preference(read_pref_mode_from_name(name), None, max_staleness=max_staleness)
+        db.readers[kind] = _Reader(db.client.get_database(DATABASE_NAME, read_preference=read_preference))
+    return db.readers[kind]
+
+def _client_options() -> dict:
+    options = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS or None,
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS or None,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "event_listeners": [pool_metrics, command_metrics, slow_query_log]
+    }
+    if settings.MONGO_COMPRESSORS:
+        options["compressors"] = settings.MONGO_COMPRESSORS
+    return options
+
 async def connect_to_mongo():
-    db.client = AsyncIOMotorClient(settings.MONGODB_URL)
+    db.client = AsyncIOMotorClient(settings.MONGODB_URL, **_client_options())
+    db.readers = {}
+    slow_query_log.attach(db.client, asyncio.get_running_loop())
     print("Connected to MongoDB Atlas")
 
+async def warm_up_pool(connections: int = None) -> float:
+    """Open pooled connections before traffic arrives; concurrent pings each need their own socket"""
+    connections = settings.MONGO_WARMUP_CONNECTIONS if connections is None else connections
+    started = time.perf_counter()
+    if connections > 0:
+        await asyncio.gather(*(db.client.admin.command("ping") for _ in range(connections)))
+    return time.perf_counter() - started
+
+async def ping() -> float:
+    """Round-trip time of a ping to the primary, in seconds"""
+    started = time.perf_counter()
+    await db.client.admin.command("ping")
+    return time.perf_counter() - started
+
 async def close_mongo_connection():
     if db.client:
         db.client.close()
-        print("Disconnected from MongoDB Atlas") 
\ No newline at end of file
+        print("Disconnected from MongoDB Atlas")
@@ -4,8 +4,9 @@ from fastapi.exceptions import RequestValidationError
 from starlette.exceptions import HTTPException as StarletteHTTPException
 import logging
 from typing import Union
-from pymongo.errors import PyMongoError
+from pymongo.errors import PyMongoError, ServerSelectionTimeoutError, WaitQueueTimeoutError
 from bson.errors import InvalidId
+from etags import NotModified, not_modified_handler
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -74,6 +75,18 @@ async def pymongo_exception_handler(request: Request, exc: PyMongoError):
         }
     )
 
+async def mongo_unavailable_exception_handler(request: Request, exc: PyMongoError):
+    """Handle an exhausted pool or unreachable cluster; clients may retry"""
+    logger.error(f"MongoDB unavailable: {str(exc)}")
+    return JSONResponse(
+        status_code=503,
+        content={
+            "detail": "Database temporarily unavailable",
+            "error_code": "DATABASE_UNAVAILABLE"
+        },
+        headers={"Retry-After": "1"}
+    )
+
 async def invalid_id_exception_handler(request: Request, exc: InvalidId):
     """Handle invalid ObjectId errors"""
     logger.warning(f"Invalid ObjectId: {str(exc)}")
@@ -101,6 +114,9 @@ def register_exception_handlers(app):
     app.add_exception_handler(RequestValidationError, validation_exception_handler)
     app.add_exception_handler(HTTPException, http_exception_handler)
     app.add_exception_handler(StarletteHTTPException, http_exception_handler)
+    app.add_exception_handler(WaitQueueTimeoutError, mongo_unavailable_exception_handler)
+    app.add_exception_handler(ServerSelectionTimeoutError, mongo_unavailable_exception_handler)
     app.add_exception_handler(PyMongoError, pymongo_exception_handler)
     app.add_exception_handler(InvalidId, invalid_id_exception_handler)
+    app.add_exception_handler(NotModified, not_modified_handler)
     app.add_exception_handler(Exception, general_exception_handler) 
\ No newline at end of file
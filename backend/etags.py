@@ -0,0 +1,55 @@
+import hashlib
+import time
+from fastapi import Depends, Request, Response
+from database import get_database, read_preference_name
+from config import settings
+from change_versions import read_versions
+from routes.auth import get_current_user
+
+CACHE_CONTROL = "private, no-cache"
+
+class NotModified(Exception):
+    def __init__(self, etag: str):
+        self.etag = etag
+
+def data_version(versions: dict) -> str:
+    return "|".join(f"{collection}:{version}" for collection, version in sorted(versions.items()))
+
+def make_etag(request: Request, current_user: dict, versions: dict) -> str:
+    # Responses vary by path, query and caller (HR scoping), so all of them feed the tag
+    query = "&".join(sorted(f"{key}={value}" for key, value in request.query_params.multi_items()))
+    key = f"{request.url.path}?{query}|{current_user['_id']}|{current_user.get('role')}|{data_version(versions)}"
+    return '"' + hashlib.sha1(key.encode()).hexdigest() + '"'
+
+def _matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+def conditional_get(*collections: str, reads: str = None):
+    """Dependency that answers 304 when none of the collections changed since the client's copy
+
+    reads names the route family (see database.get_reader) when the data may come from a secondary.
+    """
+    async def dependency(request: Request, response: Response, current_user: dict = Depends(get_current_user)) -> str:
+        db = await get_database()
+        # Versions are read before the data, so a racing write can only make the tag older, never stale
+        versions = await read_versions(db, collections)
+        if reads and read_preference_name(reads) != "primary":
+            # A lagging secondary can serve pre-write data under the new version; the staleness
+            # window bucket makes such a tag expire once the secondary must have caught up
+            versions["staleness_window"] = int(time.time() // max(settings.MONGO_MAX_STALENESS_SECONDS, 1))
+        etag = make_etag(request, current_user, versions)
+        # The ETag is per caller; caches shared across callers key on the data version alone
+        request.state.data_version = data_version(versions)
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match and _matches(if_none_match, etag):
+            raise NotModified(etag)
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+        return etag
+    return dependency
+
+async def not_modified_handler(request: Request, exc: NotModified):
+    return Response(status_code=304, headers={"ETag": exc.etag, "Cache-Control": CACHE_CONTROL})
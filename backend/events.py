@@ -0,0 +1,225 @@
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set
+from pymongo.errors import PyMongoError
+from config import settings
+from database import get_database
+
+logger = logging.getLogger(__name__)
+
+EVENTS_COLLECTION = "change_events"
+ALL_SCOPES = "*"
+
+JOB_ALLOCATED = "job.allocated"
+CANDIDATE_CREATED = "candidate.created"
+CANDIDATE_STATUS_CHANGED = "candidate.status_changed"
+RESYNC = "resync"
+
+def make_event(
+    event_type: str,
+    job_id: Optional[str] = None,
+    hr_id: Optional[str] = None,
+    candidate_id: Optional[str] = None,
+    status: Optional[str] = None
+) -> dict:
+    return {
+        "type": event_type,
+        "job_id": job_id,
+        "hr_id": hr_id,
+        "candidate_id": candidate_id,
+        "status": status,
+        "at": datetime.utcnow().isoformat()
+    }
+
+class Subscription:
+    """One connected client; pending events are coalesced per entity until the stream drains them"""
+    __slots__ = ("scope", "_pending", "_ready", "_overflowed")
+
+    def __init__(self, scope: str):
+        self.scope = scope
+        self._pending: Dict[tuple, dict] = {}
+        self._ready = asyncio.Event()
+        self._overflowed = False
+
+    def offer(self, event: dict):
+        if self._overflowed:
+            return
+        key = (event["type"], event.get("candidate_id") or event.get("job_id"))
+        if key not in self._pending and len(self._pending) >= settings.EVENT_MAX_PENDING:
+            # A slow client gets one resync instead of an unbounded backlog
+            self._overflowed = True
+            self._pending.clear()
+        else:
+            # A later event for the same entity replaces the earlier one
+            self._pending[key] = event
+        self._ready.set()
+
+    async def next_batch(self, timeout: float) -> Optional[List[dict]]:
+        """Wait for events; None means the timeout passed and the caller should send a heartbeat"""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        # Give bursts (bulk status changes, CSV uploads) a moment to coalesce
+        if settings.EVENT_COALESCE_SECONDS > 0:
+            await asyncio.sleep(settings.EVENT_COALESCE_SECONDS)
+        self._ready.clear()
+        if self._overflowed:
+            self._overflowed = False
+            return [make_event(RESYNC)]
+        batch = list(self._pending.values())
+        self._pending.clear()
+        return batch
+
+class Broker(ABC):
+    """Fans change events out to this process's subscribers; subclasses decide how events travel"""
+
+    def __init__(self):
+        self._subscribers: Dict[str, Set[Subscription]] = {}
+
+    def subscribe(self, principal: dict) -> Subscription:
+        # Admins see everything; HR users only events on jobs assigned to them
+        scope = ALL_SCOPES if principal.get("role") == "admin" else str(principal["_id"])
+        subscription = Subscription(scope)
+        self._subscribers.setdefault(scope, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        subscribers = self._subscribers.get(subscription.scope)
+        if subscribers is not None:
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.scope]
+
+    def dispatch(self, event: dict):
+        # Subscribers are indexed by scope, so an event only touches the clients allowed to see it
+        for subscription in self._subscribers.get(ALL_SCOPES, ()):
+            subscription.offer(event)
+        if event.get("hr_id"):
+            for subscription in self._subscribers.get(event["hr_id"], ()):
+                subscription.offer(event)
+
+    def stats(self) -> dict:
+        return {
+            "broker": type(self).__name__,
+            "connections": sum(len(subscribers) for subscribers in self._subscribers.values()),
+            "scopes": len(self._subscribers)
+        }
+
+    @abstractmethod
+    async def publish(self, events: List[dict]):
+        """Deliver events to every process's subscribers"""
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+class InProcessBroker(Broker):
+    """Delivers events to clients connected to this process only; fine for a single worker"""
+
+    async def publish(self, events: List[dict]):
+        for event in events:
+            self.dispatch(event)
+
+class MongoChangeStreamBroker(Broker):
+    """Publishes by inserting into change_events; every process tails that collection's change stream"""
+
+    def __init__(self):
+        super().__init__()
+        self._task: Optional[asyncio.Task] = None
+
+    async def publish(self, events: List[dict]):
+        db = await get_database()
+        created_at = datetime.utcnow()
+        await db.recruitment_portal[EVENTS_COLLECTION].insert_many(
+            [{**event, "created_at": created_at} for event in events], ordered=False
+        )
+
+    async def _watch(self):
+        resume_token = None
+        while True:
+            try:
+                db = await get_database()
+                async with db.recruitment_portal[EVENTS_COLLECTION].watch(
+                    [{"$match": {"operationType": "insert"}}], resume_after=resume_token
+                ) as stream:
+                    async for change in stream:
+                        resume_token = stream.resume_token
+                        event = change["fullDocument"]
+                        event.pop("_id", None)
+                        event.pop("created_at", None)
+                        self.dispatch(event)
+            except PyMongoError as exc:
+                logger.error(f"Change stream on {EVENTS_COLLECTION} failed: {exc}")
+                # The token may have fallen off the oplog; clients are told to resync either way
+                resume_token = None
+                for subscribers in list(self._subscribers.values()):
+                    for subscription in subscribers:
+                        subscription.offer(make_event(RESYNC))
+                await asyncio.sleep(settings.EVENT_STREAM_RETRY_SECONDS)
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._watch())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+BROKERS = {
+    "memory": InProcessBroker,
+    "mongo": MongoChangeStreamBroker
+}
+
+def create_broker() -> Broker:
+    if settings.EVENT_BROKER not in BROKERS:
+        raise RuntimeError(f"Unknown EVENT_BROKER '{settings.EVENT_BROKER}', expected one of {sorted(BROKERS)}")
+    return BROKERS[settings.EVENT_BROKER]()
+
+broker = create_broker()
+
+async def publish_events(events: List[dict]):
+    """Publish from a write route; a broker failure is logged, never surfaced to the writer"""
+    if not events:
+        return
+    try:
+        await broker.publish(events)
+    except PyMongoError as exc:
+        logger.error(f"Failed to publish {len(events)} change events: {exc}")
+
+async def job_assignees(db, job_ids: Iterable[str]) -> dict:
+    """Map job_id -> assigned HR id, so events can be scoped to the HR who owns the job"""
+    job_ids = list({job_id for job_id in job_ids if job_id})
+    if not job_ids:
+        return {}
+    cursor = db.recruitment_portal.jobs.find({"job_id": {"$in": job_ids}}, {"_id": 0, "job_id": 1, "assigned_hr": 1})
+    return {job["job_id"]: job.get("assigned_hr") async for job in cursor}
+
+async def publish_status_changes(db, changes: List[dict]):
+    """changes: [{candidate_id, job_id, status}] from a single or batch status update"""
+    assignees = await job_assignees(db, (change["job_id"] for change in changes))
+    await publish_events([
+        make_event(
+            CANDIDATE_STATUS_CHANGED,
+            job_id=change["job_id"],
+            hr_id=assignees.get(change["job_id"]),
+            candidate_id=change["candidate_id"],
+            status=change["status"]
+        )
+        for change in changes
+    ])
+
+async def start_event_broker():
+    await broker.start()
+
+async def stop_event_broker():
+    await broker.stop()
@@ -0,0 +1,109 @@
+import csv
+import io
+import json
+from datetime import datetime
+from typing import AsyncIterator, List
+from bson import ObjectId
+from config import settings
+from models import CandidateBase, SkillAssessment, WorkExperienceEntry, ExperienceEntry
+from candidate_schema import upgrade_candidate
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson"
+}
+
+# Nested candidate lists flattened into numbered column groups
+CANDIDATE_NESTED_LISTS = {
+    "skill_assessments": SkillAssessment,
+    "work_experience_entries": WorkExperienceEntry,
+    "experience_entries": ExperienceEntry,
+}
+
+JOB_COLUMNS = [
+    "id", "job_id", "title", "description", "location", "salary_package", "source_company",
+    "status", "assigned_hr", "uploaded_by", "opening_date", "created_at"
+]
+
+def candidate_columns() -> List[str]:
+    columns = ["id"]
+    columns += [field for field in CandidateBase.model_fields if field not in CANDIDATE_NESTED_LISTS]
+    columns += ["job_title", "notes", "created_by", "last_updated_by", "created_at"]
+    for list_field, entry_model in CANDIDATE_NESTED_LISTS.items():
+        for index in range(1, settings.EXPORT_MAX_NESTED_ENTRIES + 1):
+            columns += [f"{list_field}_{index}_{field}" for field in entry_model.model_fields]
+    return columns
+
+def _cell(value):
+    if value is None:
+        return ""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, list):
+        return "; ".join(str(_cell(item)) for item in value)
+    if isinstance(value, ObjectId):
+        return str(value)
+    return value
+
+def flatten_candidate(candidate: dict) -> dict:
+    upgrade_candidate(candidate)
+    row = {key: _cell(value) for key, value in candidate.items() if key not in CANDIDATE_NESTED_LISTS}
+    row["id"] = str(candidate.get("_id", ""))
+    for list_field in CANDIDATE_NESTED_LISTS:
+        entries = candidate.get(list_field) or []
+        for index, entry in enumerate(entries[:settings.EXPORT_MAX_NESTED_ENTRIES], start=1):
+            for field, value in (entry or {}).items():
+                row[f"{list_field}_{index}_{field}"] = _cell(value)
+    return row
+
+def flatten_job(job: dict) -> dict:
+    row = {key: _cell(value) for key, value in job.items()}
+    row["id"] = str(job.get("_id", ""))
+    return row
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+async def stream_csv(cursor, columns: List[str], flatten) -> AsyncIterator[str]:
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    # Flush the header immediately so the first byte goes out before the first batch
+    yield buffer.getvalue()
+    buffer.seek(0)
+    buffer.truncate()
+
+    rows = 0
+    async for document in cursor:
+        writer.writerow(flatten(document))
+        rows += 1
+        if rows % settings.EXPORT_FLUSH_ROWS == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+async def stream_ndjson(cursor) -> AsyncIterator[str]:
+    lines = []
+    async for document in cursor:
+        document["id"] = str(document.pop("_id"))
+        lines.append(json.dumps(document, default=_json_default))
+        if len(lines) >= settings.EXPORT_FLUSH_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines = []
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+def export_stream(cursor, export_format: str, columns: List[str], flatten) -> AsyncIterator[str]:
+    if export_format == "ndjson":
+        return stream_ndjson(cursor)
+    return stream_csv(cursor, columns, flatten)
+
+def export_headers(name: str, export_format: str) -> dict:
+    filename = f"{name}_{datetime.utcnow().strftime('%Y%m%d%H%M%S')}.{export_format}"
+    return {"Content-Disposition": f'attachment; filename="{filename}"'}
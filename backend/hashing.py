@@ -0,0 +1,76 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from fastapi import HTTPException
+from passlib.context import CryptContext
+from config import settings
+
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+
+class HashingExecutor:
+    """Runs bcrypt on a dedicated thread pool with bounded concurrency and a queue limit"""
+
+    def __init__(self, max_workers: int, max_queue_depth: int):
+        # bcrypt releases the GIL, so threads give real parallelism without pickling overhead
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bcrypt")
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.queue_depth = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.peak_queue_depth = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    async def run(self, func, *args):
+        if self.queue_depth >= self.max_queue_depth:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Authentication service busy, please retry")
+
+        self.queue_depth += 1
+        self.peak_queue_depth = max(self.peak_queue_depth, self.queue_depth)
+        queued_at = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queue_depth -= 1
+
+        started_at = time.perf_counter()
+        self.total_wait_seconds += started_at - queued_at
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.total_run_seconds += time.perf_counter() - started_at
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue_depth": self.max_queue_depth,
+            "queue_depth": self.queue_depth,
+            "peak_queue_depth": self.peak_queue_depth,
+            "running": self.running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            "avg_run_ms": round(self.total_run_seconds / self.completed * 1000, 2) if self.completed else 0.0
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+hashing_executor = HashingExecutor(
+    max_workers=settings.HASH_MAX_WORKERS,
+    max_queue_depth=settings.HASH_MAX_QUEUE_DEPTH
+)
+
+async def verify_password(plain_password, hashed_password) -> bool:
+    return await hashing_executor.run(pwd_context.verify, plain_password, hashed_password)
+
+async def hash_password(password) -> str:
+    return await hashing_executor.run(pwd_context.hash, password)
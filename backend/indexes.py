@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import sys
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import PyMongoError
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Declarative index registry: collection -> indexes every hot query relies on
+INDEXES = {
+    "users": [
+        IndexModel([("email", ASCENDING)], name="email_unique", unique=True),
+        IndexModel([("role", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="role_created_at_id"),
+    ],
+    "jobs": [
+        IndexModel([("job_id", ASCENDING)], name="job_id_unique", unique=True),
+        IndexModel(
+            [("assigned_hr", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING)],
+            name="assigned_hr_status_created_at"
+        ),
+        IndexModel(
+            [("assigned_hr", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+            name="assigned_hr_created_at_id"
+        ),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="status_created_at_id"),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+        IndexModel(
+            [("title", TEXT), ("description", TEXT), ("location", TEXT), ("job_id", TEXT)],
+            name="job_search_text",
+            weights={"title": 10, "job_id": 10, "location": 3, "description": 1}
+        ),
+    ],
+    "candidates": [
+        IndexModel([("job_id", ASCENDING), ("status", ASCENDING)], name="job_id_status"),
+        IndexModel([("job_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="job_id_created_at_id"),
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="status_created_at_id"),
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_at_id"),
+        # Lets the schema migrator find its backlog without scanning migrated documents
+        IndexModel([("schema_version", ASCENDING), ("_id", ASCENDING)], name="schema_version_id"),
+        # Multikey over normalized email/phone/PAN/passport keys: duplicate lookups on create and the duplicates report
+        IndexModel([("identity_keys", ASCENDING)], name="identity_keys"),
+        IndexModel(
+            [
+                ("name", TEXT),
+                ("email", TEXT),
+                ("phone", TEXT),
+                ("skills", TEXT),
+                ("skill_assessments.skill_name", TEXT),
+                ("job_title", TEXT)
+            ],
+            name="candidate_search_text",
+            weights={"name": 10, "email": 10, "phone": 10, "skill_assessments.skill_name": 5, "skills": 5, "job_title": 2}
+        ),
+    ],
+    "application_history": [
+        IndexModel(
+            [("candidate_id", ASCENDING), ("timestamp", DESCENDING), ("_id", DESCENDING)],
+            name="candidate_id_timestamp_id"
+        ),
+    ],
+    "funnel_rollups": [
+        IndexModel(
+            [("day", ASCENDING), ("job_id", ASCENDING), ("hr_id", ASCENDING)],
+            name="day_job_id_hr_id_unique",
+            unique=True
+        ),
+        IndexModel([("job_id", ASCENDING), ("day", ASCENDING)], name="job_id_day"),
+        IndexModel([("hr_id", ASCENDING), ("day", ASCENDING)], name="hr_id_day"),
+    ],
+    "change_events": [
+        IndexModel([("created_at", ASCENDING)], name="created_at_ttl", expireAfterSeconds=settings.EVENT_RETENTION_SECONDS),
+    ],
+}
+
+# Canonical query shape behind each route: (name, collection, filter, sort)
+CANONICAL_QUERIES = [
+    ("auth.current_user", "users", {"email": "user@example.com"}, None),
+    ("admin.users", "users", {"role": "hr"}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("admin.jobs", "jobs", {}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("admin.jobs[status]", "jobs", {"status": "open"}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("admin.update_job", "jobs", {"job_id": "jb0000000000"}, None),
+    ("hr.jobs", "jobs", {"assigned_hr": "000000000000000000000000"}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("hr.jobs[status]", "jobs", {"assigned_hr": "000000000000000000000000", "status": "open"}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("admin.candidates", "candidates", {}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("hr.candidates_for_job", "candidates", {"job_id": "jb0000000000"}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("hr.candidates", "candidates", {"job_id": {"$in": ["jb0000000000", "jb0000000001"]}}, [("created_at", DESCENDING), ("_id", DESCENDING)]),
+    ("admin.candidates[q]", "candidates", {"$text": {"$search": "python"}}, None),
+    ("admin.jobs[q]", "jobs", {"$text": {"$search": "engineer"}}, None),
+    ("shared.create_candidate[duplicates]", "candidates", {"identity_keys": {"$in": ["email:user@example.com", "phone:9876543210"]}}, None),
+    ("hr.dashboard.candidates", "candidates", {"job_id": "jb0000000000", "status": "selected"}, None),
+    ("shared.application_history", "application_history", {"candidate_id": "000000000000000000000000"}, [("timestamp", DESCENDING), ("_id", DESCENDING)]),
+    ("admin.reports.funnel", "funnel_rollups", {"day": {"$gte": "2000-01-01"}}, None),
+    ("admin.reports.funnel[job]", "funnel_rollups", {"job_id": "jb0000000000"}, None),
+    ("admin.reports.funnel[hr]", "funnel_rollups", {"hr_id": "000000000000000000000000"}, None),
+]
+
+async def apply_indexes(db) -> dict:
+    """Create every registered index; existing identical indexes are a no-op
+
+    Indexes are created one at a time so one failure (e.g. a unique index over data that already
+    holds duplicates) doesn't keep the rest of the collection's indexes from being built.
+    Returns {"created": {collection: [names]}, "failed": [{collection, index, error}]}.
+    """
+    created = {}
+    failed = []
+    for collection_name, indexes in INDEXES.items():
+        collection = db.recruitment_portal[collection_name]
+        for index in indexes:
+            name = index.document["name"]
+            try:
+                await collection.create_indexes([index])
+                created.setdefault(collection_name, []).append(name)
+            except PyMongoError as exc:
+                logger.error(f"Could not create index {name} on {collection_name}: {str(exc)}")
+                failed.append({"collection": collection_name, "index": name, "error": str(exc)})
+    return {"created": created, "failed": failed}
+
+def _plan_stages(plan: dict):
+    if not isinstance(plan, dict):
+        return
+    if "stage" in plan:
+        yield plan["stage"]
+    for key in ("inputStage", "queryPlan"):
+        yield from _plan_stages(plan.get(key))
+    for child in plan.get("inputStages", []):
+        yield from _plan_stages(child)
+
+async def verify_query_plans(db) -> list:
+    """Explain each canonical query and return the ones whose winning plan is a COLLSCAN"""
+    failures = []
+    for name, collection_name, filter_query, sort in CANONICAL_QUERIES:
+        cursor = db.recruitment_portal[collection_name].find(filter_query)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        winning_plan = explain.get("queryPlanner", {}).get("winningPlan", {})
+        stages = list(_plan_stages(winning_plan))
+        if "COLLSCAN" in stages:
+            failures.append({"query": name, "collection": collection_name, "filter": filter_query, "stages": stages})
+    return failures
+
+async def _main(check: bool) -> int:
+    from database import connect_to_mongo, close_mongo_connection, get_database
+    await connect_to_mongo()
+    try:
+        db = await get_database()
+        applied = await apply_indexes(db)
+        for failure in applied["failed"]:
+            print(f"FAILED: {failure['index']} on {failure['collection']}: {failure['error']}")
+        if not check:
+            return 1 if applied["failed"] else 0
+        failures = await verify_query_plans(db)
+        for failure in failures:
+            print(f"COLLSCAN: {failure['query']} on {failure['collection']} {failure['filter']} -> {failure['stages']}")
+        print(f"{len(CANONICAL_QUERIES) - len(failures)}/{len(CANONICAL_QUERIES)} canonical queries use an index")
+        return 1 if failures or applied["failed"] else 0
+    finally:
+        await close_mongo_connection()
+
+if __name__ == "__main__":
+    # python indexes.py          -> apply the registry
+    # python indexes.py --check  -> apply, then fail on any COLLSCAN plan
+    sys.exit(asyncio.run(_main("--check" in sys.argv)))
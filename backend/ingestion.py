@@ -0,0 +1,149 @@
+import random
+import time
+from datetime import datetime
+from typing import Iterable, Iterator, Optional, Tuple
+from fastapi import HTTPException
+from pydantic import ValidationError
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from config import settings
+from models import JobCreate
+
+JOB_ID_MAX_ATTEMPTS = 5
+DUPLICATE_KEY_ERROR = 11000
+
+def generate_job_id(suffix_digits: int = 2):
+    return f"jb{datetime.now().strftime('%m%d%H%M')}{random.randint(10 ** (suffix_digits - 1), 10 ** suffix_digits - 1)}"
+
+async def insert_job(db, job_data: dict):
+    # job_id is unique-indexed and the short format collides easily; widen the suffix on conflict
+    for attempt in range(JOB_ID_MAX_ATTEMPTS):
+        try:
+            return await db.recruitment_portal.jobs.insert_one(job_data)
+        except DuplicateKeyError:
+            job_data.pop("_id", None)
+            job_data["job_id"] = generate_job_id(suffix_digits=3 + attempt)
+    raise HTTPException(status_code=409, detail="Could not allocate a unique job ID")
+
+# Columns a job CSV must carry; ctc is stored as salary_package
+CSV_REQUIRED_COLUMNS = ["title", "description", "location", "ctc"]
+
+def csv_job_rows(reader) -> Iterator[Tuple[int, dict]]:
+    """(row number, job fields) for each row of a csv.DictReader over an upload"""
+    for row_number, row in enumerate(reader, start=1):
+        yield row_number, {
+            "title": row["title"],
+            "description": row["description"],
+            "location": row["location"],
+            "salary_package": row["ctc"]
+        }
+
+class JobIngestion:
+    """Validates job rows and writes them with unordered insert_many batches"""
+
+    def __init__(self, db, uploaded_by: str, source_company: str):
+        self.db = db
+        self.uploaded_by = uploaded_by
+        self.source_company = source_company
+        self.rows_seen = 0
+        self.inserted = 0
+        self.failed = 0
+        self.errors = []
+        # job_ids that made it into the collection, in insert order
+        self.job_ids = []
+        self._issued_ids = set()
+        self._started = time.perf_counter()
+
+    def _record_error(self, row_number: int, messages):
+        self.failed += 1
+        if len(self.errors) < settings.INGEST_MAX_ERRORS_REPORTED:
+            self.errors.append({"row": row_number, "errors": messages})
+
+    def _next_job_id(self, attempt: int = 0) -> str:
+        # Keep the random space well above the number of IDs this run hands out
+        suffix_digits = max(2, len(str(len(self._issued_ids) + 1)) + 2) + attempt
+        job_id = generate_job_id(suffix_digits)
+        while job_id in self._issued_ids:
+            job_id = generate_job_id(suffix_digits)
+        self._issued_ids.add(job_id)
+        return job_id
+
+    def _build(self, row_number: int, row: dict) -> Optional[dict]:
+        job_data = {key: value.strip() if isinstance(value, str) else value for key, value in row.items()}
+        if not job_data.get("salary_package"):
+            job_data["salary_package"] = job_data.get("ctc", "")
+        job_data["source_company"] = self.source_company
+        # Blank cells count as missing so required fields are actually enforced
+        job_fields = {
+            field: job_data[field]
+            for field in JobCreate.model_fields
+            if job_data.get(field) not in ("", None)
+        }
+        try:
+            JobCreate(**job_fields)
+        except ValidationError as exc:
+            self._record_error(row_number, [
+                f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()
+            ])
+            return None
+
+        job_data["job_id"] = self._next_job_id()
+        job_data["uploaded_by"] = self.uploaded_by
+        job_data["status"] = "allocated"
+        job_data["opening_date"] = datetime.now()
+        job_data["created_at"] = datetime.utcnow()
+        return job_data
+
+    async def _flush(self, batch: list):
+        pending = batch
+        for attempt in range(JOB_ID_MAX_ATTEMPTS):
+            if not pending:
+                return
+            try:
+                result = await self.db.recruitment_portal.jobs.insert_many(
+                    [job_data for _, job_data in pending], ordered=False
+                )
+                self.inserted += len(result.inserted_ids)
+                self.job_ids += [job_data["job_id"] for _, job_data in pending]
+                return
+            except BulkWriteError as exc:
+                details = exc.details
+                self.inserted += details.get("nInserted", 0)
+                failed_indexes = {error["index"] for error in details.get("writeErrors", [])}
+                self.job_ids += [job_data["job_id"] for index, (_, job_data) in enumerate(pending) if index not in failed_indexes]
+                retry = []
+                for error in details.get("writeErrors", []):
+                    row_number, job_data = pending[error["index"]]
+                    if error.get("code") == DUPLICATE_KEY_ERROR and "job_id" in str(error.get("keyValue", error.get("errmsg", ""))):
+                        job_data.pop("_id", None)
+                        job_data["job_id"] = self._next_job_id(attempt + 1)
+                        retry.append((row_number, job_data))
+                    else:
+                        self._record_error(row_number, [error.get("errmsg", "Write failed")])
+                pending = retry
+        for row_number, _ in pending:
+            self._record_error(row_number, ["Could not allocate a unique job ID"])
+
+    async def run(self, rows: Iterable[Tuple[int, dict]]) -> dict:
+        batch = []
+        for row_number, row in rows:
+            self.rows_seen += 1
+            job_data = self._build(row_number, row)
+            if job_data is not None:
+                batch.append((row_number, job_data))
+            if len(batch) >= settings.INGEST_BATCH_SIZE:
+                await self._flush(batch)
+                batch = []
+        await self._flush(batch)
+        return self.report()
+
+    def report(self) -> dict:
+        elapsed = time.perf_counter() - self._started
+        return {
+            "rows": self.rows_seen,
+            "inserted": self.inserted,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.rows_seen / elapsed, 1) if elapsed > 0 else None
+        }
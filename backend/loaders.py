@@ -0,0 +1,90 @@
+from typing import Dict, Iterable
+from bson import ObjectId
+from cache import TTLCache
+from config import settings
+
+_MISSING = object()
+
+class ReferenceCache:
+    """Process-wide cache of job titles and HR names with per-namespace versions"""
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        self.job_titles = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.hr_names = TTLCache(max_size=max_size, ttl_seconds=ttl_seconds)
+        self.versions = {"jobs": 0, "users": 0}
+
+    def invalidate_job(self, job_id: str):
+        # Bumping the version stops in-flight loads that started earlier from writing stale values
+        self.versions["jobs"] += 1
+        self.job_titles.invalidate(job_id)
+
+    def invalidate_user(self, user_id: str):
+        self.versions["users"] += 1
+        self.hr_names.invalidate(user_id)
+
+    def stats(self) -> dict:
+        return {
+            "versions": dict(self.versions),
+            "job_titles": self.job_titles.stats(),
+            "hr_names": self.hr_names.stats()
+        }
+
+reference_cache = ReferenceCache(
+    max_size=settings.REFERENCE_CACHE_MAX_SIZE,
+    ttl_seconds=settings.REFERENCE_CACHE_TTL_SECONDS
+)
+
+class ReferenceLoader:
+    """Request-scoped, DataLoader-style batch loader for job titles and HR names"""
+
+    def __init__(self, db, cache: ReferenceCache = reference_cache):
+        self.db = db
+        self.cache = cache
+        self._job_titles: Dict[str, str] = {}
+        self._hr_names: Dict[str, str] = {}
+
+    async def job_titles(self, job_ids: Iterable[str]) -> Dict[str, str]:
+        """Return {job_id: title} for the jobs that exist, in at most one query"""
+        wanted = {job_id for job_id in job_ids if job_id}
+        missing = []
+        for job_id in wanted - self._job_titles.keys():
+            title = self.cache.job_titles.get(job_id, _MISSING)
+            if title is _MISSING:
+                missing.append(job_id)
+            else:
+                self._job_titles[job_id] = title
+
+        if missing:
+            version = self.cache.versions["jobs"]
+            async for job in self.db.recruitment_portal.jobs.find(
+                {"job_id": {"$in": missing}}, {"_id": 0, "job_id": 1, "title": 1}
+            ):
+                self._job_titles[job["job_id"]] = job.get("title")
+                if self.cache.versions["jobs"] == version:
+                    self.cache.job_titles.set(job["job_id"], job.get("title"))
+
+        return {job_id: self._job_titles[job_id] for job_id in wanted if job_id in self._job_titles}
+
+    async def hr_names(self, user_ids: Iterable[str]) -> Dict[str, str]:
+        """Return {user_id: name} for the HR users that exist, in at most one query"""
+        wanted = {user_id for user_id in user_ids if user_id}
+        missing = []
+        for user_id in wanted - self._hr_names.keys():
+            name = self.cache.hr_names.get(user_id, _MISSING)
+            if name is _MISSING:
+                if ObjectId.is_valid(user_id):
+                    missing.append(ObjectId(user_id))
+            else:
+                self._hr_names[user_id] = name
+
+        if missing:
+            version = self.cache.versions["users"]
+            async for user in self.db.recruitment_portal.users.find(
+                {"_id": {"$in": missing}, "role": "hr"}, {"name": 1}
+            ):
+                user_id = str(user["_id"])
+                self._hr_names[user_id] = user.get("name")
+                if self.cache.versions["users"] == version:
+                    self.cache.hr_names.set(user_id, user.get("name"))
+
+        return {user_id: self._hr_names[user_id] for user_id in wanted if user_id in self._hr_names}
@@ -1,10 +1,22 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from database import connect_to_mongo, close_mongo_connection
+from database import connect_to_mongo, close_mongo_connection, get_database, warm_up_pool
 from error_handlers import register_exception_handlers
-from routes import auth, admin, hr, shared
+from indexes import apply_indexes, verify_query_plans
+from config import settings
+from pagination import NEXT_CURSOR_HEADER
+from hashing import hashing_executor
+from resumes import resume_executor
+from rollups import start_rollup_worker, stop_rollup_worker
+from schema_migration import start_migration_worker, stop_migration_worker
+from matching import start_matching_worker, stop_matching_worker
+from responses import MongoJSONResponse
+from events import start_event_broker, stop_event_broker
+from metrics import MetricsMiddleware
+from request_context import RequestContextMiddleware
+from routes import auth, admin, hr, shared, events, health, metrics
 
-app = FastAPI(title="Recruitment Portal API", version="1.0.0")
+app = FastAPI(title="Recruitment Portal API", version="1.0.0", default_response_class=MongoJSONResponse)
 
 # CORS middleware - Allow all origins
 app.add_middleware(
@@ -13,8 +25,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
 )
 
+# Lets Mongo command listeners attribute slow queries to the route that issued them
+app.add_middleware(RequestContextMiddleware)
+
+# Latency histograms per route; outermost so it also times CORS handling
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+
 # Register exception handlers
 register_exception_handlers(app)
 
@@ -23,14 +43,40 @@ app.include_router(auth.router)
 app.include_router(admin.router)
 app.include_router(hr.router)
 app.include_router(shared.router)
+app.include_router(events.router)
+app.include_router(health.router)
+if settings.METRICS_ENABLED:
+    app.include_router(metrics.router)
 
 @app.on_event("startup")
 async def startup_db_client():
     await connect_to_mongo()
+    # Pay for connection setup here rather than in the first requests after a deploy
+    await warm_up_pool()
+    db = await get_database()
+    index_failures = []
+    if settings.ENSURE_INDEXES_ON_STARTUP:
+        index_failures = (await apply_indexes(db))["failed"]
+    if settings.QUERY_PLAN_CHECK_ON_STARTUP:
+        if index_failures:
+            raise RuntimeError(f"Could not create indexes: {[f['collection'] + '.' + f['index'] for f in index_failures]}")
+        failures = await verify_query_plans(db)
+        if failures:
+            raise RuntimeError(f"Collection scans in canonical queries: {[f['query'] for f in failures]}")
+    start_rollup_worker()
+    start_migration_worker()
+    start_matching_worker()
+    await start_event_broker()
 
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    await stop_rollup_worker()
+    await stop_migration_worker()
+    await stop_matching_worker()
+    await stop_event_broker()
     await close_mongo_connection()
+    hashing_executor.shutdown()
+    resume_executor.shutdown()
 
 if __name__ == "__main__":
     import uvicorn
@@ -0,0 +1,454 @@
+import asyncio
+import logging
+import math
+import re
+import time
+from collections import Counter
+from datetime import timedelta
+from typing import Dict, Iterable, List, Optional
+import numpy as np
+from bson import ObjectId
+from config import settings
+from database import get_database
+from change_versions import read_versions
+
+logger = logging.getLogger(__name__)
+
+# Closed requisitions are not offered to candidates
+CLOSED_JOB_STATUSES = {"closed"}
+
+# Terms from these fields count double: a listed skill or a job title says more than prose
+CANDIDATE_PROJECTION = {
+    "skill_assessments.skill_name": 1,
+    "work_experience_entries.technology_tools": 1,
+    "experience_entries.technology_tools": 1,
+    "skills": 1
+}
+JOB_PROJECTION = {"job_id": 1, "title": 1, "description": 1, "status": 1}
+TITLE_WEIGHT = 2.0
+SKILL_NAME_WEIGHT = 2.0
+
+# Keeps c++, c#, node.js and asp.net intact
+_TOKEN = re.compile(r"[a-z][a-z0-9+#]*(?:\.[a-z0-9+#]+)*")
+_STOPWORDS = frozenset("""
+    a an and are as at be by for from has have in is it of on or our the to we will with you your
+    able across etc must should strong good excellent knowledge experience years year work working
+    skills skill team ability using use required preferred plus including
+""".split())
+
+def tokenize(text: Optional[str]) -> List[str]:
+    if not text or not isinstance(text, str):
+        return []
+    return [token for token in _TOKEN.findall(text.lower()) if token not in _STOPWORDS and len(token) > 1]
+
+def _term_weights(weighted_texts: Iterable[tuple]) -> Dict[str, float]:
+    counts = Counter()
+    for text, weight in weighted_texts:
+        for token in tokenize(text):
+            counts[token] += weight
+    # Sublinear tf: a term repeated ten times is not ten times as relevant
+    return {term: 1.0 + math.log(count) for term, count in counts.items()}
+
+def candidate_terms(candidate: dict) -> Dict[str, float]:
+    texts = [(skill.get("skill_name"), SKILL_NAME_WEIGHT) for skill in candidate.get("skill_assessments") or [] if skill]
+    for field in ("work_experience_entries", "experience_entries"):
+        texts += [(entry.get("technology_tools"), 1.0) for entry in candidate.get(field) or [] if entry]
+    texts.append((candidate.get("skills"), 1.0))
+    return _term_weights(texts)
+
+def job_terms(job: dict) -> Dict[str, float]:
+    return _term_weights([(job.get("title"), TITLE_WEIGHT), (job.get("description"), 1.0)])
+
+class Vocabulary:
+    """Term ids and document frequencies shared by the candidate and job matrices"""
+
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.df = np.zeros(1024, dtype=np.int32)
+        self.documents = 0
+        # Bumped whenever df changes; cached idf and row norms are keyed on it
+        self.generation = 0
+        self._idf = None
+        self._idf_generation = -1
+
+    def lookup(self, terms: Iterable[str], add: bool) -> np.ndarray:
+        ids = []
+        for term in terms:
+            term_id = self.ids.get(term)
+            if term_id is None:
+                if not add:
+                    term_id = -1
+                else:
+                    term_id = self.ids[term] = len(self.terms)
+                    self.terms.append(term)
+            ids.append(term_id)
+        if len(self.terms) > len(self.df):
+            self.df = np.concatenate([self.df, np.zeros(max(len(self.terms), len(self.df)), dtype=np.int32)])
+        return np.array(ids, dtype=np.int32)
+
+    def count(self, term_ids: np.ndarray, sign: int):
+        self.df[term_ids] += sign
+        self.documents += sign
+        self.generation += 1
+
+    def idf(self) -> np.ndarray:
+        if self._idf_generation != self.generation:
+            df = self.df[:len(self.terms)]
+            self._idf = (np.log((1.0 + self.documents) / (1.0 + df)) + 1.0).astype(np.float32)
+            self._idf_generation = self.generation
+        return self._idf
+
+class TermMatrix:
+    """Sparse rows kept as flat (row, term, weight) arrays, i.e. a COO matrix
+
+    An update appends the new row and tombstones the old one, so refreshes never rewrite the
+    matrix; compact() reclaims dead entries once they outnumber live ones. Scoring against a
+    query vector is one gather, multiply and bincount over every entry: a sparse mat-vec.
+    """
+
+    def __init__(self, vocabulary: Vocabulary):
+        self.vocabulary = vocabulary
+        self._rows = np.empty(4096, dtype=np.int32)
+        self._terms = np.empty(4096, dtype=np.int32)
+        self._weights = np.empty(4096, dtype=np.float32)
+        self._size = 0
+        self._row_start: List[int] = []
+        self._row_end: List[int] = []
+        self._alive = np.zeros(1024, dtype=bool)
+        self.keys: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._signatures: Dict[str, int] = {}
+        self._dead_entries = 0
+        self._norms = None
+        self._norms_generation = -1
+
+    def __len__(self) -> int:
+        return len(self._row_of)
+
+    def _reserve(self, entries: int):
+        if self._size + entries > len(self._rows):
+            capacity = max(2 * len(self._rows), self._size + entries)
+            for name in ("_rows", "_terms", "_weights"):
+                array = getattr(self, name)
+                grown = np.empty(capacity, dtype=array.dtype)
+                grown[:self._size] = array[:self._size]
+                setattr(self, name, grown)
+        if len(self.keys) + 1 > len(self._alive):
+            self._alive = np.concatenate([self._alive, np.zeros(len(self._alive), dtype=bool)])
+
+    def upsert(self, key: str, weights: Dict[str, float]) -> bool:
+        """Replace the row for key; returns False when its terms did not change"""
+        signature = hash(frozenset(weights.items()))
+        if self._signatures.get(key) == signature:
+            return False
+        self.remove(key)
+        if not weights:
+            return True
+
+        term_ids = self.vocabulary.lookup(weights, add=True)
+        self._reserve(len(term_ids))
+        row = len(self.keys)
+        start, end = self._size, self._size + len(term_ids)
+        self._rows[start:end] = row
+        self._terms[start:end] = term_ids
+        self._weights[start:end] = np.fromiter(weights.values(), dtype=np.float32, count=len(term_ids))
+        self._size = end
+        self._row_start.append(start)
+        self._row_end.append(end)
+        self._alive[row] = True
+        self.keys.append(key)
+        self._row_of[key] = row
+        self._signatures[key] = signature
+        self.vocabulary.count(term_ids, 1)
+        return True
+
+    def remove(self, key: str):
+        row = self._row_of.pop(key, None)
+        self._signatures.pop(key, None)
+        if row is None:
+            return
+        start, end = self._row_start[row], self._row_end[row]
+        self._alive[row] = False
+        self._dead_entries += end - start
+        self.vocabulary.count(self._terms[start:end], -1)
+        if self._dead_entries > self._size - self._dead_entries:
+            self.compact()
+
+    def compact(self):
+        live = self._alive[self._rows[:self._size]]
+        live_rows = np.flatnonzero(self._alive[:len(self.keys)])
+        renumber = np.full(len(self.keys), -1, dtype=np.int32)
+        renumber[live_rows] = np.arange(len(live_rows), dtype=np.int32)
+
+        rows = renumber[self._rows[:self._size][live]]
+        self._terms = self._terms[:self._size][live].copy()
+        self._weights = self._weights[:self._size][live].copy()
+        self._rows = rows
+        self._size = len(rows)
+        # Entries of one row are contiguous and rows keep their order, so offsets follow from counts
+        counts = np.bincount(rows, minlength=len(live_rows))
+        ends = np.cumsum(counts)
+        self._row_start = (ends - counts).tolist()
+        self._row_end = ends.tolist()
+        self.keys = [self.keys[row] for row in live_rows]
+        self._row_of = {key: row for row, key in enumerate(self.keys)}
+        self._alive = np.ones(max(len(self.keys), 1024), dtype=bool)
+        self._alive[len(self.keys):] = False
+        self._dead_entries = 0
+        self._norms = None
+
+    def row(self, key: str) -> Optional[tuple]:
+        row = self._row_of.get(key)
+        if row is None:
+            return None
+        start, end = self._row_start[row], self._row_end[row]
+        return self._terms[start:end], self._weights[start:end]
+
+    def _row_norms(self, idf: np.ndarray) -> np.ndarray:
+        if self._norms is None or self._norms_generation != self.vocabulary.generation or len(self._norms) != len(self.keys):
+            terms, weights = self._terms[:self._size], self._weights[:self._size]
+            squared = np.bincount(self._rows[:self._size], weights=(weights * idf[terms]) ** 2, minlength=len(self.keys))
+            self._norms = np.sqrt(squared).astype(np.float32)
+            self._norms_generation = self.vocabulary.generation
+        return self._norms
+
+    def query_vector(self, weights: Dict[str, float]) -> Optional[np.ndarray]:
+        """Dense idf-weighted, unit-length vector for a document from the other side"""
+        term_ids = self.vocabulary.lookup(weights, add=False)
+        known = term_ids >= 0
+        if not known.any():
+            return None
+        idf = self.vocabulary.idf()
+        vector = np.zeros(len(idf), dtype=np.float32)
+        values = np.fromiter(weights.values(), dtype=np.float32, count=len(term_ids))[known]
+        vector[term_ids[known]] = values * idf[term_ids[known]]
+        return vector / np.linalg.norm(vector)
+
+    def top_k(self, query: np.ndarray, k: int, exclude: Optional[str] = None) -> List[tuple]:
+        """(key, cosine score) of the k best rows, best first"""
+        if not self._row_of:
+            return []
+        idf = self.vocabulary.idf()
+        terms = self._terms[:self._size]
+        # Cosine of idf-weighted rows against the query, for every row at once
+        dots = np.bincount(self._rows[:self._size], weights=self._weights[:self._size] * (idf * query)[terms], minlength=len(self.keys))
+        norms = self._row_norms(idf)
+        scores = np.divide(dots, norms, out=np.zeros_like(dots), where=norms > 0)
+        scores[~self._alive[:len(self.keys)]] = 0.0
+        if exclude in self._row_of:
+            scores[self._row_of[exclude]] = 0.0
+
+        k = min(k, len(scores))
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(self.keys[row], float(scores[row])) for row in best if scores[row] > 0]
+
+    def explain(self, key: str, query: np.ndarray, limit: int = 5) -> List[str]:
+        """The terms contributing most to key's score"""
+        terms, weights = self.row(key)
+        contributions = weights * (self.vocabulary.idf() * query)[terms]
+        order = np.argsort(-contributions)[:limit]
+        return [self.vocabulary.terms[terms[index]] for index in order if contributions[index] > 0]
+
+def _build(candidates: List[dict], jobs: List[dict]) -> tuple:
+    vocabulary = Vocabulary()
+    candidate_matrix = TermMatrix(vocabulary)
+    job_matrix = TermMatrix(vocabulary)
+    for candidate in candidates:
+        candidate_matrix.upsert(str(candidate["_id"]), candidate_terms(candidate))
+    for job in jobs:
+        if job.get("status") not in CLOSED_JOB_STATUSES:
+            job_matrix.upsert(str(job["_id"]), job_terms(job))
+    return vocabulary, candidate_matrix, job_matrix
+
+class MatchIndex:
+    """In-memory TF-IDF vectors for every candidate and open job, refreshed incrementally
+
+    New documents are picked up past an _id watermark (re-reading a settle window behind it, since
+    _ids from other processes arrive out of order), documents created or edited through this process
+    are marked dirty and reloaded, and a periodic rebuild catches edits made by other processes.
+    Refreshes only query Mongo when change_versions says something moved.
+    """
+
+    def __init__(self):
+        self.vocabulary: Optional[Vocabulary] = None
+        self.candidates: Optional[TermMatrix] = None
+        self.jobs: Optional[TermMatrix] = None
+        self._watermarks = {"candidates": None, "jobs": None}
+        self._versions = None
+        self._dirty = {"candidates": set(), "jobs": set()}
+        self._rebuild_dirty: Optional[dict] = None
+        self._first_build: Optional[asyncio.Future] = None
+        self._lock = asyncio.Lock()
+        self.built_at = None
+        self.build_seconds = 0.0
+        self.refreshes = 0
+        self.refreshed_documents = 0
+
+    def candidate_changed(self, candidate_id: str):
+        self._mark("candidates", candidate_id)
+
+    def job_changed(self, job_id: str):
+        """job_id is the public job_id, as the job routes use"""
+        self._mark("jobs", job_id)
+
+    def jobs_changed(self, job_ids: Iterable[str]):
+        for job_id in job_ids:
+            self._mark("jobs", job_id)
+
+    def _mark(self, collection: str, key: str):
+        self._dirty[collection].add(key)
+        if self._rebuild_dirty is not None:
+            self._rebuild_dirty[collection].add(key)
+
+    async def _load(self, collection, filter_query: dict, projection: dict) -> List[dict]:
+        return [document async for document in collection.find(filter_query, projection).sort("_id", 1)]
+
+    async def rebuild(self, db):
+        """Build fresh matrices off to the side and swap them in; queries keep using the old ones meanwhile"""
+        started = time.perf_counter()
+        self._rebuild_dirty = {"candidates": set(), "jobs": set()}
+        try:
+            versions = await read_versions(db, ["candidates", "jobs"])
+            candidates = await self._load(db.recruitment_portal.candidates, {}, CANDIDATE_PROJECTION)
+            jobs = await self._load(db.recruitment_portal.jobs, {}, JOB_PROJECTION)
+            # Tokenizing 100k documents takes seconds; keep it off the event loop
+            built = await asyncio.to_thread(_build, candidates, jobs)
+            async with self._lock:
+                self.vocabulary, self.candidates, self.jobs = built
+                self._watermarks = {
+                    "candidates": candidates[-1]["_id"] if candidates else None,
+                    "jobs": jobs[-1]["_id"] if jobs else None
+                }
+                self._versions = versions
+                # Edits that landed while the snapshot was being read are replayed on the next refresh
+                self._dirty = self._rebuild_dirty
+        finally:
+            self._rebuild_dirty = None
+        self.built_at = time.time()
+        self.build_seconds = time.perf_counter() - started
+
+    async def ensure_built(self, db):
+        """The first build is shared by the worker and any requests that arrive while it runs"""
+        if self.vocabulary is not None:
+            return
+        if self._first_build is None or (self._first_build.done() and self._first_build.exception()):
+            self._first_build = asyncio.ensure_future(self.rebuild(db))
+        await asyncio.shield(self._first_build)
+
+    async def refresh(self, db):
+        await self.ensure_built(db)
+        versions = await read_versions(db, ["candidates", "jobs"])
+        if versions == self._versions and not any(self._dirty.values()):
+            return
+        async with self._lock:
+            self._versions = versions
+            changed = 0
+            for collection, matrix, projection, terms, key_field in (
+                ("candidates", self.candidates, CANDIDATE_PROJECTION, candidate_terms, "_id"),
+                ("jobs", self.jobs, JOB_PROJECTION, job_terms, "job_id")
+            ):
+                dirty, self._dirty[collection] = self._dirty[collection], set()
+                if key_field == "_id":
+                    dirty = [ObjectId(key) for key in dirty if ObjectId.is_valid(key)]
+                watermark = self._watermarks[collection]
+                filter_query = {}
+                if watermark:
+                    # _ids come from every app process and host, so they only settle into insertion order
+                    # after a while; the window behind the mark is re-read and unchanged rows are skipped
+                    settled = ObjectId.from_datetime(watermark.generation_time - timedelta(seconds=settings.MATCH_SETTLE_SECONDS))
+                    filter_query = {"$or": [{"_id": {"$gte": settled}}, {key_field: {"$in": list(dirty)}}]}
+                documents = await self._load(db.recruitment_portal[collection], filter_query, projection)
+
+                found = set()
+                for document in documents:
+                    found.add(document.get(key_field))
+                    key = str(document["_id"])
+                    if collection == "jobs" and document.get("status") in CLOSED_JOB_STATUSES:
+                        matrix.remove(key)
+                    elif matrix.upsert(key, terms(document)):
+                        changed += 1
+                    if watermark is None or document["_id"] > watermark:
+                        watermark = document["_id"]
+                if key_field == "_id":
+                    # Dirty candidates that no longer exist were deleted
+                    for key in set(dirty) - found:
+                        matrix.remove(str(key))
+                self._watermarks[collection] = watermark
+            self.refreshes += 1
+            self.refreshed_documents += changed
+
+    async def _query(self, db, collection: str, object_id: ObjectId, projection: dict, terms) -> Optional[Dict[str, float]]:
+        document = await db.recruitment_portal[collection].find_one({"_id": object_id}, projection)
+        if document is None:
+            return None
+        return terms(document)
+
+    async def matches_for_job(self, db, job_object_id: ObjectId, k: int) -> Optional[List[tuple]]:
+        """Top-k candidates for a job as (candidate id, score, matched terms); None if the job doesn't exist"""
+        await self.refresh(db)
+        weights = await self._query(db, "jobs", job_object_id, JOB_PROJECTION, job_terms)
+        if weights is None:
+            return None
+        query = self.candidates.query_vector(weights)
+        if query is None:
+            return []
+        return [(key, score, self.candidates.explain(key, query)) for key, score in self.candidates.top_k(query, k)]
+
+    async def jobs_for_candidate(self, db, candidate_object_id: ObjectId, k: int) -> Optional[List[tuple]]:
+        """Top-k open jobs for a candidate as (job _id, score, matched terms); None if the candidate doesn't exist"""
+        await self.refresh(db)
+        weights = await self._query(db, "candidates", candidate_object_id, CANDIDATE_PROJECTION, candidate_terms)
+        if weights is None:
+            return None
+        query = self.jobs.query_vector(weights)
+        if query is None:
+            return []
+        return [(key, score, self.jobs.explain(key, query)) for key, score in self.jobs.top_k(query, k)]
+
+    def stats(self) -> dict:
+        return {
+            "built": self.vocabulary is not None,
+            "built_at": self.built_at,
+            "build_seconds": round(self.build_seconds, 3),
+            "candidates": len(self.candidates) if self.candidates is not None else 0,
+            "jobs": len(self.jobs) if self.jobs is not None else 0,
+            "terms": len(self.vocabulary.terms) if self.vocabulary is not None else 0,
+            "refreshes": self.refreshes,
+            "refreshed_documents": self.refreshed_documents
+        }
+
+match_index = MatchIndex()
+
+_worker_task: Optional[asyncio.Task] = None
+
+async def _run_worker():
+    while True:
+        try:
+            db = await get_database()
+            if match_index.vocabulary is None:
+                await match_index.ensure_built(db)
+            else:
+                await match_index.rebuild(db)
+            logger.info(f"Rebuilt match index: {match_index.stats()}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error(f"Match index rebuild failed: {str(exc)}", exc_info=True)
+        await asyncio.sleep(settings.MATCH_REBUILD_INTERVAL_SECONDS)
+
+def start_matching_worker():
+    global _worker_task
+    if settings.MATCH_REBUILD_INTERVAL_SECONDS > 0 and _worker_task is None:
+        _worker_task = asyncio.create_task(_run_worker())
+
+async def stop_matching_worker():
+    global _worker_task
+    if _worker_task is not None:
+        _worker_task.cancel()
+        try:
+            await _worker_task
+        except asyncio.CancelledError:
+            pass
+        _worker_task = None
@@ -0,0 +1,193 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+from pymongo import monitoring
+from pool_metrics import WAIT_BUCKETS, pool_metrics
+
+HTTP_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+MONGO_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Unmatched paths share one label so scanners can't blow up the series count
+UNMATCHED_ROUTE = "unmatched"
+ANONYMOUS_ROLE = "anonymous"
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+class Histogram:
+    """Fixed-bucket histogram keyed by label values; observe() is a bisect and a few adds under a lock"""
+
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...], buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series: Dict[tuple, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple, value: float):
+        # Per-bucket (non-cumulative) counts, then sum and count; render() accumulates
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+            series[index] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} histogram"
+        with self._lock:
+            snapshot = [(labels, list(series)) for labels, series in self._series.items()]
+        for labels, series in snapshot:
+            cumulative = 0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                bucket_labels = _format_labels(self.label_names, labels, f'le="{bound}"')
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            bucket_labels = _format_labels(self.label_names, labels, 'le="+Inf"')
+            yield f"{self.name}_bucket{bucket_labels} {series[-1]}"
+            yield f"{self.name}_sum{_format_labels(self.label_names, labels)} {series[-2]}"
+            yield f"{self.name}_count{_format_labels(self.label_names, labels)} {series[-1]}"
+
+class Gauge:
+    def __init__(self, name: str, help_text: str, label_names: Tuple[str, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._values: Dict[tuple, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, labels: tuple, amount: float):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help_text}"
+        yield f"# TYPE {self.name} gauge"
+        with self._lock:
+            snapshot = list(self._values.items())
+        for labels, value in snapshot:
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {value}"
+
+http_request_duration = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template, method, status and caller role",
+    ("route", "method", "status", "role"),
+    HTTP_BUCKETS
+)
+http_requests_in_flight = Gauge(
+    "http_requests_in_flight",
+    "HTTP requests currently being served",
+    ("method",)
+)
+mongo_command_duration = Histogram(
+    "mongo_command_duration_seconds",
+    "MongoDB command latency by collection, command and outcome",
+    ("collection", "command", "outcome"),
+    MONGO_BUCKETS
+)
+
+class CommandMetrics(monitoring.CommandListener):
+    """Times every MongoDB command; the collection is only on the started event, so it is held until completion"""
+
+    def __init__(self):
+        self._collections: Dict[tuple, str] = {}
+
+    @staticmethod
+    def _key(event) -> tuple:
+        return (event.connection_id, event.request_id)
+
+    def started(self, event):
+        target = event.command.get("collection") if event.command_name == "getMore" else event.command.get(event.command_name)
+        # Database-level commands (ping, hello, db aggregates) carry no collection name
+        self._collections[self._key(event)] = target if isinstance(target, str) else ""
+
+    def succeeded(self, event):
+        collection = self._collections.pop(self._key(event), "")
+        mongo_command_duration.observe((collection, event.command_name, "ok"), event.duration_micros / 1_000_000)
+
+    def failed(self, event):
+        collection = self._collections.pop(self._key(event), "")
+        mongo_command_duration.observe((collection, event.command_name, "error"), event.duration_micros / 1_000_000)
+
+command_metrics = CommandMetrics()
+
+class MetricsMiddleware:
+    """Pure ASGI middleware: no request wrapping and no body buffering, so streaming responses are unaffected"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.add((method,), 1)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.add((method,), -1)
+            # The router leaves the matched route in the scope, and the auth dependency the caller's role
+            route = scope.get("route")
+            role = scope.get("state", {}).get("role", ANONYMOUS_ROLE)
+            http_request_duration.observe(
+                (getattr(route, "path", UNMATCHED_ROUTE), method, str(status_code), role),
+                time.perf_counter() - started
+            )
+
+def _render_pool() -> Iterable[str]:
+    stats = pool_metrics.stats()
+    yield "# HELP mongo_pool_connections_open Connections currently open in the MongoDB pool"
+    yield "# TYPE mongo_pool_connections_open gauge"
+    yield f"mongo_pool_connections_open {stats['connections_open']}"
+    yield "# HELP mongo_pool_connections_in_use Connections currently checked out of the MongoDB pool"
+    yield "# TYPE mongo_pool_connections_in_use gauge"
+    yield f"mongo_pool_connections_in_use {stats['connections_in_use']}"
+    yield "# HELP mongo_pool_checkouts_total Successful connection checkouts"
+    yield "# TYPE mongo_pool_checkouts_total counter"
+    yield f"mongo_pool_checkouts_total {stats['checkouts']}"
+    yield "# HELP mongo_pool_checkout_failures_total Failed connection checkouts by reason"
+    yield "# TYPE mongo_pool_checkout_failures_total counter"
+    for reason, count in stats["checkout_failures"].items():
+        yield f'mongo_pool_checkout_failures_total{{reason="{_escape(reason)}"}} {count}'
+    yield "# HELP mongo_pool_clears_total Times the pool was cleared after a server error"
+    yield "# TYPE mongo_pool_clears_total counter"
+    yield f"mongo_pool_clears_total {stats['pool_clears']}"
+    wait = stats["checkout_wait"]
+    yield "# HELP mongo_pool_checkout_wait_seconds Time spent waiting to check out a connection"
+    yield "# TYPE mongo_pool_checkout_wait_seconds histogram"
+    # pool_metrics already keeps these buckets cumulative
+    for bound in WAIT_BUCKETS:
+        yield f'mongo_pool_checkout_wait_seconds_bucket{{le="{bound}"}} {wait["buckets"][f"le_{bound}"]}'
+    yield f'mongo_pool_checkout_wait_seconds_bucket{{le="+Inf"}} {wait["count"]}'
+    yield f"mongo_pool_checkout_wait_seconds_sum {wait['total_seconds']}"
+    yield f"mongo_pool_checkout_wait_seconds_count {wait['count']}"
+
+def render_metrics() -> str:
+    """All metrics in the Prometheus text exposition format"""
+    lines = []
+    for metric in (http_request_duration, http_requests_in_flight, mongo_command_duration):
+        lines.extend(metric.render())
+    lines.extend(_render_pool())
+    return "\n".join(lines) + "\n"
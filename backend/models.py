@@ -306,6 +306,30 @@ class Candidate(CandidateBase):
     last_updated_by: Optional[str] = None
     created_at: datetime
 
+class CandidateSummary(BaseModel):
+    # Lean row for candidate tables; full detail comes from GET /candidates/{id}
+    id: str
+    name: str
+    email: str
+    phone: str
+    status: Optional[str] = None
+    job_id: Optional[str] = None
+    job_title: Optional[str] = None
+    applied_for: Optional[str] = None
+    title_position: Optional[str] = None
+    role_applied_for: Optional[str] = None
+    current_location: Optional[str] = None
+    total_experience: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+class CandidateStatusBatch(BaseModel):
+    candidate_ids: List[str]
+    status: str
+    notes: Optional[str] = None
+
+class ResumeBatch(BaseModel):
+    candidate_ids: List[str]
+
 class ApplicationHistory(BaseModel):
     id: str
     candidate_id: str
@@ -0,0 +1,124 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional
+from bson import ObjectId
+from bson.errors import InvalidId
+from fastapi import HTTPException, Query, Response
+from config import settings
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+class PageParams:
+    """Query parameters shared by every keyset-paginated list endpoint"""
+
+    def __init__(
+        self,
+        limit: int = Query(settings.PAGE_SIZE_DEFAULT, ge=1, le=settings.PAGE_SIZE_MAX),
+        cursor: Optional[str] = None
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+def encode_cursor(sort_value, object_id: ObjectId) -> str:
+    if isinstance(sort_value, datetime):
+        sort_value = {"$date": sort_value.isoformat()}
+    payload = json.dumps({"v": sort_value, "i": str(object_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        sort_value = payload["v"]
+        if isinstance(sort_value, dict):
+            sort_value = datetime.fromisoformat(sort_value["$date"])
+        return sort_value, ObjectId(payload["i"])
+    except (ValueError, KeyError, TypeError, InvalidId):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def keyset_filter(filter_query: dict, sort_field: str, cursor: Optional[str]) -> dict:
+    """Restrict a descending (sort_field, _id) scan to documents after the cursor"""
+    if not cursor:
+        return filter_query
+
+    sort_value, last_id = decode_cursor(cursor)
+    if sort_value is None:
+        # Missing/null sort values come last in descending order
+        after = {sort_field: None, "_id": {"$lt": last_id}}
+    else:
+        after = {"$or": [
+            {sort_field: {"$lt": sort_value}},
+            {sort_field: sort_value, "_id": {"$lt": last_id}},
+            {sort_field: None}
+        ]}
+
+    if not filter_query:
+        return after
+    return {"$and": [filter_query, after]}
+
+async def fetch_page(
+    collection,
+    filter_query: dict,
+    page: PageParams,
+    response: Response,
+    sort_field: str = "created_at",
+    projection: Optional[dict] = None
+) -> list:
+    """Return one page sorted by (sort_field, _id) descending and publish the next cursor"""
+    if "$text" in filter_query:
+        return await fetch_ranked_page(collection, filter_query, page, response, projection)
+
+    if projection and any(projection.values()):
+        # The cursor is built from the sort key, so inclusion projections must keep it
+        projection = {**projection, sort_field: 1}
+
+    cursor = collection.find(keyset_filter(filter_query, sort_field, page.cursor), projection)
+    cursor = cursor.sort([(sort_field, -1), ("_id", -1)]).limit(page.limit + 1)
+    documents = await cursor.to_list(length=page.limit + 1)
+
+    if len(documents) > page.limit:
+        documents = documents[:page.limit]
+        last = documents[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.get(sort_field), last["_id"])
+
+    return documents
+
+async def fetch_ranked_page(
+    collection,
+    filter_query: dict,
+    page: PageParams,
+    response: Response,
+    projection: Optional[dict] = None
+) -> list:
+    """Return one page of a $text search ranked by (textScore, _id) descending"""
+    pipeline = [
+        {"$match": filter_query},
+        {"$addFields": {"_score": {"$meta": "textScore"}}}
+    ]
+    if page.cursor:
+        last_score, last_id = decode_cursor(page.cursor)
+        pipeline.append({"$match": {"$or": [
+            {"_score": {"$lt": last_score}},
+            {"_score": last_score, "_id": {"$lt": last_id}}
+        ]}})
+    pipeline += [
+        {"$sort": {"_score": -1, "_id": -1}},
+        {"$limit": page.limit + 1}
+    ]
+    if projection:
+        projection = dict(projection)
+        if any(projection.values()):
+            projection["_score"] = 1
+        pipeline.append({"$project": projection})
+
+    documents = await collection.aggregate(pipeline).to_list(length=page.limit + 1)
+
+    if len(documents) > page.limit:
+        documents = documents[:page.limit]
+        last = documents[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(last.get("_score"), last["_id"])
+
+    for document in documents:
+        document.pop("_score", None)
+    return documents
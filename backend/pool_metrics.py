@@ -0,0 +1,103 @@
+import threading
+import time
+from pymongo import monitoring
+
+# Checkout wait buckets in seconds, cumulative like a Prometheus histogram
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Counts connection-pool activity and how long requests wait to check out a connection"""
+
+    def __init__(self):
+        # Motor runs pymongo operations on worker threads; a checkout starts and ends on the same one
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.created = 0
+            self.closed = 0
+            self.checked_out = 0
+            self.checked_in = 0
+            self.checkout_failures = {}
+            self.pool_clears = 0
+            self.wait_count = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+            self.wait_buckets = [0] * len(WAIT_BUCKETS)
+
+    def _record_wait(self):
+        started = getattr(self._local, "started", None)
+        if started is None:
+            return
+        self._local.started = None
+        waited = time.perf_counter() - started
+        with self._lock:
+            self.wait_count += 1
+            self.wait_seconds_total += waited
+            self.wait_seconds_max = max(self.wait_seconds_max, waited)
+            for index, bound in enumerate(WAIT_BUCKETS):
+                if waited <= bound:
+                    self.wait_buckets[index] += 1
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        self._record_wait()
+        with self._lock:
+            self.checked_out += 1
+
+    def connection_check_out_failed(self, event):
+        self._record_wait()
+        with self._lock:
+            self.checkout_failures[event.reason] = self.checkout_failures.get(event.reason, 0) + 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_in += 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.created += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.closed += 1
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pool_clears += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "connections_open": self.created - self.closed,
+                "connections_in_use": self.checked_out - self.checked_in,
+                "connections_created": self.created,
+                "checkouts": self.checked_out,
+                "checkout_failures": dict(self.checkout_failures),
+                "pool_clears": self.pool_clears,
+                "checkout_wait": {
+                    "count": self.wait_count,
+                    "total_seconds": round(self.wait_seconds_total, 6),
+                    "max_seconds": round(self.wait_seconds_max, 6),
+                    "mean_ms": round(self.wait_seconds_total / self.wait_count * 1000, 3) if self.wait_count else 0.0,
+                    "buckets": {f"le_{bound}": count for bound, count in zip(WAIT_BUCKETS, self.wait_buckets)}
+                }
+            }
+
+pool_metrics = PoolMetrics()
@@ -0,0 +1,58 @@
+from typing import List, Optional, Union
+from fastapi import HTTPException, Query
+from candidate_schema import ENTRIES_FIELD, LEGACY_ENTRIES_FIELD, LEGACY_FIELD_MAP, SCHEMA_VERSION_FIELD
+from models import Candidate, CandidateSummary
+
+# Legacy field -> the field to ask for instead; the upgrader folds these away, so they are never returned
+LEGACY_FIELD_REPLACEMENTS = {**LEGACY_FIELD_MAP, LEGACY_ENTRIES_FIELD: ENTRIES_FIELD}
+
+# Stored or enriched candidate fields a client may ask for with fields=
+CANDIDATE_FIELDS = (set(Candidate.model_fields) | {"job_title", "applied_for", "created_by"}) - set(LEGACY_FIELD_REPLACEMENTS)
+
+# Structured field -> the legacy field an unmigrated document may still hold its value in
+_LEGACY_SOURCES = {field: legacy_field for legacy_field, field in LEGACY_FIELD_REPLACEMENTS.items()}
+
+# job_id is always loaded so list routes can enrich rows with the job title
+CANDIDATE_SUMMARY_PROJECTION = {field: 1 for field in CandidateSummary.model_fields if field != "id"}
+
+# response_model for candidate list routes: view=summary rows are CandidateSummary, view=full rows
+# Candidate, and fields= narrows either to the requested keys
+CandidateListResponse = List[Union[CandidateSummary, Candidate]]
+
+class CandidateViewParams:
+    """view=summary|full or an explicit fields= list, mapped to a Mongo projection"""
+
+    def __init__(
+        self,
+        view: str = Query("full", pattern="^(summary|full)$"),
+        fields: Optional[str] = Query(None, description="Comma-separated candidate fields to return")
+    ):
+        self.view = view
+        self.fields = self._parse_fields(fields)
+
+    @staticmethod
+    def _parse_fields(fields: Optional[str]) -> Optional[List[str]]:
+        if not fields:
+            return None
+        requested = [field.strip() for field in fields.split(",") if field.strip()]
+        legacy = {field: LEGACY_FIELD_REPLACEMENTS[field] for field in requested if field in LEGACY_FIELD_REPLACEMENTS}
+        if legacy:
+            raise HTTPException(status_code=400, detail=f"Legacy candidate fields, ask for their replacements instead: {legacy}")
+        unknown = sorted(set(requested) - CANDIDATE_FIELDS - {"id"})
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown candidate fields: {unknown}")
+        return requested
+
+    @property
+    def projection(self) -> Optional[dict]:
+        # schema_version lets upgrade_candidate skip rows that are already current; legacy sources let it
+        # fill a requested field on a row the migrator has not reached yet
+        if self.fields:
+            projection = {field: 1 for field in self.fields if field != "id"}
+            projection.update({_LEGACY_SOURCES[field]: 1 for field in self.fields if field in _LEGACY_SOURCES})
+            projection["job_id"] = 1
+            projection[SCHEMA_VERSION_FIELD] = 1
+            return projection
+        if self.view == "summary":
+            return {**CANDIDATE_SUMMARY_PROJECTION, SCHEMA_VERSION_FIELD: 1}
+        return None
@@ -0,0 +1,28 @@
+from contextvars import ContextVar
+from typing import Optional
+
+# Motor copies the context into its executor threads, so command listeners can see which request they serve
+current_scope: ContextVar[Optional[dict]] = ContextVar("current_scope", default=None)
+
+def current_route() -> Optional[str]:
+    """Route template of the request being served, or None outside a request"""
+    scope = current_scope.get()
+    if scope is None:
+        return None
+    route = scope.get("route")
+    # Before routing completes only the raw path is known
+    return getattr(route, "path", None) or scope.get("path")
+
+class RequestContextMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        token = current_scope.set(scope)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            current_scope.reset(token)
@@ -0,0 +1,38 @@
+from typing import Any, Iterable, Optional
+import orjson
+from bson import ObjectId
+from fastapi import Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+def orjson_default(value: Any):
+    if isinstance(value, ObjectId):
+        return str(value)
+    # Anything else orjson can't handle natively gets FastAPI's usual treatment
+    return jsonable_encoder(value)
+
+def dumps(content: Any) -> bytes:
+    """Serialize BSON-derived content with orjson; datetimes render as isoformat()"""
+    return orjson.dumps(content, default=orjson_default, option=ORJSON_OPTIONS)
+
+class MongoJSONResponse(JSONResponse):
+    """JSON response that serializes ObjectId and datetime natively via orjson"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def with_public_id(document: Optional[dict]) -> Optional[dict]:
+    # Same key order as the old `doc["id"] = str(doc["_id"]); del doc["_id"]`; the encoder stringifies it
+    if document is not None and "_id" in document:
+        document["id"] = document.pop("_id")
+    return document
+
+def with_public_ids(documents: Iterable[dict]) -> list:
+    return [with_public_id(document) for document in documents]
+
+def json_response(content: Any, response: Optional[Response] = None, status_code: int = 200) -> MongoJSONResponse:
+    """Return content without the jsonable_encoder pass, keeping headers set on the injected response"""
+    headers = dict(response.headers) if response is not None else None
+    return MongoJSONResponse(content, status_code=status_code, headers=headers)
@@ -0,0 +1,503 @@
+import asyncio
+import io
+import multiprocessing
+import re
+import time
+import zipfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import AsyncIterator, List
+from xml.sax.saxutils import escape
+from fastapi import HTTPException
+from config import settings
+from candidate_schema import upgrade_candidate
+
+DOCX_MEDIA_TYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+DOCUMENT_PART = "word/document.xml"
+
+# Legend printed under the skill table of the template
+ASSESSMENT_SCORES = {1: "Below Average", 2: "Average", 3: "Good", 4: "Excellent"}
+
+# resume_template.docx is a filled sample resume, not a placeholder file, so fields are bound to the
+# paragraphs holding the sample values. Patterns are matched in document order against each paragraph's
+# text as stored (& is &amp;): named groups become slots, a group named _ is cleared, and a pattern
+# without groups only moves past a label.
+TEMPLATE_BINDINGS = [
+    r"Candidate Name:", r"(?P<name>.+)",
+    r"PAN Number", r"(?P<pan_number>.+)",
+    r"/ Interview Location", r"(?P<preferred_interview_location>[^/]*)/(?P<interview_location>.*)",
+    r"Availability for interview on weekends / weekdays", r"(?P<availability_interview>.+)",
+    r"Talent Acquisition Consultant:", r" ?(?P<talent_acquisition_consultant>.+)",
+    r"Date of Assessment:", r"(?P<date_of_assessment>.+)",
+    r"\(Current or Previous organization of the resource, as applicable\)", r"(?P<roc_check_done>.+)",
+    r"Has the candidate applied for IBM before\?", r"(?P<applied_for_ibm_before>.+)",
+    r"Is the resource employee of your organization", r"(?P<is_organization_employee>.+)",
+    r"organization", r"(?P<date_of_joining_organization>.+)",
+    r"your organization", r"(?P<client_deployment_details>.+)", r"(?P<_>.+)",
+    r"Interested in relocation\?", r"(?P<interested_in_relocation>.+)",
+    r"environment \(with rotating shifts\)", r"(?P<willingness_work_shifts>.+)",
+    r"Hometown", r"(?P<current_location>.+)", r"(?P<hometown>.+)",
+    r"Role applied for", r"(?P<role_applied_for>.+)",
+    r"Total Years of experience", r"(?P<total_experience>.+)",
+    r"Relevant Years of experience", r"(?P<relevant_experience>.+)",
+    r"Certification if any:", r"(?P<certifications>.+)",
+    r"Reason for changing the Current job / Previous Job", r"(?P<reason_for_job_change>.+)",
+    r"Current Role", r"(?P<current_role>.+)",
+    r"Notice Period / Negotiable / Compensated payout", r"(?P<notice_period>.+)",
+    r"XII/DIP", r"(?P<education_degree_name>.+)",
+    r"Percentage scored",
+    r"(?P<education_x_percentage>.+)", r"(?P<education_xii_percentage>.+)", r"(?P<education_degree_percentage>.+)",
+    r"Year of Completion",
+    r"(?P<education_x_year_completion>.+)", r"(?P<education_xii_year_completion>.+)", r"(?P<education_degree_year_completion>.+)",
+    r"with fake list of universities .*", r"(?P<education_authenticated_ugc_check>.+)",
+    r"Pay-rolling company name", r"(?P<payrolling_company_name>.+)", r"(?P<_>.+)",
+    r"Assessment of candidate.s general attitude .*", r"(?P<general_attitude>.+)",
+    r"Assessment of the candidate.s oral communication skills.*", r"(?P<oral_communication>.+)", r"(?P<_>.+)",
+    r"I do not know the candidate\. Please certify with YES\. (?P<do_not_know_candidate>.*)",
+    r"I have evaluated the resume with respect to the Job Description shared\. (?P<evaluated_resume_with_jd>.*)",
+    r"I have personally spoken to the candidate, .* accordingly\. (?P<personally_spoken_to_candidate>.*)",
+    r"SME Name: (?P<sme_name>.*)",
+    r"SME Email id: (?P<sme_email>.*) SME Mobile Number: (?P<sme_mobile>.*)",
+    r"company", r"(?P<salary_slip_verified>)",
+    r"Have you verified current company offer letter / revised offer letter", r"(?P<offer_letter_verified>)",
+    r"Name: (?P<name>.*)",
+    r"Title/Position: (?P<title_position>.*)",
+    r"PAN Number: (?P<pan_number>.*)",
+    r"Passport No\. \(blank if unavailable\):(?P<passport_number>)",
+    r"a\. Mobile: (?P<phone>.*)",
+    r"b\. Email: (?P<email>.*)",
+    r"c\. LinkedIn profile: (?P<linkedin>.*)",
+    r"Overall years of experience: (?P<total_experience>.*)",
+    r"Skill level experience: (?P<relevant_experience>.*)",
+    r"Degree: (?P<education_degree_name>.*)",
+    r"Duration: (?P<education_degree_duration>.*)",
+    r"College/University: (?P<education_degree_institute>.*)",
+    r"Year of graduation: (?P<education_degree_year_completion>.*)",
+    r"Additional information \(certifications\): ?(?P<education_additional_certifications>.*)",
+    r"Title: (?P<publications_title>.*)",
+    r"Date of publication: (?P<publications_date>.*) Publisher: (?P<publications_publisher>.*) Description: (?P<publications_description>.*)",
+    r"References \(optional\): (?P<references>.*)"
+]
+
+# The sample row under the "Skill Name" header, repeated per skill_assessments entry
+SKILL_HEADER = "Skill Name"
+SKILL_ROW_BINDINGS = [
+    r"(?P<skill_name>.+)", r"(?P<years_of_experience>.+)", r"(?P<last_used_year>.+)", r"(?P<vendor_sme_assessment_score>.+)"
+]
+
+# The template has three sample jobs; the one with every field is repeated per work_experience_entries
+# entry and the others are dropped, and its first responsibility bullet is repeated per responsibility
+EXPERIENCE_START = "Current Organization:"
+EXPERIENCE_END = "Publications (optional)"
+EXPERIENCE_ADDITIONAL = "Additional information (optional):"
+EXPERIENCE_BINDINGS = [
+    r"Current Organization: (?P<organization>.*)",
+    r"End Client: (?P<end_client>.*)",
+    r"Project: (?P<project>.*)",
+    r"Start month &amp; year: (?P<start_month_year>.*)",
+    r"End month &amp; year: (?P<end_month_year>.*)",
+    r"Technology/Tools used: (?P<technology_tools>.*)",
+    r"Role/Designation: (?P<role_designation>.*)",
+    r"Responsibility:",
+    r"Additional information \(optional\): (?P<additional_information>.*)"
+]
+RESPONSIBILITY_BINDING = r"(?P<responsibility>.+)"
+
+_ELEMENT = re.compile(r"<(/?)w:(p|tr)(?=[\s/>])[^>]*?(/?)>")
+_TEXT = re.compile(r"<w:t(?:\s[^>]*)?>([^<]*)</w:t>")
+_PRESERVE = '<w:t xml:space="preserve">'
+
+class _Slot:
+    __slots__ = ("key", "prefix", "default")
+
+    def __init__(self, key: str, prefix: str, default: str):
+        self.key = key
+        self.prefix = prefix
+        self.default = default
+
+class _Each:
+    __slots__ = ("key", "edits", "segments")
+
+    def __init__(self, key: str, edits: list):
+        self.key = key
+        self.edits = edits
+        self.segments = []
+
+class _Paragraph:
+    __slots__ = ("start", "end", "depth", "section_break", "nodes", "text")
+
+    def __init__(self, xml: str, start: int, end: int, depth: int):
+        self.start = start
+        self.end = end
+        self.depth = depth
+        self.section_break = "<w:sectPr" in xml[start:end]
+        # (tag start, text start, text end) of every <w:t> in the paragraph
+        self.nodes = [(match.start(), match.start(1), match.end(1)) for match in _TEXT.finditer(xml, start, end)]
+        self.text = "".join(xml[text_start:text_end] for _, text_start, text_end in self.nodes)
+
+def _elements(xml: str, name: str) -> List[tuple]:
+    """(start, end, depth) of every <w:p> or <w:tr>, in document order; paragraphs nest inside text boxes"""
+    spans = []
+    stack = []
+    for match in _ELEMENT.finditer(xml):
+        closing, tag, self_closing = match.groups()
+        if tag != name or self_closing:
+            continue
+        if closing:
+            start = stack.pop()
+            spans.append((start, match.end(), len(stack)))
+        else:
+            stack.append(match.start())
+    return sorted(spans)
+
+def _slot_edits(xml: str, paragraph: _Paragraph, match) -> List[tuple]:
+    """Replace each named group's text with a slot, keeping the runs (and formatting) around it"""
+    ops = {}
+    edits = []
+    for name in match.re.groupindex:
+        group_start, group_end = match.span(name)
+        if group_start < 0:
+            continue
+        # Values that were blank in the sample stay blank when missing; anything else reads NA
+        slot = None if name == "_" else _Slot(
+            name,
+            " " if group_start == group_end and group_start > 0 else "",
+            "" if group_start == group_end else "NA"
+        )
+        if not paragraph.nodes:
+            close = paragraph.end - len("</w:p>")
+            edits.append((close, close, [f"<w:r>{_PRESERVE}", slot, "</w:t></w:r>"]))
+            continue
+
+        offset = 0
+        placed = False
+        for index, (_, text_start, text_end) in enumerate(paragraph.nodes):
+            length = text_end - text_start
+            if not placed and (group_start < offset + length or group_start == group_end == offset + length):
+                ops.setdefault(index, []).append((group_start - offset, min(group_end, offset + length) - offset, slot))
+                placed = True
+            elif placed and offset < group_end:
+                ops.setdefault(index, []).append((0, min(group_end, offset + length) - offset, None))
+            offset += length
+
+    for index, node_ops in ops.items():
+        tag_start, text_start, text_end = paragraph.nodes[index]
+        text = xml[text_start:text_end]
+        replacement = [_PRESERVE]
+        position = 0
+        for op_start, op_end, slot in sorted(node_ops, key=lambda op: op[0]):
+            replacement.append(text[position:op_start])
+            if slot is not None:
+                replacement.append(slot)
+            position = op_end
+        replacement.append(text[position:])
+        edits.append((tag_start, text_end, replacement))
+    return edits
+
+def _bind(xml: str, paragraphs: List[_Paragraph], patterns: List[str]) -> List[tuple]:
+    edits = []
+    cursor = 0
+    for pattern in patterns:
+        regex = re.compile(pattern)
+        for index in range(cursor, len(paragraphs)):
+            match = regex.fullmatch(paragraphs[index].text)
+            if match:
+                break
+        else:
+            raise ValueError(f"Resume template has no paragraph matching {pattern!r}")
+        edits += _slot_edits(xml, paragraphs[index], match)
+        cursor = index + 1
+    return edits
+
+def _within(paragraphs: List[_Paragraph], start: int, end: int) -> List[_Paragraph]:
+    return [paragraph for paragraph in paragraphs if start <= paragraph.start and paragraph.end <= end]
+
+def _drop(paragraphs: List[_Paragraph]) -> List[tuple]:
+    """Delete runs of consecutive paragraphs, keeping any that carry a section break"""
+    edits = []
+    run = []
+    for paragraph in paragraphs + [None]:
+        if paragraph is not None and not paragraph.section_break:
+            run.append(paragraph)
+            continue
+        if run:
+            edits.append((run[0].start, run[-1].end, []))
+            run = []
+    return edits
+
+def _skill_row(xml: str, paragraphs: List[_Paragraph]) -> tuple:
+    rows = _elements(xml, "tr")
+    for index, (start, end, _) in enumerate(rows):
+        if any(paragraph.text == SKILL_HEADER for paragraph in _within(paragraphs, start, end)):
+            row_start, row_end, _ = next(row for row in rows[index + 1:] if row[0] >= end)
+            return row_start, row_end
+    raise ValueError(f"Resume template has no {SKILL_HEADER!r} table")
+
+def _experience(xml: str, paragraphs: List[_Paragraph]) -> tuple:
+    """Return (section start, section end, edits) for the work experience section"""
+    top = [paragraph for paragraph in paragraphs if paragraph.depth == 0]
+    starts = [index for index, paragraph in enumerate(top) if paragraph.text.startswith(EXPERIENCE_START)]
+    if not starts:
+        raise ValueError(f"Resume template has no {EXPERIENCE_START!r} paragraph")
+    end = next(index for index in range(starts[-1], len(top)) if top[index].text == EXPERIENCE_END)
+    blocks = [top[first:last] for first, last in zip(starts, starts[1:] + [end])]
+    unit = next(block for block in blocks if any(paragraph.text.startswith(EXPERIENCE_ADDITIONAL) for paragraph in block))
+
+    edits = []
+    for block in blocks:
+        if block is not unit:
+            edits += _drop(block)
+
+    inner = _bind(xml, unit, EXPERIENCE_BINDINGS)
+    responsibility = next(index for index, paragraph in enumerate(unit) if paragraph.text == "Responsibility:")
+    bullets = []
+    for paragraph in unit[responsibility + 1:]:
+        if paragraph.text.startswith(EXPERIENCE_ADDITIONAL):
+            break
+        if paragraph.text:
+            bullets.append(paragraph)
+    if bullets:
+        inner.append((bullets[0].start, bullets[0].end, _Each("responsibilities", _bind(xml, bullets[:1], [RESPONSIBILITY_BINDING]))))
+        if len(bullets) > 1:
+            inner.append((bullets[1].start, bullets[-1].end, []))
+    edits.append((unit[0].start, unit[-1].end, _Each("work_experience_entries", inner)))
+    return top[starts[0]].start, top[end].start, edits
+
+def _build(xml: str, start: int, end: int, edits: List[tuple]) -> list:
+    segments = []
+    position = start
+    for edit_start, edit_end, payload in sorted(edits, key=lambda edit: edit[0]):
+        if edit_start < position:
+            raise ValueError("Overlapping resume template bindings")
+        segments.append(xml[position:edit_start])
+        if isinstance(payload, _Each):
+            payload.segments = _build(xml, edit_start, edit_end, payload.edits)
+            segments.append(payload)
+        else:
+            segments += payload
+        position = edit_end
+    segments.append(xml[position:end])
+
+    # Merge neighbouring literals so rendering is one append per slot
+    merged = []
+    for segment in segments:
+        if isinstance(segment, str) and merged and isinstance(merged[-1], str):
+            merged[-1] += segment
+        elif not isinstance(segment, str) or segment:
+            merged.append(segment)
+    return merged
+
+def compile_document(xml: str) -> list:
+    """Turn document.xml into literal strings, slots and repeated blocks, once per process"""
+    paragraphs = [_Paragraph(xml, start, end, depth) for start, end, depth in _elements(xml, "p")]
+    skill_start, skill_end = _skill_row(xml, paragraphs)
+    experience_start, experience_end, edits = _experience(xml, paragraphs)
+
+    skill_edits = _bind(xml, _within(paragraphs, skill_start, skill_end), SKILL_ROW_BINDINGS)
+    edits.append((skill_start, skill_end, _Each("skill_assessments", skill_edits)))
+
+    document = [
+        paragraph for paragraph in paragraphs
+        if not (skill_start <= paragraph.start < skill_end or experience_start <= paragraph.start < experience_end)
+    ]
+    edits += _bind(xml, document, TEMPLATE_BINDINGS)
+    return _build(xml, 0, len(xml), edits)
+
+def _render(segments: list, scope: dict, out: list):
+    for segment in segments:
+        if isinstance(segment, str):
+            out.append(segment)
+        elif isinstance(segment, _Slot):
+            value = scope.get(segment.key) or segment.default
+            if value:
+                out.append(segment.prefix + escape(value))
+        else:
+            for item in scope.get(segment.key) or []:
+                _render(segment.segments, item, out)
+
+class ResumeTemplate:
+    """resume_template.docx parsed once; rendering only joins strings and re-zips"""
+
+    def __init__(self, path: str):
+        with zipfile.ZipFile(path) as package:
+            self._parts = [
+                (info.filename, info.date_time, info.compress_type, None if info.filename == DOCUMENT_PART else package.read(info))
+                for info in package.infolist()
+            ]
+            self._segments = compile_document(package.read(DOCUMENT_PART).decode("utf-8"))
+
+    def render(self, context: dict) -> bytes:
+        out = []
+        _render(self._segments, context, out)
+        document = "".join(out).encode("utf-8")
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as package:
+            for filename, date_time, compress_type, data in self._parts:
+                info = zipfile.ZipInfo(filename, date_time)
+                info.compress_type = compress_type
+                package.writestr(info, document if data is None else data)
+        return buffer.getvalue()
+
+@lru_cache(maxsize=1)
+def get_template() -> ResumeTemplate:
+    return ResumeTemplate(settings.RESUME_TEMPLATE_PATH)
+
+def _text(value):
+    return None if value is None else str(value)
+
+def _assessment(score, comments):
+    if score not in ASSESSMENT_SCORES:
+        return comments
+    label = f"{score}. {ASSESSMENT_SCORES[score]}"
+    return f"{label} - {comments}" if comments else label
+
+def resume_context(candidate: dict) -> dict:
+    """Candidate document -> the string values and repeated rows the template binds to"""
+    upgrade_candidate(candidate)
+    context = {field: _text(value) for field, value in candidate.items() if not isinstance(value, (list, dict))}
+    context["client_deployment_details"] = ", ".join(candidate.get("client_deployment_details") or [])
+    context["general_attitude"] = _assessment(candidate.get("general_attitude_assessment"), candidate.get("general_attitude_comments"))
+    context["oral_communication"] = _assessment(candidate.get("oral_communication_assessment"), candidate.get("oral_communication_comments"))
+    context["skill_assessments"] = [
+        {field: _text(value) for field, value in (skill or {}).items()}
+        for skill in candidate.get("skill_assessments") or []
+    ]
+    context["work_experience_entries"] = [
+        {
+            **{field: _text(value) for field, value in (entry or {}).items() if field != "responsibilities"},
+            "responsibilities": [{"responsibility": item} for item in (entry or {}).get("responsibilities") or [] if item]
+        }
+        for entry in candidate.get("work_experience_entries") or []
+    ]
+    return context
+
+def render_resume(candidate: dict) -> bytes:
+    """Runs in a worker process"""
+    return get_template().render(resume_context(candidate))
+
+def resume_filename(candidate: dict) -> str:
+    name = re.sub(r"[^A-Za-z0-9]+", "_", candidate.get("name") or "").strip("_") or "candidate"
+    return f"{name}_{candidate['_id']}.docx"
+
+def _load_template():
+    # Parse in every worker as it starts, not on its first render
+    get_template()
+
+class ResumeExecutor:
+    """Renders resumes on a process pool with bounded concurrency and a queue limit"""
+
+    def __init__(self, max_workers: int, max_queue_depth: int):
+        # Template filling and deflate hold the GIL, so only processes scale with cores. Workers are
+        # spawned rather than forked from a parent that is running Motor's threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_load_template
+        )
+        self._semaphore = asyncio.Semaphore(max_workers)
+        self.max_workers = max_workers
+        self.max_queue_depth = max_queue_depth
+        self.queue_depth = 0
+        self.running = 0
+        self.completed = 0
+        self.rejected = 0
+        self.peak_queue_depth = 0
+        self.total_wait_seconds = 0.0
+        self.total_run_seconds = 0.0
+
+    async def run(self, func, *args, wait: bool = False):
+        """wait=True queues past max_queue_depth instead of raising 503; for callers that can no longer
+        send an error response and that bound their own in-flight work"""
+        if not wait and self.queue_depth >= self.max_queue_depth:
+            self.rejected += 1
+            raise HTTPException(status_code=503, detail="Resume renderer busy, please retry")
+
+        self.queue_depth += 1
+        self.peak_queue_depth = max(self.peak_queue_depth, self.queue_depth)
+        queued_at = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self.queue_depth -= 1
+
+        started_at = time.perf_counter()
+        self.total_wait_seconds += started_at - queued_at
+        self.running += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, func, *args)
+        finally:
+            self.running -= 1
+            self.completed += 1
+            self.total_run_seconds += time.perf_counter() - started_at
+            self._semaphore.release()
+
+    def stats(self) -> dict:
+        return {
+            "max_workers": self.max_workers,
+            "max_queue_depth": self.max_queue_depth,
+            "queue_depth": self.queue_depth,
+            "peak_queue_depth": self.peak_queue_depth,
+            "running": self.running,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "avg_wait_ms": round(self.total_wait_seconds / self.completed * 1000, 2) if self.completed else 0.0,
+            "avg_run_ms": round(self.total_run_seconds / self.completed * 1000, 2) if self.completed else 0.0
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+resume_executor = ResumeExecutor(
+    max_workers=settings.RESUME_MAX_WORKERS,
+    max_queue_depth=settings.RESUME_MAX_QUEUE_DEPTH
+)
+
+async def render_resumes(candidates) -> AsyncIterator[tuple]:
+    """Yield (candidate, docx) in cursor order, keeping every worker busy without queueing the whole batch"""
+    window = deque()
+    limit = min(resume_executor.max_workers * 2, resume_executor.max_queue_depth)
+    try:
+        async for candidate in candidates:
+            # The ZIP headers are already sent, so a 503 here would only truncate the archive; wait for
+            # a worker instead. The window keeps this batch's share of the queue at `limit`
+            task = asyncio.ensure_future(resume_executor.run(render_resume, candidate, wait=True))
+            window.append((candidate, task))
+            if len(window) >= limit:
+                candidate, task = window.popleft()
+                yield candidate, await task
+        while window:
+            candidate, task = window.popleft()
+            yield candidate, await task
+    finally:
+        # Client went away mid-download: don't render what nobody will receive
+        for _, task in window:
+            task.cancel()
+
+class _ZipStream:
+    """Write-only sink for zipfile; what was written since the last drain goes out as one chunk"""
+
+    def __init__(self):
+        self._chunks = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+async def stream_resume_zip(candidates) -> AsyncIterator[bytes]:
+    stream = _ZipStream()
+    # DOCX files are already deflated; storing them keeps the event loop's share to a CRC per file
+    with zipfile.ZipFile(stream, "w", zipfile.ZIP_STORED) as archive:
+        async for candidate, document in render_resumes(candidates):
+            archive.writestr(resume_filename(candidate), document)
+            yield stream.drain()
+    yield stream.drain()
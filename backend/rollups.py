@@ -0,0 +1,276 @@
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Optional
+from bson import ObjectId
+from pymongo import UpdateOne, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from config import settings
+from database import get_database
+
+logger = logging.getLogger(__name__)
+
+FUNNEL_STATE_ID = "funnel"
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+HISTORY_PROJECTION = {
+    "candidate_id": 1,
+    "job_id": 1,
+    "old_status": 1,
+    "new_status": 1,
+    "updated_by": 1,
+    "timestamp": 1
+}
+
+_worker_task: Optional[asyncio.Task] = None
+
+def _status_key(status) -> str:
+    # Statuses arrive as free-form query strings; keep them safe as field names
+    if not status:
+        return "none"
+    return str(status).replace(".", "_").replace("$", "_")
+
+async def _acquire_lease(db, now: datetime):
+    """Take (or renew) the single-writer lease on the funnel high-water mark"""
+    try:
+        return await db.recruitment_portal.rollup_state.find_one_and_update(
+            {
+                "_id": FUNNEL_STATE_ID,
+                "$or": [
+                    {"lease_owner": WORKER_ID},
+                    {"lease_expires": None},
+                    {"lease_expires": {"$lt": now}}
+                ]
+            },
+            {"$set": {
+                "lease_owner": WORKER_ID,
+                "lease_expires": now + timedelta(seconds=settings.ROLLUP_LEASE_SECONDS)
+            }},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        # Another worker holds a live lease
+        return None
+
+async def _load_status_since(db, candidate_ids: set) -> dict:
+    """Return {candidate_id: since} for the status each candidate currently sits in"""
+    since = {}
+    async for state in db.recruitment_portal.rollup_candidate_state.find(
+        {"_id": {"$in": list(candidate_ids)}}
+    ):
+        since[state["_id"]] = state.get("since")
+
+    # Candidates without a rolled-up transition yet entered their first status on creation
+    missing = [ObjectId(cid) for cid in candidate_ids - since.keys() if ObjectId.is_valid(cid)]
+    if missing:
+        async for candidate in db.recruitment_portal.candidates.find(
+            {"_id": {"$in": missing}}, {"created_at": 1}
+        ):
+            since[str(candidate["_id"])] = candidate.get("created_at")
+    return since
+
+async def _apply_batch(db, rows: list, now: datetime):
+    job_ids = {row.get("job_id") for row in rows if row.get("job_id")}
+    job_hr_map = {}
+    async for job in db.recruitment_portal.jobs.find(
+        {"job_id": {"$in": list(job_ids)}}, {"job_id": 1, "assigned_hr": 1}
+    ):
+        job_hr_map[job["job_id"]] = job.get("assigned_hr")
+
+    since = await _load_status_since(db, {row["candidate_id"] for row in rows if row.get("candidate_id")})
+
+    buckets = {}
+    candidate_state = {}
+    for row in rows:
+        timestamp = row.get("timestamp") or row["_id"].generation_time.replace(tzinfo=None)
+        job_id = row.get("job_id")
+        hr_id = job_hr_map.get(job_id) or row.get("updated_by")
+        old_key = _status_key(row.get("old_status"))
+        new_key = _status_key(row.get("new_status"))
+
+        bucket_key = (timestamp.strftime("%Y-%m-%d"), job_id, hr_id)
+        bucket = buckets.setdefault(bucket_key, {"$inc": {}, "$min": {}, "$max": {}})
+        inc = bucket["$inc"]
+        inc[f"transitions.{old_key}.{new_key}"] = inc.get(f"transitions.{old_key}.{new_key}", 0) + 1
+        inc[f"entered.{new_key}"] = inc.get(f"entered.{new_key}", 0) + 1
+        inc["total_transitions"] = inc.get("total_transitions", 0) + 1
+
+        candidate_id = row.get("candidate_id")
+        entered_at = since.get(candidate_id)
+        if isinstance(entered_at, datetime) and timestamp >= entered_at:
+            seconds = (timestamp - entered_at).total_seconds()
+            prefix = f"time_in_status.{old_key}"
+            inc[f"{prefix}.count"] = inc.get(f"{prefix}.count", 0) + 1
+            inc[f"{prefix}.total_seconds"] = inc.get(f"{prefix}.total_seconds", 0) + seconds
+            bucket["$min"][f"{prefix}.min_seconds"] = min(bucket["$min"].get(f"{prefix}.min_seconds", seconds), seconds)
+            bucket["$max"][f"{prefix}.max_seconds"] = max(bucket["$max"].get(f"{prefix}.max_seconds", seconds), seconds)
+
+        if candidate_id:
+            since[candidate_id] = timestamp
+            candidate_state[candidate_id] = {"status": row.get("new_status"), "since": timestamp}
+
+    # Each bucket records the last history _id folded into it; a replayed or concurrently applied
+    # batch finds applied_through already at or past its mark and leaves the counters alone
+    batch_mark = rows[-1]["_id"]
+    ensure_ops = []
+    rollup_ops = []
+    for (day, job_id, hr_id), update in buckets.items():
+        key = {"day": day, "job_id": job_id, "hr_id": hr_id}
+        update = {op: fields for op, fields in update.items() if fields}
+        update["$set"] = {"updated_at": now, "applied_through": batch_mark}
+        ensure_ops.append(UpdateOne(key, {"$setOnInsert": key}, upsert=True))
+        rollup_ops.append(UpdateOne({**key, "applied_through": {"$not": {"$gte": batch_mark}}}, update))
+    await db.recruitment_portal.funnel_rollups.bulk_write(ensure_ops, ordered=False)
+    await db.recruitment_portal.funnel_rollups.bulk_write(rollup_ops, ordered=False)
+
+    if candidate_state:
+        await db.recruitment_portal.rollup_candidate_state.bulk_write([
+            UpdateOne({"_id": candidate_id}, {"$set": state}, upsert=True)
+            for candidate_id, state in candidate_state.items()
+        ], ordered=False)
+
+async def advance_funnel_rollups(db, batch_size: Optional[int] = None, max_batches: Optional[int] = None) -> int:
+    """Fold application_history rows past the high-water mark into funnel_rollups"""
+    batch_size = batch_size or settings.ROLLUP_BATCH_SIZE
+    max_batches = max_batches or settings.ROLLUP_MAX_BATCHES_PER_RUN
+
+    state = await _acquire_lease(db, datetime.utcnow())
+    if state is None:
+        return 0
+
+    last_id = state.get("last_id")
+    processed = 0
+    for _ in range(max_batches):
+        # History _ids are generated by each app process, so they only settle into insertion order
+        # after a while; rows newer than the settle window wait for a later run instead of being
+        # skipped for good when an older _id lands behind the mark
+        cutoff = ObjectId.from_datetime(datetime.utcnow() - timedelta(seconds=settings.ROLLUP_SETTLE_SECONDS))
+        query = {"_id": {"$gt": last_id, "$lt": cutoff}} if last_id else {"_id": {"$lt": cutoff}}
+        rows = await db.recruitment_portal.application_history.find(
+            query, HISTORY_PROJECTION
+        ).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        if not rows:
+            break
+
+        now = datetime.utcnow()
+        await _apply_batch(db, rows, now)
+
+        # The mark only moves after the batch is written; a crash replays the batch, which
+        # _apply_batch skips for every bucket it already reached
+        last_id = rows[-1]["_id"]
+        processed += len(rows)
+        renewed = await db.recruitment_portal.rollup_state.update_one(
+            {"_id": FUNNEL_STATE_ID, "lease_owner": WORKER_ID},
+            {
+                "$set": {
+                    "last_id": last_id,
+                    "last_run_at": now,
+                    "lease_expires": now + timedelta(seconds=settings.ROLLUP_LEASE_SECONDS)
+                },
+                "$inc": {"rows_processed": len(rows)}
+            }
+        )
+        if renewed.matched_count == 0:
+            # Lease expired and another worker took over
+            break
+        if len(rows) < batch_size:
+            break
+
+    return processed
+
+async def _run_worker():
+    while True:
+        try:
+            db = await get_database()
+            processed = await advance_funnel_rollups(db)
+            if processed:
+                logger.info(f"Funnel rollups advanced by {processed} history rows")
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error(f"Funnel rollup run failed: {str(exc)}", exc_info=True)
+        await asyncio.sleep(settings.ROLLUP_INTERVAL_SECONDS)
+
+def start_rollup_worker():
+    global _worker_task
+    if settings.ROLLUP_INTERVAL_SECONDS > 0 and _worker_task is None:
+        _worker_task = asyncio.create_task(_run_worker())
+
+async def stop_rollup_worker():
+    global _worker_task
+    if _worker_task is not None:
+        _worker_task.cancel()
+        try:
+            await _worker_task
+        except asyncio.CancelledError:
+            pass
+        _worker_task = None
+
+def _merge_counts(target: dict, source: dict):
+    for key, value in (source or {}).items():
+        if isinstance(value, dict):
+            _merge_counts(target.setdefault(key, {}), value)
+        else:
+            target[key] = target.get(key, 0) + value
+
+async def read_funnel_report(
+    db,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    job_id: Optional[str] = None,
+    hr_id: Optional[str] = None
+) -> dict:
+    """Build the funnel report from rollup documents only"""
+    filter_query = {}
+    if date_from or date_to:
+        filter_query["day"] = {}
+        if date_from:
+            filter_query["day"]["$gte"] = date_from
+        if date_to:
+            filter_query["day"]["$lte"] = date_to
+    if job_id:
+        filter_query["job_id"] = job_id
+    if hr_id:
+        filter_query["hr_id"] = hr_id
+
+    transitions = {}
+    entered = {}
+    time_in_status = {}
+    by_day = {}
+    async for rollup in db.recruitment_portal.funnel_rollups.find(filter_query, {"_id": 0}):
+        _merge_counts(transitions, rollup.get("transitions"))
+        _merge_counts(entered, rollup.get("entered"))
+        by_day[rollup["day"]] = by_day.get(rollup["day"], 0) + rollup.get("total_transitions", 0)
+        for status, stats in (rollup.get("time_in_status") or {}).items():
+            merged = time_in_status.setdefault(status, {"count": 0, "total_seconds": 0})
+            merged["count"] += stats.get("count", 0)
+            merged["total_seconds"] += stats.get("total_seconds", 0)
+            if "min_seconds" in stats:
+                merged["min_seconds"] = min(merged.get("min_seconds", stats["min_seconds"]), stats["min_seconds"])
+            if "max_seconds" in stats:
+                merged["max_seconds"] = max(merged.get("max_seconds", stats["max_seconds"]), stats["max_seconds"])
+
+    for stats in time_in_status.values():
+        stats["avg_seconds"] = stats["total_seconds"] / stats["count"] if stats["count"] else None
+
+    state = await db.recruitment_portal.rollup_state.find_one({"_id": FUNNEL_STATE_ID}, {"last_run_at": 1})
+    last_run_at = state.get("last_run_at") if state else None
+
+    return {
+        "date_from": date_from,
+        "date_to": date_to,
+        "job_id": job_id,
+        "hr_id": hr_id,
+        "transitions": [
+            {"from": old_status, "to": new_status, "count": count}
+            for old_status, targets in transitions.items()
+            for new_status, count in targets.items()
+        ],
+        "entered": entered,
+        "time_in_status": time_in_status,
+        "by_day": [{"day": day, "transitions": by_day[day]} for day in sorted(by_day)],
+        "rolled_up_to": last_run_at.isoformat() if last_run_at else None
+    }
@@ -1,12 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, File, UploadFile
+from fastapi import APIRouter, Depends, HTTPException, File, UploadFile, Response, Query, Request
+from fastapi.responses import StreamingResponse
 from datetime import datetime
 from bson import ObjectId
 from typing import List, Optional
-import pandas as pd
-import random
-from models import UserCreate
+import csv
+import io
+from models import UserCreate, ResumeBatch
 from routes.auth import get_current_admin_user
-from database import get_database
+from database import get_database, get_reader
+from auth import invalidate_principal
+from cache import principal_cache
+from dashboards import get_admin_dashboard_counts
+from rollups import read_funnel_report
+from pagination import PageParams, fetch_page
+from projections import CandidateListResponse, CandidateViewParams
+from exports import EXPORT_FORMATS, candidate_columns, flatten_candidate, flatten_job, JOB_COLUMNS, export_stream, export_headers
+from config import settings
+from hashing import hash_password, hashing_executor
+from ingestion import CSV_REQUIRED_COLUMNS, JobIngestion, csv_job_rows, generate_job_id, insert_job
+from search import CandidateSearchParams, JobSearchParams, build_candidate_filter, build_job_filter
+from candidate_schema import upgrade_candidates
+from candidate_identity import find_duplicate_groups
+from loaders import ReferenceLoader, reference_cache
+from responses import json_response, with_public_ids
+from change_versions import bump_versions
+from etags import conditional_get
+from events import JOB_ALLOCATED, broker, make_event, publish_events
+from pool_metrics import pool_metrics
+from slow_queries import slow_query_log
+from schema_migration import migration_status
+from resumes import resume_executor, stream_resume_zip
+from matching import match_index
 
 router = APIRouter(prefix="/admin", tags=["Admin"])
 
@@ -18,39 +42,24 @@ async def upload_csv(file: UploadFile = File(...), current_user: dict = Depends(
         raise HTTPException(status_code=400, detail="Only CSV files are allowed")
     
     try:
-        # Read CSV file
-        df = pd.read_csv(file.file)
+        # Parse the upload incrementally instead of materialising it in a DataFrame
+        reader = csv.DictReader(io.TextIOWrapper(file.file, encoding="utf-8-sig", newline=""))
         
         # Validate required columns
-        required_columns = ['title', 'description', 'location', 'ctc']
-        missing_columns = [col for col in required_columns if col not in df.columns]
+        missing_columns = [col for col in CSV_REQUIRED_COLUMNS if col not in (reader.fieldnames or [])]
         if missing_columns:
             raise HTTPException(status_code=400, detail=f"Missing required columns: {missing_columns}")
         
-        jobs_added = 0
-        for _, row in df.iterrows():
-            # Generate unique job ID
-            job_id = f"jb{datetime.now().strftime('%m%d%H%M')}{random.randint(10, 99)}"
-            
-            job_data = {
-                "job_id": job_id,
-                "title": row['title'],
-                "description": row['description'],
-                "location": row['location'],
-                "salary_package": row['ctc'],
-                "source_company": "CSV Upload",
-                "uploaded_by": str(current_user["_id"]),
-                "status": "allocated",
-                "opening_date": datetime.now(),
-                "created_at": datetime.utcnow()
-            }
-            
-            result = await db.recruitment_portal.jobs.insert_one(job_data)
-            jobs_added += 1
+        ingestion = JobIngestion(db, uploaded_by=str(current_user["_id"]), source_company="CSV Upload")
+        report = await ingestion.run(csv_job_rows(reader))
+        match_index.jobs_changed(ingestion.job_ids)
+        await bump_versions(db, "jobs")
         
-        return {"message": f"Successfully uploaded {jobs_added} jobs"}
+        return {"message": f"Successfully uploaded {report['inserted']} jobs", **report}
         
-    except Exception as e:
+    except HTTPException:
+        raise
+    except (csv.Error, UnicodeDecodeError) as e:
         raise HTTPException(status_code=400, detail=f"Error processing CSV: {str(e)}")
 
 @router.post("/add-job")
@@ -58,7 +67,7 @@ async def add_job(job_data: dict, current_user: dict = Depends(get_current_admin
     db = await get_database()
     
     # Generate unique job ID
-    job_id = f"jb{datetime.now().strftime('%m%d%H%M')}{random.randint(10, 99)}"
+    job_id = generate_job_id()
     
     job_data["job_id"] = job_id
     job_data["uploaded_by"] = str(current_user["_id"])
@@ -67,31 +76,22 @@ async def add_job(job_data: dict, current_user: dict = Depends(get_current_admin
     job_data["created_at"] = datetime.utcnow()
     job_data["source_company"] = "Manual Entry"
     
-    result = await db.recruitment_portal.jobs.insert_one(job_data)
+    result = await insert_job(db, job_data)
+    match_index.job_changed(job_data["job_id"])
+    await bump_versions(db, "jobs")
     
-    return {"message": "Job added successfully", "job_id": job_id}
+    return {"message": "Job added successfully", "job_id": job_data["job_id"]}
 
 @router.post("/add-jobs-bulk")
 async def add_jobs_bulk(jobs_data: List[dict], current_user: dict = Depends(get_current_admin_user)):
     db = await get_database()
     
-    jobs_added = 0
-    for job_data in jobs_data:
-        # Generate unique job ID - smaller format
-        job_id = f"jb{datetime.now().strftime('%m%d%H%M')}{random.randint(10, 99)}"
-        
-        job_data["job_id"] = job_id
-        job_data["uploaded_by"] = str(current_user["_id"])
-        job_data["status"] = "allocated"  # Initial status as allocated
-        job_data["opening_date"] = datetime.now()
-        job_data["created_at"] = datetime.utcnow()
-        job_data["salary_package"] = job_data.get("ctc", "")
-        job_data["source_company"] = "CSV Upload"
-        
-        result = await db.recruitment_portal.jobs.insert_one(job_data)
-        jobs_added += 1
+    ingestion = JobIngestion(db, uploaded_by=str(current_user["_id"]), source_company="CSV Upload")
+    report = await ingestion.run(enumerate(jobs_data, start=1))
+    match_index.jobs_changed(ingestion.job_ids)
+    await bump_versions(db, "jobs")
     
-    return {"message": f"Successfully added {jobs_added} jobs"}
+    return {"message": f"Successfully added {report['inserted']} jobs", **report}
 
 @router.put("/jobs/{job_id}")
 async def update_job(
@@ -115,58 +115,36 @@ async def update_job(
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Job not found")
     
+    reference_cache.invalidate_job(job_id)
+    match_index.job_changed(job_id)
+    await bump_versions(db, "jobs")
+    
     return {"message": "Job updated successfully"}
 
 @router.get("/jobs")
 async def get_all_jobs(
-    status: Optional[str] = None,
-    opening_date_from: Optional[str] = None,
-    opening_date_to: Optional[str] = None,
-    assigned_hr: Optional[str] = None,
-    current_user: dict = Depends(get_current_admin_user)
+    response: Response,
+    page: PageParams = Depends(),
+    search: JobSearchParams = Depends(),
+    current_user: dict = Depends(get_current_admin_user),
+    etag: str = Depends(conditional_get("jobs", "users", reads="lists"))
 ):
     db = await get_database()
+    reader = await get_reader("lists")
     
-    # Build filter
-    filter_query = {}
-    if status:
-        filter_query["status"] = status
-    if opening_date_from:
-        # Convert date string to datetime with time set to start of day
-        from_date = datetime.fromisoformat(opening_date_from)
-        filter_query["opening_date"] = {"$gte": from_date}
-    if opening_date_to:
-        # Convert date string to datetime with time set to end of day (23:59:59)
-        to_date = datetime.fromisoformat(opening_date_to)
-        to_date = to_date.replace(hour=23, minute=59, second=59, microsecond=999999)
-        if "opening_date" in filter_query:
-            filter_query["opening_date"]["$lte"] = to_date
-        else:
-            filter_query["opening_date"] = {"$lte": to_date}
-    if assigned_hr:
-        filter_query["assigned_hr"] = assigned_hr
-    
-    # Get all HR users for name mapping
-    hr_users = await db.recruitment_portal.users.find({"role": "hr"}).to_list(length=100)
-    hr_user_map = {str(user["_id"]): user["name"] for user in hr_users}
-    
-    jobs = await db.recruitment_portal.jobs.find(filter_query).sort("created_at", -1).to_list(length=100)
-    
-    for job in jobs:
-        job["id"] = str(job["_id"])
-        del job["_id"]
-        
-        # Convert datetime fields to ISO format for JSON serialization
-        if "created_at" in job and isinstance(job["created_at"], datetime):
-            job["created_at"] = job["created_at"].isoformat()
-        if "opening_date" in job and isinstance(job["opening_date"], datetime):
-            job["opening_date"] = job["opening_date"].isoformat()
-        
+    filter_query = build_job_filter(search)
+    
+    jobs = await fetch_page(reader.recruitment_portal.jobs, filter_query, page, response)
+    
+    # Resolve names only for the HR users assigned on this page
+    hr_user_map = await ReferenceLoader(db).hr_names(job.get("assigned_hr") for job in jobs)
+    
+    for job in with_public_ids(jobs):
         # Add HR user name if assigned
         if job.get("assigned_hr"):
             job["assigned_hr_name"] = hr_user_map.get(job["assigned_hr"], "Unknown")
     
-    return jobs
+    return json_response(jobs, response)
 
 @router.put("/jobs/{job_id}/allocate")
 async def allocate_job(
@@ -189,23 +167,26 @@ async def allocate_job(
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Job not found")
     
+    reference_cache.invalidate_job(job_id)
+    match_index.job_changed(job_id)
+    await bump_versions(db, "jobs")
+    await publish_events([make_event(JOB_ALLOCATED, job_id=job_id, hr_id=hr_id)])
+    
     return {"message": "Job allocated successfully"}
 
 @router.get("/users")
-async def get_all_users(current_user: dict = Depends(get_current_admin_user)):
-    db = await get_database()
-    
-    users = await db.recruitment_portal.users.find({"role": "hr"}).to_list(length=100)
+async def get_all_users(
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: dict = Depends(get_current_admin_user),
+    etag: str = Depends(conditional_get("users", reads="lists"))
+):
+    reader = await get_reader("lists")
     
-    for user in users:
-        user["id"] = str(user["_id"])
-        del user["_id"]
-        del user["password"]  # Don't send password
-        # Convert datetime fields to ISO format for JSON serialization
-        if "created_at" in user and isinstance(user["created_at"], datetime):
-            user["created_at"] = user["created_at"].isoformat()
+    # Don't send password
+    users = await fetch_page(reader.recruitment_portal.users, {"role": "hr"}, page, response, projection={"password": 0})
     
-    return users
+    return json_response(with_public_ids(users), response)
 
 @router.post("/users")
 async def create_hr_user(user_data: dict, current_user: dict = Depends(get_current_admin_user)):
@@ -217,14 +198,14 @@ async def create_hr_user(user_data: dict, current_user: dict = Depends(get_curre
         raise HTTPException(status_code=400, detail="Email already registered")
     
     # Create new HR user
-    from routes.auth import get_password_hash
-    
     created_at = datetime.utcnow()
     user_data["role"] = "hr"
-    user_data["password"] = get_password_hash(user_data["password"])
+    user_data["password"] = await hash_password(user_data["password"])
     user_data["created_at"] = created_at
     
     result = await db.recruitment_portal.users.insert_one(user_data)
+    reference_cache.invalidate_user(str(result.inserted_id))
+    await bump_versions(db, "users")
     
     # Create response data without ObjectId
     response_data = {
@@ -246,11 +227,18 @@ async def delete_hr_user(user_id: str, current_user: dict = Depends(get_current_
     if allocated_jobs > 0:
         raise HTTPException(status_code=400, detail="Cannot delete HR user with allocated jobs")
     
-    result = await db.recruitment_portal.users.delete_one({"_id": ObjectId(user_id)})
+    deleted_user = await db.recruitment_portal.users.find_one_and_delete(
+        {"_id": ObjectId(user_id)},
+        projection={"email": 1}
+    )
     
-    if result.deleted_count == 0:
+    if deleted_user is None:
         raise HTTPException(status_code=404, detail="User not found")
     
+    invalidate_principal(deleted_user.get("email"))
+    reference_cache.invalidate_user(user_id)
+    await bump_versions(db, "users")
+    
     return {"message": "HR user deleted successfully"}
 
 @router.put("/users/{user_id}")
@@ -268,69 +256,76 @@ async def update_hr_user(
     
     # Hash password if provided
     if "password" in user_update and user_update["password"]:
-        from routes.auth import get_password_hash
-        user_update["password"] = get_password_hash(user_update["password"])
+        user_update["password"] = await hash_password(user_update["password"])
     elif "password" in user_update:
         del user_update["password"]
     
-    result = await db.recruitment_portal.users.update_one(
+    # Pre-image carries the old email so the cached principal can be dropped
+    previous_user = await db.recruitment_portal.users.find_one_and_update(
         {"_id": ObjectId(user_id), "role": "hr"},
-        {"$set": user_update}
+        {"$set": user_update},
+        projection={"email": 1}
     )
     
-    if result.modified_count == 0:
+    if previous_user is None:
         raise HTTPException(status_code=404, detail="HR user not found")
     
+    invalidate_principal(previous_user.get("email"), user_update.get("email"))
+    reference_cache.invalidate_user(user_id)
+    await bump_versions(db, "users")
+    
     return {"message": "HR user updated successfully"}
 
 @router.get("/dashboard")
-async def get_admin_dashboard(current_user: dict = Depends(get_current_admin_user)):
+async def get_admin_dashboard(
+    request: Request,
+    current_user: dict = Depends(get_current_admin_user),
+    etag: str = Depends(conditional_get("jobs", "candidates", "users", reads="dashboards"))
+):
+    reader = await get_reader("dashboards")
+    # Every admin sees the same counts, so they share one cache entry per data version
+    return await get_admin_dashboard_counts(reader, version=request.state.data_version)
+
+@router.get("/reports/funnel")
+async def get_funnel_report(
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    job_id: Optional[str] = None,
+    hr_id: Optional[str] = None,
+    current_user: dict = Depends(get_current_admin_user)
+):
     db = await get_database()
     
-    # Get job counts
-    total_jobs = await db.recruitment_portal.jobs.count_documents({})
-    open_jobs = await db.recruitment_portal.jobs.count_documents({"status": "open"})
-    allocated_jobs = await db.recruitment_portal.jobs.count_documents({"status": "allocated"})
-    closed_jobs = await db.recruitment_portal.jobs.count_documents({"status": "closed"})
-    submitted_jobs = await db.recruitment_portal.jobs.count_documents({"status": "submit"})
-    
-    # Get candidate counts
-    total_candidates = await db.recruitment_portal.candidates.count_documents({})
-    selected_candidates = await db.recruitment_portal.candidates.count_documents({"status": "selected"})
-    rejected_candidates = await db.recruitment_portal.candidates.count_documents({"status": "rejected"})
-    
-    # Get HR user count
-    hr_users = await db.recruitment_portal.users.count_documents({"role": "hr"})
-    
-    return {
-        "total_jobs": total_jobs,
-        "open_jobs": open_jobs,
-        "allocated_jobs": allocated_jobs,
-        "closed_jobs": closed_jobs,
-        "submitted_jobs": submitted_jobs,
-        "total_candidates": total_candidates,
-        "selected_candidates": selected_candidates,
-        "rejected_candidates": rejected_candidates,
-        "hr_users": hr_users
-    }
+    # Rollups are bucketed by UTC day; normalise inputs to YYYY-MM-DD
+    try:
+        if date_from:
+            date_from = datetime.fromisoformat(date_from).strftime("%Y-%m-%d")
+        if date_to:
+            date_to = datetime.fromisoformat(date_to).strftime("%Y-%m-%d")
+    except ValueError:
+        raise HTTPException(status_code=400, detail="date_from and date_to must be ISO dates, e.g. 2024-01-31")
+    
+    return await read_funnel_report(db, date_from, date_to, job_id, hr_id)
 
-@router.get("/candidates")
-async def get_all_candidates(current_user: dict = Depends(get_current_admin_user)):
+@router.get("/candidates", response_model=CandidateListResponse)
+async def get_all_candidates(
+    response: Response,
+    page: PageParams = Depends(),
+    search: CandidateSearchParams = Depends(),
+    view: CandidateViewParams = Depends(),
+    current_user: dict = Depends(get_current_admin_user),
+    etag: str = Depends(conditional_get("candidates", "jobs", reads="lists"))
+):
     db = await get_database()
+    reader = await get_reader("lists")
     
-    candidates = await db.recruitment_portal.candidates.find({}).sort("created_at", -1).to_list(length=100)
+    filter_query = build_candidate_filter(search)
+    candidates = await fetch_page(reader.recruitment_portal.candidates, filter_query, page, response, projection=view.projection)
     
-    # Get all jobs for job title mapping
-    jobs = await db.recruitment_portal.jobs.find({}).to_list(length=1000)
-    job_map = {job["job_id"]: job["title"] for job in jobs}
+    # Resolve titles only for the jobs referenced on this page
+    job_map = await ReferenceLoader(db).job_titles(candidate.get("job_id") for candidate in candidates)
     
-    for candidate in candidates:
-        candidate["id"] = str(candidate["_id"])
-        del candidate["_id"]
-        # Convert datetime fields to ISO format for JSON serialization
-        if "created_at" in candidate and isinstance(candidate["created_at"], datetime):
-            candidate["created_at"] = candidate["created_at"].isoformat()
-        
+    for candidate in with_public_ids(upgrade_candidates(candidates)):
         # Add job title information
         if candidate.get("job_id"):
             candidate["applied_for"] = job_map.get(candidate["job_id"], "Unknown Job")
@@ -342,4 +337,124 @@ async def get_all_candidates(current_user: dict = Depends(get_current_admin_user
             if not candidate.get("role_applied_for"):
                 candidate["role_applied_for"] = job_map.get(candidate["job_id"], "Unknown Job")
     
-    return candidates 
\ No newline at end of file
+    return json_response(candidates, response)
+
+@router.get("/candidates/duplicates")
+async def get_duplicate_candidates(
+    key_type: Optional[str] = Query(None, pattern="^(email|phone|pan|passport)$"),
+    limit: int = Query(100, ge=1, le=1000),
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """Candidates sharing a normalized email, phone, PAN or passport number, grouped by the shared key"""
+    reader = await get_reader("lists")
+    return await find_duplicate_groups(reader.recruitment_portal.candidates, key_type, limit)
+
+@router.get("/diagnostics/auth-cache")
+async def get_auth_cache_stats(current_user: dict = Depends(get_current_admin_user)):
+    return principal_cache.stats()
+
+@router.get("/diagnostics/reference-cache")
+async def get_reference_cache_stats(current_user: dict = Depends(get_current_admin_user)):
+    return reference_cache.stats()
+
+@router.get("/diagnostics/events")
+async def get_event_stats(current_user: dict = Depends(get_current_admin_user)):
+    return broker.stats()
+
+@router.get("/diagnostics/mongo-pool")
+async def get_mongo_pool_stats(current_user: dict = Depends(get_current_admin_user)):
+    return {
+        "max_pool_size": settings.MONGO_MAX_POOL_SIZE,
+        "min_pool_size": settings.MONGO_MIN_POOL_SIZE,
+        "wait_queue_timeout_ms": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "read_preferences": {
+            "lists": settings.MONGO_LIST_READ_PREFERENCE,
+            "dashboards": settings.MONGO_DASHBOARD_READ_PREFERENCE
+        },
+        **pool_metrics.stats()
+    }
+
+@router.get("/diagnostics/slow-queries")
+async def get_slow_queries(
+    limit: int = Query(50, ge=1, le=1000),
+    current_user: dict = Depends(get_current_admin_user)
+):
+    """Recent commands over SLOW_QUERY_THRESHOLD_MS, newest first, plus each distinct shape with its explain"""
+    return slow_query_log.snapshot(limit)
+
+@router.get("/diagnostics/schema-migration")
+async def get_schema_migration_status(current_user: dict = Depends(get_current_admin_user)):
+    """Progress of the background candidate schema migration: migrated, bytes saved and remaining backlog"""
+    db = await get_database()
+    return await migration_status(db)
+
+@router.get("/diagnostics/matching")
+async def get_matching_stats(current_user: dict = Depends(get_current_admin_user)):
+    return match_index.stats()
+
+@router.get("/diagnostics/hashing")
+async def get_hashing_stats(current_user: dict = Depends(get_current_admin_user)):
+    return hashing_executor.stats()
+
+@router.get("/diagnostics/resumes")
+async def get_resume_renderer_stats(current_user: dict = Depends(get_current_admin_user)):
+    return resume_executor.stats()
+
+@router.get("/export/candidates")
+async def export_candidates(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    search: CandidateSearchParams = Depends(),
+    current_user: dict = Depends(get_current_admin_user)
+):
+    db = await get_database()
+    
+    # Rows are streamed straight off the cursor, one batch in memory at a time
+    cursor = db.recruitment_portal.candidates.find(
+        build_candidate_filter(search),
+        batch_size=settings.EXPORT_BATCH_SIZE
+    ).sort("_id", 1)
+    
+    return StreamingResponse(
+        export_stream(cursor, export_format, candidate_columns(), flatten_candidate),
+        media_type=EXPORT_FORMATS[export_format],
+        headers=export_headers("candidates", export_format)
+    )
+
+@router.get("/export/jobs")
+async def export_jobs(
+    export_format: str = Query("csv", alias="format", pattern="^(csv|ndjson)$"),
+    search: JobSearchParams = Depends(),
+    current_user: dict = Depends(get_current_admin_user)
+):
+    db = await get_database()
+    
+    cursor = db.recruitment_portal.jobs.find(
+        build_job_filter(search),
+        batch_size=settings.EXPORT_BATCH_SIZE
+    ).sort("_id", 1)
+    
+    return StreamingResponse(
+        export_stream(cursor, export_format, JOB_COLUMNS, flatten_job),
+        media_type=EXPORT_FORMATS[export_format],
+        headers=export_headers("jobs", export_format)
+    )
+
+@router.post("/resumes:zip")
+async def export_resumes_zip(batch: ResumeBatch, current_user: dict = Depends(get_current_admin_user)):
+    """Render the given candidates' resumes on the process pool and stream them back as one ZIP"""
+    if len(batch.candidate_ids) > settings.RESUME_BATCH_MAX_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {settings.RESUME_BATCH_MAX_SIZE} candidates per batch")
+    object_ids = [ObjectId(candidate_id) for candidate_id in batch.candidate_ids if ObjectId.is_valid(candidate_id)]
+    
+    db = await get_database()
+    candidate_filter = {"_id": {"$in": object_ids}}
+    # Fail before the response starts; once streaming, errors can only cut the ZIP short
+    if not object_ids or not await db.recruitment_portal.candidates.find_one(candidate_filter, {"_id": 1}):
+        raise HTTPException(status_code=404, detail="No candidates found")
+    
+    cursor = db.recruitment_portal.candidates.find(candidate_filter, batch_size=settings.EXPORT_BATCH_SIZE).sort("_id", 1)
+    return StreamingResponse(
+        stream_resume_zip(cursor),
+        media_type="application/zip",
+        headers=export_headers("resumes", "zip")
+    )
\ No newline at end of file
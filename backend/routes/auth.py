@@ -1,25 +1,20 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from bson import ObjectId
 from typing import Optional
 from pydantic import BaseModel
 from models import UserCreate, Token, TokenData
 from database import get_database
 from config import settings
+from auth import load_principal
+from hashing import hash_password, verify_password
+from change_versions import bump_versions
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 security = HTTPBearer()
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-def verify_password(plain_password, hashed_password):
-    return pwd_context.verify(plain_password, hashed_password)
-
-def get_password_hash(password):
-    return pwd_context.hash(password)
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     to_encode = data.copy()
@@ -31,27 +26,48 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None):
     encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
     return encoded_jwt
 
-async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
+# Stream URLs end up in proxy and access logs, so they carry a short-lived token that only opens the event stream
+STREAM_TOKEN_SCOPE = "events:stream"
+
+def create_stream_token(email: str) -> str:
+    return create_access_token(
+        {"sub": email, "scope": STREAM_TOKEN_SCOPE},
+        timedelta(seconds=settings.STREAM_TOKEN_EXPIRE_SECONDS)
+    )
+
+async def _principal_from_token(token: str, scope: Optional[str] = None):
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
     try:
-        payload = jwt.decode(credentials.credentials, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
         email: str = payload.get("sub")
-        if email is None:
+        # Access tokens carry no scope; a scoped token is only good for its own endpoint
+        if email is None or payload.get("scope") != scope:
             raise credentials_exception
         token_data = TokenData(email=email)
     except JWTError:
         raise credentials_exception
     
-    db = await get_database()
-    user = await db.recruitment_portal.users.find_one({"email": token_data.email})
+    user = await load_principal(token_data.email)
     if user is None:
         raise credentials_exception
     return user
 
+async def get_current_user(request: Request, credentials: HTTPAuthorizationCredentials = Depends(security)):
+    user = await _principal_from_token(credentials.credentials)
+    # Request metrics are labelled by role
+    request.state.role = user.get("role")
+    return user
+
+async def get_current_user_from_stream_token(request: Request, token: str = Query(...)):
+    # EventSource can't send an Authorization header, so the stream takes a scoped token in the query
+    user = await _principal_from_token(token, scope=STREAM_TOKEN_SCOPE)
+    request.state.role = user.get("role")
+    return user
+
 async def get_current_admin_user(current_user: dict = Depends(get_current_user)):
     if current_user["role"] != "admin":
         raise HTTPException(status_code=403, detail="Admin access required")
@@ -73,11 +89,12 @@ async def register(user: UserCreate):
     
     # Create new user
     user_data = user.model_dump()
-    user_data["password"] = get_password_hash(user.password)
+    user_data["password"] = await hash_password(user.password)
     user_data["created_at"] = datetime.utcnow()
     
     result = await db.recruitment_portal.users.insert_one(user_data)
     user_data["id"] = str(result.inserted_id)
+    await bump_versions(db, "users")
     
     # Create access token
     access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
@@ -95,8 +112,8 @@ class LoginRequest(BaseModel):
 async def login(login_data: LoginRequest):
     db = await get_database()
     
-    user = await db.recruitment_portal.users.find_one({"email": login_data.email})
-    if not user or not verify_password(login_data.password, user["password"]):
+    user = await db.recruitment_portal.users.find_one({"email": login_data.email}, {"email": 1, "password": 1})
+    if not user or not await verify_password(login_data.password, user["password"]):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect email or password",
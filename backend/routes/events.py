@@ -0,0 +1,43 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from routes.auth import create_stream_token, get_current_user, get_current_user_from_stream_token
+from config import settings
+from events import broker
+from responses import dumps
+
+router = APIRouter(prefix="/events", tags=["Events"])
+
+async def _event_stream(request: Request, principal: dict):
+    # Subscribe only once the body starts: a client gone before then never runs the finally below
+    subscription = broker.subscribe(principal)
+    try:
+        # Tell EventSource how long to wait before reconnecting
+        yield "retry: 5000\n\n"
+        while True:
+            batch = await subscription.next_batch(settings.EVENT_HEARTBEAT_SECONDS)
+            if await request.is_disconnected():
+                break
+            if batch is None:
+                # Comment lines keep proxies from closing idle connections
+                yield ": keepalive\n\n"
+                continue
+            yield f"event: changes\ndata: {dumps(batch).decode()}\n\n"
+    finally:
+        broker.unsubscribe(subscription)
+
+@router.post("/token")
+async def issue_stream_token(current_user: dict = Depends(get_current_user)):
+    """Exchange the bearer token for a short-lived one that can only open /events/stream"""
+    return {
+        "stream_token": create_stream_token(current_user["email"]),
+        "expires_in": settings.STREAM_TOKEN_EXPIRE_SECONDS
+    }
+
+@router.get("/stream")
+async def stream_events(request: Request, current_user: dict = Depends(get_current_user_from_stream_token)):
+    """Server-sent change events scoped to the caller: everything for admins, assigned jobs for HR"""
+    return StreamingResponse(
+        _event_stream(request, current_user),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,30 @@
+from fastapi import APIRouter
+from pymongo.errors import PyMongoError
+from config import settings
+from database import ping
+from pool_metrics import pool_metrics
+from responses import json_response
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+@router.get("/live")
+async def liveness():
+    """The process is up; deliberately touches nothing external"""
+    return {"status": "ok"}
+
+@router.get("/ready")
+async def readiness():
+    """Ready to take traffic: MongoDB answers a ping within READY_MAX_PING_MS"""
+    try:
+        ping_ms = round(await ping() * 1000, 2)
+    except PyMongoError as exc:
+        return json_response({"status": "unavailable", "detail": f"MongoDB ping failed: {exc}"}, status_code=503)
+    
+    ready = ping_ms <= settings.READY_MAX_PING_MS
+    content = {
+        "status": "ok" if ready else "degraded",
+        "mongo_ping_ms": ping_ms,
+        "max_ping_ms": settings.READY_MAX_PING_MS,
+        "pool": pool_metrics.stats()
+    }
+    return json_response(content, status_code=200 if ready else 503)
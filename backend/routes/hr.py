@@ -1,36 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException
-from datetime import datetime
-from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from typing import Optional
 from routes.auth import get_current_hr_user
-from database import get_database
+from database import get_database, get_reader
+from dashboards import get_hr_dashboard_counts
+from pagination import PageParams, fetch_page
+from projections import CandidateListResponse, CandidateViewParams
+from search import CandidateSearchParams, build_candidate_filter
+from candidate_schema import upgrade_candidates
+from loaders import ReferenceLoader
+from responses import json_response, with_public_ids
+from status_updates import apply_status_change
+from change_versions import bump_versions
+from etags import conditional_get
+from events import CANDIDATE_STATUS_CHANGED, make_event, publish_events
+from matching import match_index
 
 router = APIRouter(prefix="/hr", tags=["HR"])
 
 @router.get("/jobs")
 async def get_hr_jobs(
+    response: Response,
     status: Optional[str] = None,
-    current_user: dict = Depends(get_current_hr_user)
+    page: PageParams = Depends(),
+    current_user: dict = Depends(get_current_hr_user),
+    etag: str = Depends(conditional_get("jobs", reads="lists"))
 ):
-    db = await get_database()
+    reader = await get_reader("lists")
     
     # Build filter query
     filter_query = {"assigned_hr": str(current_user["_id"])}
     if status:
         filter_query["status"] = status
     
-    jobs = await db.recruitment_portal.jobs.find(filter_query).sort("created_at", -1).to_list(length=100)
-    
-    for job in jobs:
-        job["id"] = str(job["_id"])
-        del job["_id"]
-        # Convert datetime fields to ISO format for JSON serialization
-        if "created_at" in job and isinstance(job["created_at"], datetime):
-            job["created_at"] = job["created_at"].isoformat()
-        if "opening_date" in job and isinstance(job["opening_date"], datetime):
-            job["opening_date"] = job["opening_date"].isoformat()
+    jobs = await fetch_page(reader.recruitment_portal.jobs, filter_query, page, response)
     
-    return jobs
+    return json_response(with_public_ids(jobs), response)
 
 @router.put("/jobs/{job_id}/status")
 async def update_job_status(
@@ -49,14 +53,23 @@ async def update_job_status(
     if result.modified_count == 0:
         raise HTTPException(status_code=404, detail="Job not found or not allocated to you")
     
+    # A closed job drops out of candidate matching
+    match_index.job_changed(job_id)
+    await bump_versions(db, "jobs")
+    
     return {"message": "Job status updated successfully"}
 
-@router.get("/candidates/{job_id}")
+@router.get("/candidates/{job_id}", response_model=CandidateListResponse)
 async def get_candidates_for_job(
     job_id: str,
-    current_user: dict = Depends(get_current_hr_user)
+    response: Response,
+    page: PageParams = Depends(),
+    view: CandidateViewParams = Depends(),
+    current_user: dict = Depends(get_current_hr_user),
+    etag: str = Depends(conditional_get("candidates", "jobs", reads="lists"))
 ):
     db = await get_database()
+    reader = await get_reader("lists")
     
     # Verify job is allocated to this HR
     job = await db.recruitment_portal.jobs.find_one({
@@ -67,15 +80,9 @@ async def get_candidates_for_job(
     if not job:
         raise HTTPException(status_code=404, detail="Job not found or not allocated to you")
     
-    candidates = await db.recruitment_portal.candidates.find({"job_id": job_id}).to_list(length=100)
+    candidates = await fetch_page(reader.recruitment_portal.candidates, {"job_id": job_id}, page, response, projection=view.projection)
     
-    for candidate in candidates:
-        candidate["id"] = str(candidate["_id"])
-        del candidate["_id"]
-        # Convert datetime fields to ISO format for JSON serialization
-        if "created_at" in candidate and isinstance(candidate["created_at"], datetime):
-            candidate["created_at"] = candidate["created_at"].isoformat()
-        
+    for candidate in with_public_ids(upgrade_candidates(candidates)):
         # Add job title information
         if candidate.get("job_id"):
             candidate["job_title"] = job.get("title")
@@ -84,74 +91,61 @@ async def get_candidates_for_job(
             if not candidate.get("role_applied_for"):
                 candidate["role_applied_for"] = job.get("title")
     
-    return candidates
+    return json_response(candidates, response)
 
 @router.put("/candidates/{candidate_id}/status")
 async def update_candidate_status(
     candidate_id: str,
     status: str,
     notes: Optional[str] = None,
+    expected_status: Optional[str] = None,
     current_user: dict = Depends(get_current_hr_user)
 ):
     db = await get_database()
     
-    # Get candidate and verify job is allocated to this HR
-    candidate = await db.recruitment_portal.candidates.find_one({"_id": ObjectId(candidate_id)})
-    if not candidate:
-        raise HTTPException(status_code=404, detail="Candidate not found")
-    
-    job = await db.recruitment_portal.jobs.find_one({
-        "job_id": candidate["job_id"],
-        "assigned_hr": str(current_user["_id"])
-    })
-    
-    if not job:
-        raise HTTPException(status_code=403, detail="Not authorized to update this candidate")
-    
-    old_status = candidate["status"]
-    
-    # Update candidate status
-    await db.recruitment_portal.candidates.update_one(
-        {"_id": ObjectId(candidate_id)},
-        {"$set": {
-            "status": status,
-            "notes": notes,
-            "last_updated_by": str(current_user["_id"])
-        }}
-    )
-    
-    # Add to history
-    history_entry = {
-        "candidate_id": candidate_id,
-        "job_id": candidate["job_id"],
-        "old_status": old_status,
-        "new_status": status,
-        "updated_by": str(current_user["_id"]),
-        "timestamp": datetime.utcnow(),
-        "comment": notes
-    }
-    
-    await db.recruitment_portal.application_history.insert_one(history_entry)
+    # Job ownership is read fresh and made part of the update filter, then one history insert
+    change = await apply_status_change(db, candidate_id, status, notes, current_user, expected_status, owner_scope=True)
+    await bump_versions(db, "candidates", "application_history")
+    await publish_events([make_event(
+        CANDIDATE_STATUS_CHANGED,
+        job_id=change["job_id"],
+        hr_id=str(current_user["_id"]),
+        candidate_id=candidate_id,
+        status=status
+    )])
     
     return {"message": "Candidate status updated successfully"}
 
-@router.get("/candidates")
-async def get_all_hr_candidates(current_user: dict = Depends(get_current_hr_user)):
+@router.get("/candidates", response_model=CandidateListResponse)
+async def get_all_hr_candidates(
+    response: Response,
+    page: PageParams = Depends(),
+    search: CandidateSearchParams = Depends(),
+    view: CandidateViewParams = Depends(),
+    current_user: dict = Depends(get_current_hr_user),
+    etag: str = Depends(conditional_get("candidates", "jobs", reads="lists"))
+):
     db = await get_database()
+    reader = await get_reader("lists")
     
-    # Get jobs allocated to this HR
-    jobs = await db.recruitment_portal.jobs.find({"assigned_hr": str(current_user["_id"])}).to_list(length=100)
+    # Get jobs allocated to this HR - only the IDs are needed for scoping
+    jobs = await db.recruitment_portal.jobs.find(
+        {"assigned_hr": str(current_user["_id"])},
+        {"_id": 0, "job_id": 1}
+    ).to_list(length=None)
     job_id_list = [job["job_id"] for job in jobs]
-    job_map = {job["job_id"]: job["title"] for job in jobs}
-    
-    candidates = await db.recruitment_portal.candidates.find({"job_id": {"$in": job_id_list}}).to_list(length=100)
-    for candidate in candidates:
-        candidate["id"] = str(candidate["_id"])
-        del candidate["_id"]
-        # Convert datetime fields to ISO format for JSON serialization
-        if "created_at" in candidate and isinstance(candidate["created_at"], datetime):
-            candidate["created_at"] = candidate["created_at"].isoformat()
-        
+    
+    # A job_id filter can only narrow the HR's own scope
+    if search.job_id:
+        job_id_list = [search.job_id] if search.job_id in job_id_list else []
+        search.job_id = None
+    
+    filter_query = build_candidate_filter(search, {"job_id": {"$in": job_id_list}})
+    candidates = await fetch_page(reader.recruitment_portal.candidates, filter_query, page, response, projection=view.projection)
+    
+    # Resolve titles only for the jobs referenced on this page
+    job_map = await ReferenceLoader(db).job_titles(candidate.get("job_id") for candidate in candidates)
+    for candidate in with_public_ids(upgrade_candidates(candidates)):
         # Add job title information
         if candidate.get("job_id"):
             candidate["applied_for"] = job_map.get(candidate["job_id"], "Unknown Job")
@@ -163,36 +157,13 @@ async def get_all_hr_candidates(current_user: dict = Depends(get_current_hr_user
             if not candidate.get("role_applied_for"):
                 candidate["role_applied_for"] = job_map.get(candidate["job_id"], "Unknown Job")
     
-    return candidates
+    return json_response(candidates, response)
 
 @router.get("/dashboard")
-async def get_hr_dashboard(current_user: dict = Depends(get_current_hr_user)):
-    db = await get_database()
-    # Get job counts
-    total_jobs = await db.recruitment_portal.jobs.count_documents({"assigned_hr": str(current_user["_id"])})
-    open_jobs = await db.recruitment_portal.jobs.count_documents({"assigned_hr": str(current_user["_id"]), "status": "open"})
-    closed_jobs = await db.recruitment_portal.jobs.count_documents({"assigned_hr": str(current_user["_id"]), "status": "closed"})
-    allocated_jobs = await db.recruitment_portal.jobs.count_documents({"assigned_hr": str(current_user["_id"]), "status": "allocated"})
-    submitted_jobs = await db.recruitment_portal.jobs.count_documents({"assigned_hr": str(current_user["_id"]), "status": "submit"})
-    # Get candidate counts using job_id (string)
-    jobs = await db.recruitment_portal.jobs.find({"assigned_hr": str(current_user["_id"])}).to_list(length=100)
-    job_id_list = [job["job_id"] for job in jobs]
-    total_candidates = await db.recruitment_portal.candidates.count_documents({"job_id": {"$in": job_id_list}})
-    selected_candidates = await db.recruitment_portal.candidates.count_documents({"job_id": {"$in": job_id_list}, "status": "selected"})
-    rejected_candidates = await db.recruitment_portal.candidates.count_documents({"job_id": {"$in": job_id_list}, "status": "rejected"})
-    in_progress_candidates = await db.recruitment_portal.candidates.count_documents({"job_id": {"$in": job_id_list}, "status": "in_progress"})
-    interviewed_candidates = await db.recruitment_portal.candidates.count_documents({"job_id": {"$in": job_id_list}, "status": "interviewed"})
-    applied_candidates = await db.recruitment_portal.candidates.count_documents({"job_id": {"$in": job_id_list}, "status": "applied"})
-    return {
-        "total_jobs": total_jobs,
-        "open_jobs": open_jobs,
-        "closed_jobs": closed_jobs,
-        "allocated_jobs": allocated_jobs,
-        "submitted_jobs": submitted_jobs,
-        "total_candidates": total_candidates,
-        "selected_candidates": selected_candidates,
-        "rejected_candidates": rejected_candidates,
-        "in_progress_candidates": in_progress_candidates,
-        "interviewed_candidates": interviewed_candidates,
-        "applied_candidates": applied_candidates
-    } 
\ No newline at end of file
+async def get_hr_dashboard(
+    request: Request,
+    current_user: dict = Depends(get_current_hr_user),
+    etag: str = Depends(conditional_get("jobs", "candidates", reads="dashboards"))
+):
+    reader = await get_reader("dashboards")
+    return await get_hr_dashboard_counts(reader, str(current_user["_id"]), version=request.state.data_version)
\ No newline at end of file
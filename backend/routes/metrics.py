@@ -0,0 +1,10 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+from metrics import render_metrics
+
+router = APIRouter(tags=["Metrics"])
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Prometheus scrape endpoint: request latency, Mongo command latency and pool checkout waits"""
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
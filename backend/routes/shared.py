@@ -1,50 +1,132 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from datetime import datetime
 from bson import ObjectId
 from typing import Optional
-from models import CandidateCreate, CandidateUpdate
+from models import CandidateCreate, CandidateUpdate, CandidateStatusBatch
 from routes.auth import get_current_user, get_current_admin_user, get_current_hr_user
 from database import get_database
+from pagination import PageParams, fetch_page
+from loaders import ReferenceLoader
 from fastapi.responses import JSONResponse
+from responses import json_response, with_public_id, with_public_ids
+from status_updates import apply_status_batch, apply_status_change
+from candidate_updates import diff_candidate, requested_changes, update_document
+from candidate_schema import new_candidate, related_fields, upgrade_candidate
+from candidate_identity import IDENTITY_FIELD, find_matches
+from config import settings
+from change_versions import bump_versions
+from etags import conditional_get
+from events import CANDIDATE_CREATED, make_event, publish_events, publish_status_changes
+from matching import match_index
+from projections import CANDIDATE_SUMMARY_PROJECTION
+from resumes import DOCX_MEDIA_TYPE, render_resume, resume_executor, resume_filename
 
 router = APIRouter(tags=["Shared"])
 
 @router.get("/jobs/{job_id}")
-async def get_job_details(job_id: str, current_user: dict = Depends(get_current_user)):
+async def get_job_details(
+    job_id: str,
+    response: Response,
+    current_user: dict = Depends(get_current_user),
+    etag: str = Depends(conditional_get("jobs"))
+):
     db = await get_database()
     job = await db.recruitment_portal.jobs.find_one({"_id": ObjectId(job_id)})
     
     if not job:
         raise HTTPException(status_code=404, detail="Job not found")
     
-    job["id"] = str(job["_id"])
-    del job["_id"]
+    return json_response(with_public_id(job), response)
+
+MATCHED_JOB_PROJECTION = {"job_id": 1, "title": 1, "location": 1, "source_company": 1, "status": 1, "assigned_hr": 1}
+
+async def _ranked(collection, matches: list, projection: dict) -> list:
+    """Load the ranked documents in one read and return them in rank order with their scores"""
+    documents = {
+        document["_id"]: document
+        async for document in collection.find({"_id": {"$in": [ObjectId(key) for key, _, _ in matches]}}, projection)
+    }
+    ranked = []
+    for key, score, terms in matches:
+        document = documents.get(ObjectId(key))
+        if document:
+            ranked.append({**with_public_id(document), "score": round(score, 4), "matched_terms": terms})
+    return ranked
+
+@router.get("/jobs/{job_id}/matches")
+async def get_job_matches(
+    job_id: str,
+    k: int = Query(50, ge=1, le=500),
+    current_user: dict = Depends(get_current_user)
+):
+    """Candidates ranked by TF-IDF similarity between their skills and the job's title and description"""
+    db = await get_database()
+    matches = await match_index.matches_for_job(db, ObjectId(job_id), k)
+    
+    if matches is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+    
+    return json_response(await _ranked(db.recruitment_portal.candidates, matches, CANDIDATE_SUMMARY_PROJECTION))
+
+@router.get("/candidates/{candidate_id}/matching-jobs")
+async def get_matching_jobs(
+    candidate_id: str,
+    k: int = Query(50, ge=1, le=500),
+    current_user: dict = Depends(get_current_user)
+):
+    """Open jobs ranked by TF-IDF similarity to the candidate's skills"""
+    db = await get_database()
+    matches = await match_index.jobs_for_candidate(db, ObjectId(candidate_id), k)
+    
+    if matches is None:
+        raise HTTPException(status_code=404, detail="Candidate not found")
     
-    return job
+    return json_response(await _ranked(db.recruitment_portal.jobs, matches, MATCHED_JOB_PROJECTION))
 
 @router.get("/candidates/{candidate_id}")
-async def get_candidate_details(candidate_id: str, current_user: dict = Depends(get_current_user)):
+async def get_candidate_details(
+    candidate_id: str,
+    response: Response,
+    current_user: dict = Depends(get_current_user),
+    etag: str = Depends(conditional_get("candidates", "jobs"))
+):
     db = await get_database()
     candidate = await db.recruitment_portal.candidates.find_one({"_id": ObjectId(candidate_id)})
     
     if not candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
+    upgrade_candidate(candidate)
     
     # Get job information if job_id exists
     if candidate.get("job_id"):
-        job = await db.recruitment_portal.jobs.find_one({"job_id": candidate["job_id"]})
-        if job:
-            candidate["job_title"] = job.get("title")
+        job_titles = await ReferenceLoader(db).job_titles([candidate["job_id"]])
+        if candidate["job_id"] in job_titles:
+            job_title = job_titles[candidate["job_id"]]
+            candidate["job_title"] = job_title
             # Ensure title_position and role_applied_for are set to job title if not already set
             if not candidate.get("title_position"):
-                candidate["title_position"] = job.get("title")
+                candidate["title_position"] = job_title
             if not candidate.get("role_applied_for"):
-                candidate["role_applied_for"] = job.get("title")
+                candidate["role_applied_for"] = job_title
     
-    candidate["id"] = str(candidate["_id"])
-    del candidate["_id"]
+    return json_response(with_public_id(candidate), response)
+
+@router.get("/candidates/{candidate_id}/resume.docx")
+async def get_candidate_resume(candidate_id: str, current_user: dict = Depends(get_current_user)):
+    """The candidate rendered into the client resume template"""
+    db = await get_database()
+    candidate = await db.recruitment_portal.candidates.find_one({"_id": ObjectId(candidate_id)})
     
-    return candidate
+    if not candidate:
+        raise HTTPException(status_code=404, detail="Candidate not found")
+    
+    # Rendering runs in a worker process; the event loop only waits for the bytes
+    document = await resume_executor.run(render_resume, candidate)
+    return Response(
+        content=document,
+        media_type=DOCX_MEDIA_TYPE,
+        headers={"Content-Disposition": f'attachment; filename="{resume_filename(candidate)}"'}
+    )
 
 @router.post("/candidates")
 async def create_candidate(candidate: CandidateCreate, current_user: dict = Depends(get_current_user)):
@@ -68,8 +150,24 @@ async def create_candidate(candidate: CandidateCreate, current_user: dict = Depe
     candidate_data["job_title"] = job.get("title")
     candidate_data["title_position"] = job.get("title")
     candidate_data["role_applied_for"] = job.get("title")
+    new_candidate(candidate_data)
+    
+    # Flagged rather than rejected: the same person may legitimately apply for several jobs
+    duplicates = await find_matches(
+        db.recruitment_portal.candidates,
+        candidate_data.get(IDENTITY_FIELD, []),
+        settings.DUPLICATE_MATCH_LIMIT
+    )
     
     result = await db.recruitment_portal.candidates.insert_one(candidate_data)
+    match_index.candidate_changed(str(result.inserted_id))
+    await bump_versions(db, "candidates")
+    await publish_events([make_event(
+        CANDIDATE_CREATED,
+        job_id=candidate_data["job_id"],
+        hr_id=str(current_user["_id"]),
+        candidate_id=str(result.inserted_id)
+    )])
     candidate_data["id"] = str(result.inserted_id)
     # Remove MongoDB _id if present
     candidate_data.pop("_id", None)
@@ -80,9 +178,23 @@ async def create_candidate(candidate: CandidateCreate, current_user: dict = Depe
     
     return JSONResponse(status_code=201, content={
         "message": "Candidate added successfully",
-        "candidate": response_data
+        "candidate": response_data,
+        "possible_duplicates": duplicates
     })
 
+# Declared before PUT /candidates/{candidate_id} so "status:batch" isn't taken as an ID
+@router.put("/candidates/status:batch")
+async def update_candidate_status_batch(batch: CandidateStatusBatch, current_user: dict = Depends(get_current_user)):
+    db = await get_database()
+    result = await apply_status_batch(db, batch.candidate_ids, batch.status, batch.notes, current_user)
+    if result["updated"]:
+        await bump_versions(db, "candidates", "application_history")
+        await publish_status_changes(db, [
+            {"candidate_id": item["candidate_id"], "job_id": item["job_id"], "status": batch.status}
+            for item in result["results"] if item["result"] == "updated"
+        ])
+    return result
+
 @router.put("/candidates/{candidate_id}")
 async def update_candidate(
     candidate_id: str,
@@ -91,83 +203,64 @@ async def update_candidate(
 ):
     db = await get_database()
     
-    # Get the current candidate to preserve job_id if not provided in update
-    current_candidate = await db.recruitment_portal.candidates.find_one({"_id": ObjectId(candidate_id)})
+    requested = requested_changes(candidate_update)
+    
+    # Read back only the fields being edited, to diff against
+    current_candidate = await db.recruitment_portal.candidates.find_one(
+        {"_id": ObjectId(candidate_id)},
+        {field: 1 for field in related_fields(requested)} or {"_id": 1}
+    )
     if not current_candidate:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
-    # Prepare update data, preserving job_id if not provided
-    update_data = candidate_update.model_dump()
-    if not update_data.get("job_id"):
-        update_data["job_id"] = current_candidate.get("job_id")
-    
-    # Preserve existing values for required fields if not provided in update
-    if not update_data.get("name"):
-        update_data["name"] = current_candidate.get("name")
-    if not update_data.get("email"):
-        update_data["email"] = current_candidate.get("email")
-    if not update_data.get("phone"):
-        update_data["phone"] = current_candidate.get("phone")
-    
-    # Remove None values to avoid overwriting with None
-    update_data = {k: v for k, v in update_data.items() if v is not None}
+    to_set, to_unset = diff_candidate(requested, current_candidate)
+    if not to_set and not to_unset:
+        # Nothing changed: no write, no oplog entry, no cache invalidation
+        return {"message": "No changes to candidate", "updated_fields": []}
     
     result = await db.recruitment_portal.candidates.update_one(
         {"_id": ObjectId(candidate_id)},
-        {"$set": update_data}
+        update_document(to_set, to_unset)
     )
     
     if result.matched_count == 0:
         raise HTTPException(status_code=404, detail="Candidate not found")
     
-    return {"message": "Candidate updated successfully"}
+    match_index.candidate_changed(candidate_id)
+    await bump_versions(db, "candidates")
+    
+    return {"message": "Candidate updated successfully", "updated_fields": sorted([*to_set, *to_unset])}
 
 @router.put("/candidates/{candidate_id}/status")
 async def update_candidate_status(
     candidate_id: str,
     status: str,
     notes: Optional[str] = None,
+    expected_status: Optional[str] = None,
     current_user: dict = Depends(get_current_user)
 ):
     db = await get_database()
-    candidate = await db.recruitment_portal.candidates.find_one({"_id": ObjectId(candidate_id)})
-    if not candidate:
-        raise HTTPException(status_code=404, detail="Candidate not found")
     # Allow both admin and HR to update status, no job HR restriction
-    old_status = candidate.get("status", "")
-    await db.recruitment_portal.candidates.update_one(
-        {"_id": ObjectId(candidate_id)},
-        {"$set": {
-            "status": status,
-            "notes": notes,
-            "last_updated_by": str(current_user["_id"])
-        }}
-    )
-    # Add to history
-    history_entry = {
-        "candidate_id": candidate_id,
-        "job_id": candidate["job_id"],
-        "old_status": old_status,
-        "new_status": status,
-        "updated_by": str(current_user["_id"]),
-        "timestamp": datetime.utcnow(),
-        "comment": notes
-    }
-    await db.recruitment_portal.application_history.insert_one(history_entry)
+    change = await apply_status_change(db, candidate_id, status, notes, current_user, expected_status)
+    await bump_versions(db, "candidates", "application_history")
+    await publish_status_changes(db, [{"candidate_id": candidate_id, "job_id": change["job_id"], "status": status}])
     return {"message": "Candidate status updated successfully"}
 
 @router.get("/application-history/{candidate_id}")
-async def get_application_history(candidate_id: str, current_user: dict = Depends(get_current_user)):
+async def get_application_history(
+    candidate_id: str,
+    response: Response,
+    page: PageParams = Depends(),
+    current_user: dict = Depends(get_current_user),
+    etag: str = Depends(conditional_get("application_history"))
+):
     db = await get_database()
-    history = await db.recruitment_portal.application_history.find(
-        {"candidate_id": candidate_id}
-    ).sort("timestamp", -1).to_list(length=100)
-    
-    for entry in history:
-        entry["id"] = str(entry["_id"])
-        del entry["_id"]
-        # Convert datetime to ISO format for JSON serialization
-        if "timestamp" in entry and isinstance(entry["timestamp"], datetime):
-            entry["timestamp"] = entry["timestamp"].isoformat()
-    
-    return history 
\ No newline at end of file
+    history = await fetch_page(
+        db.recruitment_portal.application_history,
+        {"candidate_id": candidate_id},
+        page,
+        response,
+        sort_field="timestamp"
+    )
+    
+    return json_response(with_public_ids(history), response)
\ No newline at end of file
@@ -0,0 +1,162 @@
+import asyncio
+import logging
+import os
+import socket
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+from bson import BSON
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+from config import settings
+from database import get_database
+from candidate_schema import CURRENT_SCHEMA_VERSION, LEGACY_SCHEMA_VERSIONS, SCHEMA_VERSION_FIELD, stored_candidate
+from candidate_updates import update_document
+
+logger = logging.getLogger(__name__)
+
+MIGRATION_STATE_ID = f"candidate_schema_v{CURRENT_SCHEMA_VERSION}"
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+BACKLOG_QUERY = {SCHEMA_VERSION_FIELD: {"$in": LEGACY_SCHEMA_VERSIONS}}
+
+_worker_task: Optional[asyncio.Task] = None
+
+async def _acquire_lease(db, now: datetime):
+    """Only one process migrates at a time; the lease is renewed after every batch"""
+    try:
+        return await db.recruitment_portal.migration_state.find_one_and_update(
+            {
+                "_id": MIGRATION_STATE_ID,
+                "$or": [
+                    {"lease_owner": WORKER_ID},
+                    {"lease_expires": None},
+                    {"lease_expires": {"$lt": now}}
+                ]
+            },
+            {"$set": {
+                "lease_owner": WORKER_ID,
+                "lease_expires": now + timedelta(seconds=settings.MIGRATION_LEASE_SECONDS)
+            }},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
+        return None
+
+def _plan(document: dict):
+    """Return (UpdateOne, bytes saved) that moves one stored document to the current layout"""
+    upgraded = stored_candidate(dict(document))
+    upgraded[SCHEMA_VERSION_FIELD] = CURRENT_SCHEMA_VERSION
+    to_set = {field: value for field, value in upgraded.items() if field != "_id" and document.get(field, ...) != value}
+    to_unset = {field: "" for field in document if field not in upgraded}
+
+    # Touched fields must still hold what was read; a concurrent edit makes the update miss
+    # and the document waits for the next pass instead of being overwritten
+    guard = {"_id": document["_id"]}
+    for field in (*to_set, *to_unset):
+        guard[field] = document[field] if field in document else {"$exists": False}
+    saved = len(BSON.encode(document)) - len(BSON.encode(upgraded))
+    return UpdateOne(guard, update_document(to_set, to_unset)), saved
+
+async def migrate_candidates(db, batch_size: Optional[int] = None, ops_per_second: Optional[int] = None) -> int:
+    """Rewrite legacy candidates in _id order from the stored resume point, at most ops_per_second writes"""
+    batch_size = batch_size or settings.MIGRATION_BATCH_SIZE
+    ops_per_second = settings.MIGRATION_OPS_PER_SECOND if ops_per_second is None else ops_per_second
+
+    state = await _acquire_lease(db, datetime.utcnow())
+    if state is None:
+        return 0
+
+    last_id = state.get("last_id")
+    migrated = 0
+    while True:
+        started = time.perf_counter()
+        query = {**BACKLOG_QUERY, "_id": {"$gt": last_id}} if last_id else BACKLOG_QUERY
+        documents = await db.recruitment_portal.candidates.find(query).sort("_id", 1).limit(batch_size).to_list(length=batch_size)
+        now = datetime.utcnow()
+        if not documents:
+            # End of a pass; the next run starts over to pick up documents skipped under contention
+            await db.recruitment_portal.migration_state.update_one(
+                {"_id": MIGRATION_STATE_ID, "lease_owner": WORKER_ID},
+                {"$set": {"last_id": None, "completed_at": now, "last_run_at": now, "lease_expires": None}, "$inc": {"passes": 1}}
+            )
+            break
+
+        planned = {document["_id"]: _plan(document) for document in documents}
+        result = await db.recruitment_portal.candidates.bulk_write([update for update, _ in planned.values()], ordered=False)
+        skipped = []
+        if result.matched_count < len(planned):
+            skipped = await db.recruitment_portal.candidates.distinct(
+                "_id", {**BACKLOG_QUERY, "_id": {"$in": list(planned)}}
+            )
+        bytes_saved = sum(saved for document_id, (_, saved) in planned.items() if document_id not in skipped)
+
+        # The resume point only moves after the batch is written, so a crash replays at most one batch
+        last_id = documents[-1]["_id"]
+        migrated += len(planned) - len(skipped)
+        renewed = await db.recruitment_portal.migration_state.update_one(
+            {"_id": MIGRATION_STATE_ID, "lease_owner": WORKER_ID},
+            {
+                "$set": {
+                    "last_id": last_id,
+                    "last_run_at": now,
+                    "lease_expires": now + timedelta(seconds=settings.MIGRATION_LEASE_SECONDS)
+                },
+                "$inc": {"migrated": len(planned) - len(skipped), "skipped": len(skipped), "bytes_saved": bytes_saved}
+            }
+        )
+        if renewed.matched_count == 0:
+            # Lease expired and another worker took over
+            break
+
+        # Throttle to the configured write rate so foreground traffic keeps its share of the cluster
+        if ops_per_second > 0:
+            remaining = len(documents) / ops_per_second - (time.perf_counter() - started)
+            if remaining > 0:
+                await asyncio.sleep(remaining)
+
+    return migrated
+
+async def migration_status(db) -> dict:
+    state = await db.recruitment_portal.migration_state.find_one({"_id": MIGRATION_STATE_ID}) or {}
+    return {
+        "schema_version": CURRENT_SCHEMA_VERSION,
+        "migrated": state.get("migrated", 0),
+        "skipped": state.get("skipped", 0),
+        "bytes_saved": state.get("bytes_saved", 0),
+        "remaining": await db.recruitment_portal.candidates.count_documents(BACKLOG_QUERY),
+        "passes": state.get("passes", 0),
+        "resume_after": str(state["last_id"]) if state.get("last_id") else None,
+        "last_run_at": state.get("last_run_at"),
+        "completed_at": state.get("completed_at"),
+        "lease_owner": state.get("lease_owner"),
+        "ops_per_second": settings.MIGRATION_OPS_PER_SECOND
+    }
+
+async def _run_worker():
+    while True:
+        try:
+            db = await get_database()
+            migrated = await migrate_candidates(db)
+            if migrated:
+                logger.info(f"Migrated {migrated} candidates to schema v{CURRENT_SCHEMA_VERSION}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            logger.error(f"Candidate schema migration failed: {str(exc)}", exc_info=True)
+        await asyncio.sleep(settings.MIGRATION_INTERVAL_SECONDS)
+
+def start_migration_worker():
+    global _worker_task
+    if settings.MIGRATION_INTERVAL_SECONDS > 0 and _worker_task is None:
+        _worker_task = asyncio.create_task(_run_worker())
+
+async def stop_migration_worker():
+    global _worker_task
+    if _worker_task is not None:
+        _worker_task.cancel()
+        try:
+            await _worker_task
+        except asyncio.CancelledError:
+            pass
+        _worker_task = None
@@ -0,0 +1,101 @@
+import re
+from datetime import datetime
+from typing import Optional
+from fastapi import HTTPException, Query
+
+class CandidateSearchParams:
+    """Server-side filters accepted by the candidate list endpoints"""
+
+    def __init__(
+        self,
+        q: Optional[str] = Query(None, description="Full-text search over name, email, phone and skills"),
+        status: Optional[str] = None,
+        job_id: Optional[str] = None,
+        location: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ):
+        self.q = q.strip() if q and q.strip() else None
+        self.status = status
+        self.job_id = job_id
+        self.location = location
+        self.created_from = created_from
+        self.created_to = created_to
+
+class JobSearchParams:
+    """Server-side filters accepted by the job list endpoints"""
+
+    def __init__(
+        self,
+        q: Optional[str] = Query(None, description="Full-text search over title, description and location"),
+        status: Optional[str] = None,
+        opening_date_from: Optional[str] = None,
+        opening_date_to: Optional[str] = None,
+        assigned_hr: Optional[str] = None,
+        location: Optional[str] = None,
+        created_from: Optional[str] = None,
+        created_to: Optional[str] = None
+    ):
+        self.q = q.strip() if q and q.strip() else None
+        self.status = status
+        self.opening_date_from = opening_date_from
+        self.opening_date_to = opening_date_to
+        self.assigned_hr = assigned_hr
+        self.location = location
+        self.created_from = created_from
+        self.created_to = created_to
+
+def _parse_date(value: str, end_of_day: bool = False) -> datetime:
+    try:
+        parsed = datetime.fromisoformat(value)
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid date: {value}")
+    if end_of_day and len(value) <= 10:
+        # Plain dates include the whole day
+        parsed = parsed.replace(hour=23, minute=59, second=59, microsecond=999999)
+    return parsed
+
+def date_range_filter(date_from: Optional[str], date_to: Optional[str]) -> Optional[dict]:
+    date_range = {}
+    if date_from:
+        date_range["$gte"] = _parse_date(date_from)
+    if date_to:
+        date_range["$lte"] = _parse_date(date_to, end_of_day=True)
+    return date_range or None
+
+def contains_filter(value: str) -> dict:
+    return {"$regex": re.escape(value.strip()), "$options": "i"}
+
+def text_filter(q: Optional[str]) -> dict:
+    return {"$text": {"$search": q}} if q else {}
+
+def build_candidate_filter(params: CandidateSearchParams, filter_query: Optional[dict] = None) -> dict:
+    filter_query = dict(filter_query or {})
+    filter_query.update(text_filter(params.q))
+    if params.status:
+        filter_query["status"] = params.status
+    if params.job_id:
+        filter_query["job_id"] = params.job_id
+    if params.location:
+        filter_query["current_location"] = contains_filter(params.location)
+    created_range = date_range_filter(params.created_from, params.created_to)
+    if created_range:
+        filter_query["created_at"] = created_range
+    return filter_query
+
+def build_job_filter(params: JobSearchParams, filter_query: Optional[dict] = None) -> dict:
+    filter_query = dict(filter_query or {})
+    filter_query.update(text_filter(params.q))
+    if params.status:
+        filter_query["status"] = params.status
+    opening_range = date_range_filter(params.opening_date_from, params.opening_date_to)
+    if opening_range:
+        filter_query["opening_date"] = opening_range
+    if params.assigned_hr:
+        filter_query["assigned_hr"] = params.assigned_hr
+    if params.location:
+        filter_query["location"] = contains_filter(params.location)
+    created_range = date_range_filter(params.created_from, params.created_to)
+    if created_range:
+        filter_query["created_at"] = created_range
+    return filter_query
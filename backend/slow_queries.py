@@ -0,0 +1,183 @@
+import asyncio
+import logging
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, Optional
+from pymongo import monitoring
+from pymongo.errors import PyMongoError
+from config import settings
+from request_context import current_route
+from responses import dumps
+
+logger = logging.getLogger(__name__)
+
+# Commands whose filter is worth recording, and where that filter lives in the command document
+SHAPE_FIELDS = {
+    "find": ("filter", "sort", "projection"),
+    "aggregate": ("pipeline",),
+    "count": ("query",),
+    "distinct": ("key", "query"),
+    "findAndModify": ("query", "sort"),
+    "update": ("updates",),
+    "delete": ("deletes",)
+}
+
+# Driver and session fields that explain rejects or that would skew the plan
+_UNEXPLAINABLE_FIELDS = {"lsid", "txnNumber", "readConcern", "writeConcern", "autocommit", "startTransaction"}
+
+def normalize_shape(value):
+    """Keep field names and operators, replace every literal with '?' and collapse lists to one element"""
+    if isinstance(value, dict):
+        return {key: normalize_shape(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        # $in: [a, b, c] and [x] share a shape; pipelines keep every stage
+        if value and all(isinstance(item, dict) for item in value):
+            return [normalize_shape(item) for item in value]
+        return ["?"] if value else []
+    return "?"
+
+def command_shape(command_name: str, command: dict) -> dict:
+    shape = {}
+    for field in SHAPE_FIELDS.get(command_name, ()):
+        if field not in command:
+            continue
+        if field == "key":
+            shape[field] = command[field]
+        elif field in ("updates", "deletes"):
+            # Only the filter of each statement matters for the plan
+            shape[field] = [normalize_shape(statement.get("q", {})) for statement in command[field][:1]]
+        else:
+            shape[field] = normalize_shape(command[field])
+    return shape
+
+def _summarize_explain(explain: dict) -> dict:
+    stats = explain.get("executionStats", {})
+    planner = explain.get("queryPlanner", {})
+    if not planner and explain.get("stages"):
+        # Aggregates report the $cursor stage's planner output first
+        cursor_stage = explain["stages"][0].get("$cursor", {})
+        planner = cursor_stage.get("queryPlanner", {})
+        stats = cursor_stage.get("executionStats", stats)
+    return {
+        "winning_plan": planner.get("winningPlan"),
+        "n_returned": stats.get("nReturned"),
+        "total_keys_examined": stats.get("totalKeysExamined"),
+        "total_docs_examined": stats.get("totalDocsExamined"),
+        "execution_time_ms": stats.get("executionTimeMillis")
+    }
+
+class SlowQueryLog(monitoring.CommandListener):
+    """Records commands slower than SLOW_QUERY_THRESHOLD_MS with their query shape and originating route"""
+
+    def __init__(self, ring_size: int, max_shapes: int):
+        self.entries = deque(maxlen=ring_size)
+        self.shapes: Dict[str, dict] = {}
+        self.max_shapes = max_shapes
+        self._started: Dict[tuple, tuple] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._client = None
+        self._explains = set()
+
+    def attach(self, client, loop: asyncio.AbstractEventLoop):
+        # Explains run on the event loop with this client; listeners fire on driver threads
+        self._client = client
+        self._loop = loop
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+            self.shapes.clear()
+
+    @staticmethod
+    def _key(event) -> tuple:
+        return (event.connection_id, event.request_id)
+
+    def started(self, event):
+        if event.command_name not in SHAPE_FIELDS or settings.SLOW_QUERY_THRESHOLD_MS <= 0:
+            return
+        # Route is read now, while the context still belongs to the request
+        self._started[self._key(event)] = (event.command, event.database_name, current_route())
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        self._finish(event, failed=True)
+
+    def _finish(self, event, failed: bool = False):
+        started = self._started.pop(self._key(event), None)
+        if started is None:
+            return
+        duration_ms = event.duration_micros / 1000
+        if duration_ms < settings.SLOW_QUERY_THRESHOLD_MS:
+            return
+
+        command, database_name, route = started
+        collection = command.get(event.command_name)
+        shape = command_shape(event.command_name, command)
+        shape_key = f"{collection}.{event.command_name} {dumps(shape).decode()}"
+        with self._lock:
+            known = self.shapes.get(shape_key)
+            is_new = known is None and len(self.shapes) < self.max_shapes
+            if is_new:
+                known = self.shapes[shape_key] = {
+                    "collection": collection,
+                    "command": event.command_name,
+                    "shape": shape,
+                    "count": 0,
+                    "max_ms": 0.0,
+                    "routes": [],
+                    "first_seen": datetime.utcnow(),
+                    "explain": None
+                }
+            if known is not None:
+                known["count"] += 1
+                known["max_ms"] = max(known["max_ms"], duration_ms)
+                if route and route not in known["routes"]:
+                    known["routes"].append(route)
+            self.entries.append({
+                "at": datetime.utcnow(),
+                "route": route,
+                "collection": collection,
+                "command": event.command_name,
+                "shape_key": shape_key,
+                "duration_ms": round(duration_ms, 3),
+                "failed": failed
+            })
+
+        if is_new and settings.SLOW_QUERY_EXPLAIN and self._loop is not None:
+            self._loop.call_soon_threadsafe(self._schedule_explain, shape_key, database_name, command)
+
+    def _schedule_explain(self, shape_key: str, database_name: str, command: dict):
+        # Hold a reference until done; the loop only keeps weak references to tasks
+        task = asyncio.ensure_future(self._explain(shape_key, database_name, command))
+        self._explains.add(task)
+        task.add_done_callback(self._explains.discard)
+
+    async def _explain(self, shape_key: str, database_name: str, command: dict):
+        """Capture executionStats for the first occurrence of a shape; explain never applies writes"""
+        explained = {key: value for key, value in command.items() if not key.startswith("$") and key not in _UNEXPLAINABLE_FIELDS}
+        try:
+            result = await self._client[database_name].command({"explain": explained, "verbosity": "executionStats"})
+            summary = _summarize_explain(result)
+        except PyMongoError as exc:
+            logger.warning(f"Explain failed for slow query {shape_key}: {exc}")
+            summary = {"error": str(exc)}
+        with self._lock:
+            if shape_key in self.shapes:
+                self.shapes[shape_key]["explain"] = summary
+
+    def snapshot(self, limit: int) -> dict:
+        with self._lock:
+            entries = list(self.entries)[-limit:][::-1] if limit > 0 else []
+            shapes = [{"shape_key": key, **details, "routes": list(details["routes"])} for key, details in self.shapes.items()]
+        shapes.sort(key=lambda shape: shape["max_ms"], reverse=True)
+        return {
+            "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+            "entries": entries,
+            "shapes": shapes
+        }
+
+slow_query_log = SlowQueryLog(settings.SLOW_QUERY_RING_SIZE, settings.SLOW_QUERY_MAX_SHAPES)
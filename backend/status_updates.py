@@ -0,0 +1,173 @@
+from datetime import datetime
+from typing import List, Optional
+from bson import ObjectId
+from fastapi import HTTPException
+from pymongo import UpdateOne
+from config import settings
+
+async def _update_candidate_status(db, filter_query: dict, status: str, notes: Optional[str], user_id: str) -> Optional[dict]:
+    # The pre-image carries the old status atomically, so history stays right under contention
+    return await db.recruitment_portal.candidates.find_one_and_update(
+        filter_query,
+        {"$set": {"status": status, "notes": notes, "last_updated_by": user_id}},
+        projection={"job_id": 1, "status": 1}
+    )
+
+async def apply_status_change(
+    db,
+    candidate_id: str,
+    status: str,
+    notes: Optional[str],
+    current_user: dict,
+    expected_status: Optional[str] = None,
+    owner_scope: bool = False
+) -> dict:
+    """Move one candidate with find_one_and_update and record history with one insert"""
+    user_id = str(current_user["_id"])
+    filter_query = {"_id": ObjectId(candidate_id)}
+    if expected_status is not None:
+        filter_query["status"] = expected_status
+    if owner_scope:
+        # Ownership rides along in the update filter. It is read fresh on every call: a cached copy
+        # would let an HR keep editing a reassigned job's candidates in processes that missed the change
+        job_ids = await db.recruitment_portal.jobs.distinct("job_id", {"assigned_hr": user_id})
+        filter_query["job_id"] = {"$in": job_ids}
+
+    previous = await _update_candidate_status(db, filter_query, status, notes, user_id)
+    if previous is None:
+        # Only a missed update pays for working out why it missed
+        candidate = await db.recruitment_portal.candidates.find_one({"_id": filter_query["_id"]}, {"job_id": 1, "status": 1})
+        if not candidate:
+            raise HTTPException(status_code=404, detail="Candidate not found")
+        if owner_scope and candidate.get("job_id") not in job_ids:
+            raise HTTPException(status_code=403, detail="Not authorized to update this candidate")
+        if expected_status is not None:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Candidate status is '{candidate.get('status')}', expected '{expected_status}'"
+            )
+        raise HTTPException(status_code=409, detail="Candidate changed concurrently, please retry")
+
+    history_entry = {
+        "candidate_id": candidate_id,
+        "job_id": previous.get("job_id"),
+        "old_status": previous.get("status", ""),
+        "new_status": status,
+        "updated_by": user_id,
+        "timestamp": datetime.utcnow(),
+        "comment": notes
+    }
+    await db.recruitment_portal.application_history.insert_one(history_entry)
+    return history_entry
+
+async def _load_authorized(db, object_ids: List[ObjectId], current_user: dict) -> dict:
+    """Read the candidates and, for HR users, their job ownership in a single aggregate"""
+    pipeline = [
+        {"$match": {"_id": {"$in": object_ids}}},
+        {"$project": {"job_id": 1, "status": 1}}
+    ]
+    if current_user.get("role") != "admin":
+        pipeline.append({"$lookup": {
+            "from": "jobs",
+            "localField": "job_id",
+            "foreignField": "job_id",
+            "pipeline": [
+                {"$match": {"assigned_hr": str(current_user["_id"])}},
+                {"$project": {"_id": 1}}
+            ],
+            "as": "owned_job"
+        }})
+
+    candidates = {}
+    async for candidate in db.recruitment_portal.candidates.aggregate(pipeline):
+        candidate["authorized"] = current_user.get("role") == "admin" or bool(candidate.pop("owned_job", None))
+        candidates[candidate["_id"]] = candidate
+    return candidates
+
+async def apply_status_batch(db, candidate_ids: List[str], status: str, notes: Optional[str], current_user: dict) -> dict:
+    """Move many candidates to one status: one read, one bulk_write and one insert_many"""
+    # De-duplicate while keeping the caller's order for the per-item results
+    candidate_ids = list(dict.fromkeys(candidate_ids))
+    if not candidate_ids:
+        raise HTTPException(status_code=400, detail="No candidate IDs supplied")
+    if len(candidate_ids) > settings.STATUS_BATCH_MAX_SIZE:
+        raise HTTPException(status_code=400, detail=f"At most {settings.STATUS_BATCH_MAX_SIZE} candidates per batch")
+
+    object_ids = {candidate_id: ObjectId(candidate_id) for candidate_id in candidate_ids if ObjectId.is_valid(candidate_id)}
+    candidates = await _load_authorized(db, list(object_ids.values()), current_user) if object_ids else {}
+
+    user_id = str(current_user["_id"])
+    timestamp = datetime.utcnow()
+    results = []
+    planned = []
+    for candidate_id in candidate_ids:
+        candidate = candidates.get(object_ids.get(candidate_id))
+        if candidate_id not in object_ids:
+            results.append({"candidate_id": candidate_id, "result": "invalid_id"})
+        elif candidate is None:
+            results.append({"candidate_id": candidate_id, "result": "not_found"})
+        elif not candidate["authorized"]:
+            results.append({"candidate_id": candidate_id, "result": "forbidden"})
+        else:
+            result = {
+                "candidate_id": candidate_id,
+                "result": "updated",
+                "job_id": candidate.get("job_id"),
+                "old_status": candidate.get("status", "")
+            }
+            results.append(result)
+            planned.append((candidate, result))
+
+    # The status and job that were read (and authorized) ride along in each filter, so a
+    # candidate changed or moved to another job since the read is left alone
+    updates = [
+        UpdateOne(
+            {"_id": candidate["_id"], "status": candidate.get("status"), "job_id": candidate.get("job_id")},
+            {"$set": {"status": status, "notes": notes, "last_updated_by": user_id}}
+        )
+        for candidate, _ in planned
+    ]
+    if updates:
+        written = await db.recruitment_portal.candidates.bulk_write(updates, ordered=False)
+        if written.matched_count < len(updates):
+            # Only a short batch pays for re-reading which rows carry this write
+            current = {
+                candidate["_id"]: candidate
+                async for candidate in db.recruitment_portal.candidates.find(
+                    {"_id": {"$in": [candidate["_id"] for candidate, _ in planned]}},
+                    {"job_id": 1, "status": 1, "last_updated_by": 1}
+                )
+            }
+            applied = []
+            for candidate, result in planned:
+                now = current.get(candidate["_id"])
+                if now is None:
+                    result.update(result="not_found")
+                elif (now.get("status"), now.get("job_id"), now.get("last_updated_by")) == (status, candidate.get("job_id"), user_id):
+                    applied.append((candidate, result))
+                else:
+                    del result["old_status"]
+                    result.update(result="conflict", current_status=now.get("status"))
+            planned = applied
+
+    if planned:
+        await db.recruitment_portal.application_history.insert_many([
+            {
+                "candidate_id": result["candidate_id"],
+                "job_id": candidate.get("job_id"),
+                "old_status": result["old_status"],
+                "new_status": status,
+                "updated_by": user_id,
+                "timestamp": timestamp,
+                "comment": notes
+            }
+            for candidate, result in planned
+        ], ordered=False)
+
+    return {
+        "message": f"Updated {len(planned)} of {len(candidate_ids)} candidates",
+        "requested": len(candidate_ids),
+        "updated": len(planned),
+        "failed": len(candidate_ids) - len(planned),
+        "results": results
+    }
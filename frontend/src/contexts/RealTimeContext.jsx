@@ -1,4 +1,4 @@
-import React, { createContext, useContext, useState, useEffect, useCallback } from 'react'
+import React, { createContext, useContext, useState, useEffect, useCallback, useRef } from 'react'
 import { useAuth } from './AuthContext'
 import api from '../services/api'
 
@@ -20,9 +20,15 @@ export const RealTimeProvider = ({ children }) => {
   const [lastUpdate, setLastUpdate] = useState(null)
   const [isPolling, setIsPolling] = useState(false)
   const [isActive, setIsActive] = useState(true)
+  const [lastEvent, setLastEvent] = useState(null)
+  const streamOpenedRef = useRef(false)
 
   // Polling interval in milliseconds - much longer to reduce requests
   const POLLING_INTERVAL = 300000 // 5 minutes
+  // Bursts of change events are folded into one round of refetches
+  const EVENT_REFRESH_DELAY = 1000
+  // Wait before asking for a new stream token after the stream drops
+  const STREAM_RETRY_DELAY = 5000
 
   const fetchDashboardData = useCallback(async () => {
     if (!user || !isActive) return
@@ -120,12 +126,92 @@ export const RealTimeProvider = ({ children }) => {
       fetchCandidates()
     } else {
       stopPolling()
+      streamOpenedRef.current = false
       setDashboardData(null)
       setJobs([])
       setCandidates([])
     }
   }, [user, fetchDashboardData, fetchJobs, fetchCandidates, stopPolling])
 
+  // Server-pushed change feed replaces polling
+  useEffect(() => {
+    const token = localStorage.getItem('token')
+    if (!user || !token || !isActive || typeof EventSource === 'undefined') return
+
+    const pending = { jobs: false, candidates: false }
+    let refreshTimer = null
+
+    const scheduleRefresh = () => {
+      if (refreshTimer) return
+      refreshTimer = setTimeout(() => {
+        refreshTimer = null
+        fetchDashboardData()
+        if (pending.jobs) fetchJobs()
+        if (pending.candidates) fetchCandidates()
+        pending.jobs = false
+        pending.candidates = false
+      }, EVENT_REFRESH_DELAY)
+    }
+
+    let source = null
+    let reconnectTimer = null
+    let closed = false
+
+    const reconnect = () => {
+      if (!closed) reconnectTimer = setTimeout(connect, STREAM_RETRY_DELAY)
+    }
+
+    const connect = async () => {
+      let streamToken
+      try {
+        // The stream URL gets logged, so it carries a short-lived stream-only token, never the access token
+        const response = await api.post('/events/token')
+        streamToken = response.data.stream_token
+      } catch (error) {
+        reconnect()
+        return
+      }
+      if (closed) return
+
+      source = new EventSource(`${api.defaults.baseURL}/events/stream?token=${encodeURIComponent(streamToken)}`)
+
+      source.onopen = () => {
+        // Events may have been missed while disconnected or hidden, so catch up on reconnect
+        if (streamOpenedRef.current) {
+          pending.jobs = true
+          pending.candidates = true
+          scheduleRefresh()
+        }
+        streamOpenedRef.current = true
+      }
+
+      source.onerror = () => {
+        // EventSource would retry with the same, soon expired, token; reconnect with a fresh one instead
+        source.close()
+        reconnect()
+      }
+
+      source.addEventListener('changes', (message) => {
+        const events = JSON.parse(message.data)
+        events.forEach((event) => {
+          if (event.type === 'resync' || event.type.startsWith('job.')) pending.jobs = true
+          if (event.type === 'resync' || event.type.startsWith('candidate.')) pending.candidates = true
+        })
+        setLastEvent(events[events.length - 1])
+        scheduleRefresh()
+      })
+    }
+
+    connect()
+
+    return () => {
+      closed = true
+      if (source) source.close()
+      clearTimeout(refreshTimer)
+      clearTimeout(reconnectTimer)
+    }
+  }, [user, isActive, fetchDashboardData, fetchJobs, fetchCandidates])
+
   // Cleanup on unmount
   useEffect(() => {
     return () => {
@@ -156,6 +242,7 @@ export const RealTimeProvider = ({ children }) => {
     jobs,
     candidates,
     lastUpdate,
+    lastEvent,
     isPolling,
     isActive,
     refreshData,
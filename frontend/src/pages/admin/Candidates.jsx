@@ -16,6 +16,8 @@ const cardVariants = {
   visible: { opacity: 1, y: 0, transition: { duration: 0.5 } }
 }
 
+const CANDIDATE_STATUSES = ['applied', 'in_progress', 'interviewed', 'selected', 'rejected']
+
 const AdminCandidates = () => {
   const [candidates, setCandidates] = useState([])
   const [loading, setLoading] = useState(true)
@@ -36,11 +38,16 @@ const AdminCandidates = () => {
 
   useEffect(() => {
     fetchCandidates()
-  }, [])
+    // eslint-disable-next-line
+  }, [appliedSearchTerm, appliedFilterStatus])
 
   const fetchCandidates = async () => {
     try {
-      const response = await api.get('/admin/candidates')
+      // Search and status are filtered server-side so only the matching page is fetched
+      const params = new URLSearchParams()
+      if (appliedSearchTerm.trim()) params.append('q', appliedSearchTerm.trim())
+      if (appliedFilterStatus) params.append('status', appliedFilterStatus)
+      const response = await api.get(`/admin/candidates?${params.toString()}`)
       setCandidates(response.data)
     } catch (error) {
       console.error('Error fetching candidates:', error)
@@ -516,45 +523,13 @@ const AdminCandidates = () => {
   const appliedForOptions = Array.from(
     new Set(candidates.map(c => c.applied_for || c.role_applied_for || '').filter(Boolean))
   )
-  const statusOptions = Array.from(
-    new Set(candidates.map(c => c.status || '').filter(Boolean))
-  )
-
-  // Filtering and searching
-  const filteredCandidates = candidates.filter(candidate => {
-    // Search: check if any of the main fields contain the search term (case-insensitive)
-    const search = appliedSearchTerm.trim().toLowerCase()
-    const matchesSearch =
-      !search ||
-      [
-        candidate.name,
-        candidate.email,
-        candidate.phone,
-        candidate.applied_for,
-        candidate.role_applied_for,
-        candidate.experience,
-        candidate.education,
-        candidate.skills,
-        candidate.projects,
-        candidate.linkedin,
-        candidate.github,
-        candidate.status
-      ]
-        .map(val => (val || '').toString().toLowerCase())
-        .some(val => val.includes(search))
+  const statusOptions = CANDIDATE_STATUSES
 
-    // Filter: applied for
-    const matchesAppliedFor =
-      !appliedFilterAppliedFor ||
-      (candidate.applied_for || candidate.role_applied_for || '') === appliedFilterAppliedFor
-
-    // Filter: status
-    const matchesStatus =
-      !appliedFilterStatus ||
-      (candidate.status || '') === appliedFilterStatus
-
-    return matchesSearch && matchesAppliedFor && matchesStatus
-  })
+  // Search and status are applied by the backend; only "applied for" is narrowed here
+  const filteredCandidates = candidates.filter(candidate =>
+    !appliedFilterAppliedFor ||
+    (candidate.applied_for || candidate.role_applied_for || '') === appliedFilterAppliedFor
+  )
 
   const handleApplySearch = () => {
     setAppliedSearchTerm(searchTerm)
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from 'react'
+import React, { useState, useEffect, useRef } from 'react'
 import { motion, AnimatePresence } from 'framer-motion'
 import { Briefcase, Filter, Plus, Search, Eye, Pencil, Calendar, MapPin, DollarSign, User, X } from 'lucide-react'
 import { useNavigate } from 'react-router-dom'
@@ -56,6 +56,17 @@ const AdminJobs = () => {
     // eslint-disable-next-line
   }, [])
 
+  // Refetch whenever the applied filters or search change; both are evaluated server-side
+  const isFirstRender = useRef(true)
+  useEffect(() => {
+    if (isFirstRender.current) {
+      isFirstRender.current = false
+      return
+    }
+    fetchJobs()
+    // eslint-disable-next-line
+  }, [appliedFilters, appliedSearch])
+
   const fetchHrUsers = async () => {
     try {
       const response = await api.get('/admin/users')
@@ -116,7 +127,7 @@ const AdminJobs = () => {
       if (validFilters.opening_date_from) params.append('opening_date_from', validFilters.opening_date_from)
       if (validFilters.opening_date_to) params.append('opening_date_to', validFilters.opening_date_to)
       if (validFilters.assigned_hr) params.append('assigned_hr', validFilters.assigned_hr)
-      // Only send allowed filters, never send search to backend
+      if (appliedSearch.trim()) params.append('q', appliedSearch.trim())
       const response = await api.get(`/admin/jobs?${params.toString()}`)
       setJobs(response.data)
     } catch (error) {
@@ -187,13 +198,11 @@ const AdminJobs = () => {
       assigned_hr: filters.assigned_hr
     })
     setAppliedSearch(search)
-    fetchJobs()
   }
 
   const handleSearch = () => {
     if (!isSearchButtonEnabled()) return
     setAppliedSearch(search)
-    // Search is handled client-side, no need to fetch from backend
   }
 
   const handleClearAll = () => {
@@ -212,7 +221,6 @@ const AdminJobs = () => {
       opening_date_to: '',
       assigned_hr: ''
     })
-    fetchJobs()
   }
 
   const getStatusColor = (status) => {
@@ -248,7 +256,7 @@ const AdminJobs = () => {
     fetchJobs()
   }
 
-  // Client-side filtering for search, but only after filter conditions are matched
+  // Filters and search are applied by the backend; this only guards against stale results
   const filteredJobs = jobs.filter(job => {
     // Only jobs that match the applied filter conditions
     // Status
@@ -281,17 +289,6 @@ const AdminJobs = () => {
     ) {
       return false
     }
-    // Now apply search (if any)
-    if (appliedSearch) {
-      const searchLower = appliedSearch.toLowerCase()
-      return (
-        (job.title && job.title.toLowerCase().includes(searchLower)) ||
-        (job.description && job.description.toLowerCase().includes(searchLower)) ||
-        (job.location && job.location.toLowerCase().includes(searchLower)) ||
-        (job.job_id && job.job_id.toString().includes(searchLower)) ||
-        (job.assigned_hr_name && job.assigned_hr_name.toLowerCase().includes(searchLower))
-      )
-    }
     return true
   })
 
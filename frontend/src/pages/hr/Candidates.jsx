@@ -7,6 +7,8 @@ import api from '../../services/api';
 import { toast } from 'react-toastify';
 import { useSearchParams } from 'react-router-dom';
 
+const TABLE_FIELDS = 'name,email,phone,status,notes,job_id,experience,education,skills,projects,linkedin,github';
+
 const HRCandidates = () => {
   const [candidates, setCandidates] = useState([]);
   const [loading, setLoading] = useState(true);
@@ -32,7 +34,8 @@ const HRCandidates = () => {
 
   const fetchCandidates = async () => {
     try {
-      const response = await api.get('/hr/candidates');
+      // Only the columns the table renders; the view modal loads the full record
+      const response = await api.get(`/hr/candidates?fields=${TABLE_FIELDS}`);
       setCandidates(response.data);
     } catch (error) {
       console.error('Error fetching candidates:', error);
@@ -698,10 +701,7 @@ const HRCandidates = () => {
                     <td className="px-4 py-2 text-sm">
                       <div className="flex space-x-2">
                         <button
-                          onClick={() => {
-                            setSelectedCandidate(candidate);
-                            setShowViewModal(true);
-                          }}
+                          onClick={() => fetchCandidateDetails(candidate.id)}
                           className="text-blue-600 hover:text-blue-900 flex items-center gap-1"
                         >
                           <Eye className="h-4 w-4" /> 